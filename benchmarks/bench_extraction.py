@@ -0,0 +1,167 @@
+"""Measure speed, memory and quality of every extraction strategy offline.
+
+Usage::
+
+    python benchmarks/bench_extraction.py [--repeat 5] [--per-page]
+
+Each page in ``corpus/`` is run through the strategies of
+``article_extractor`` (newspaper, readability, trafilatura, the container
+heuristics and the full ``extract_main_text`` chain) and through
+``body_extractor.extract_body``. The network fetch is replaced by the
+recorded page, so only parsing and extraction are measured.
+
+For every strategy the harness reports pages per second, the peak Python
+heap allocated while extracting one page (``tracemalloc``) and token-overlap
+precision/recall/F1 against the gold ``<page>.txt`` next to each page.
+Strategies whose library is not installed are listed as unavailable.
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import re
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from utubenews import article_extractor as ae  # noqa: E402
+from utubenews import body_extractor as be  # noqa: E402
+
+CORPUS_DIR = Path(__file__).resolve().parent / "corpus"
+
+_TOKEN_PAT = re.compile(r"\w+")
+
+
+def load_corpus(corpus_dir: Path = CORPUS_DIR) -> list[tuple[str, bytes, str]]:
+    """Return ``(name, html bytes, gold text)`` for every recorded page."""
+    pages = []
+    for page in sorted(corpus_dir.glob("*.html")):
+        gold = page.with_suffix(".txt")
+        pages.append((page.stem, page.read_bytes(), gold.read_text(encoding="utf-8") if gold.exists() else ""))
+    return pages
+
+
+def token_f1(predicted: str, gold: str) -> tuple[float, float, float]:
+    """Return precision, recall and F1 of the token bags of both texts."""
+    pred = Counter(_TOKEN_PAT.findall(predicted.lower()))
+    ref = Counter(_TOKEN_PAT.findall(gold.lower()))
+    overlap = sum((pred & ref).values())
+    if not overlap:
+        return 0.0, 0.0, 0.0
+    precision = overlap / sum(pred.values())
+    recall = overlap / sum(ref.values())
+    return precision, recall, 2 * precision * recall / (precision + recall)
+
+
+@contextmanager
+def offline(pages: dict[str, bytes]):
+    """Serve ``corpus://<name>`` URLs from ``pages`` instead of the network."""
+
+    def fetch_bytes(url, *a, **k):
+        data = pages[url.split("://", 1)[1]]
+        return data, ae.sniff_charset(data)
+
+    def fetch_html(url, *a, **k):
+        data, charset = fetch_bytes(url)
+        return data.decode(charset, errors="replace")
+
+    saved = ae.fetch_bytes, be.fetch_html
+    ae.fetch_bytes, be.fetch_html = fetch_bytes, fetch_html
+    try:
+        yield
+    finally:
+        ae.fetch_bytes, be.fetch_html = saved
+
+
+def _html(url: str) -> str:
+    return ae.fetch_html(url)
+
+
+STRATEGIES = {
+    "newspaper": lambda url: ae.extract_with_newspaper(url, _html(url)),
+    "readability": lambda url: ae.extract_with_readability(_html(url)),
+    "trafilatura": lambda url: ae.extract_with_trafilatura(_html(url)),
+    "heuristics": lambda url: ae._extract_from_html(_html(url), 10),
+    "extract_main_text": ae.extract_main_text,
+    "extract_body": be.extract_body,
+}
+
+
+def _available(func, url: str) -> bool:
+    try:
+        func(url)
+    except RuntimeError:  # optional library missing
+        return False
+    return True
+
+
+def run_strategy(func, urls: list[str], golds: list[str], repeat: int) -> dict:
+    """Return speed, memory and quality figures of ``func`` over ``urls``."""
+    texts = [func(url) for url in urls]
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for url in urls:
+            func(url)
+    elapsed = time.perf_counter() - start
+
+    peak = 0
+    for url in urls:
+        tracemalloc.start()
+        try:
+            func(url)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+        finally:
+            tracemalloc.stop()
+
+    scores = [token_f1(text, gold) for text, gold in zip(texts, golds)]
+    n = len(scores) or 1
+    return {
+        "pages_per_sec": len(urls) * repeat / elapsed if elapsed else 0.0,
+        "peak_kb": peak / 1024,
+        "precision": sum(s[0] for s in scores) / n,
+        "recall": sum(s[1] for s in scores) / n,
+        "f1": sum(s[2] for s in scores) / n,
+        "per_page": scores,
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="timed passes over the corpus")
+    parser.add_argument("--per-page", action="store_true", help="print F1 per page")
+    parser.add_argument(
+        "--strategy", action="append", choices=sorted(STRATEGIES), help="run only these strategies"
+    )
+    args = parser.parse_args(argv)
+    logging.disable(logging.WARNING)
+
+    corpus = load_corpus()
+    names = [name for name, _, _ in corpus]
+    urls = [f"corpus://{name}" for name in names]
+    golds = [gold for _, _, gold in corpus]
+
+    print(f"{'strategy':<20}{'pages/s':>10}{'peak KB':>10}{'P':>7}{'R':>7}{'F1':>7}")
+    with offline({name: data for name, data, _ in corpus}):
+        for label in args.strategy or STRATEGIES:
+            func = STRATEGIES[label]
+            if not _available(func, urls[0]):
+                print(f"{label:<20}{'unavailable':>10}")
+                continue
+            r = run_strategy(func, urls, golds, args.repeat)
+            print(
+                f"{label:<20}{r['pages_per_sec']:>10.1f}{r['peak_kb']:>10.0f}"
+                f"{r['precision']:>7.2f}{r['recall']:>7.2f}{r['f1']:>7.2f}"
+            )
+            if args.per_page:
+                for name, (_, _, f1) in zip(names, r["per_page"]):
+                    print(f"  {name:<18}{f1:>37.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Compare the pure-Python and NumPy TextRank summarizers on long articles.
+
+Usage::
+
+    python benchmarks/bench_extractive.py [--repeat 20] [--scale 1 4 16]
+
+The gold texts in ``corpus/`` are joined and repeated ``--scale`` times to
+get long articles (syndicated stories and live blogs run to hundreds of
+sentences). For each size the harness times ``textrank_summary`` in its
+pure-Python form and the vectorized form of :mod:`utubenews.extractive`,
+and checks that both return the same summary.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from utubenews import extractive, summarizer  # noqa: E402
+
+CORPUS_DIR = Path(__file__).resolve().parent / "corpus"
+
+def ms_per_call(func, text: str, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(text)
+    return 1000 * (time.perf_counter() - start) / repeat
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="calls per measurement")
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 4, 16], help="corpus copies per article")
+    args = parser.parse_args(argv)
+    if extractive.np is None:
+        sys.exit("numpy is required for this benchmark")
+
+    corpus = "\n".join(p.read_text(encoding="utf-8") for p in sorted(CORPUS_DIR.glob("*.txt")))
+    py, vec = summarizer._textrank_summary_py, extractive.textrank_summary
+    print(f"{'sentences':>10}{'python ms':>11}{'numpy ms':>10}{'speedup':>9}  same")
+    for scale in args.scale:
+        text = "\n".join([corpus] * scale)
+        sentences = len(summarizer._SENTENCE_PAT.split(text))
+        old = ms_per_call(py, text, args.repeat)
+        new = ms_per_call(vec, text, args.repeat)
+        same = "yes" if py(text) == vec(text) else "NO"
+        print(f"{sentences:>10}{old:>11.2f}{new:>10.2f}{old / new:>8.1f}x  {same}")
+
+
+if __name__ == "__main__":
+    main()
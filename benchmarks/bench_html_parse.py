@@ -0,0 +1,86 @@
+"""Compare the BeautifulSoup and lxml parse paths on the recorded corpus.
+
+Usage::
+
+    python benchmarks/bench_html_parse.py [--repeat 20]
+
+Two measurements are reported per page:
+
+* ``_extract_from_html`` with ``html.parser`` versus the lxml fast path
+* the whole readability → trafilatura → heuristics chain as before (every
+  extractor parses the string, heuristics on ``html.parser``) versus one
+  shared lxml tree; extractors that are not installed are skipped
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from utubenews import article_extractor as ae  # noqa: E402
+from utubenews import text_utils  # noqa: E402
+
+CORPUS_DIR = Path(__file__).resolve().parent / "corpus"
+
+
+def _timeit(func, repeat: int) -> float:
+    """Return the mean wall time of ``func()`` in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def _without_lxml(func):
+    """Run ``func`` with the lxml fast path disabled."""
+    saved = text_utils._lxml_html
+    text_utils._lxml_html = None
+    try:
+        return func()
+    finally:
+        text_utils._lxml_html = saved
+
+
+def _chain(html: str, tree) -> None:
+    """Run every HTML extractor like ``_extract_fetched`` without early exit."""
+    for extractor in (ae.extract_with_readability, ae.extract_with_trafilatura):
+        try:
+            extractor(html, tree)
+        except RuntimeError:
+            pass
+    ae._extract_from_html(html, 10, tree=tree)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="runs per page")
+    args = parser.parse_args(argv)
+
+    if text_utils._lxml_html is None:
+        sys.exit("lxml is not installed; nothing to compare")
+
+    pages = sorted(CORPUS_DIR.glob("*.html"))
+    print(f"{'page':<22}{'KB':>6}{'bs4 ms':>10}{'lxml ms':>10}{'x':>6}{'before ms':>12}{'shared ms':>11}{'x':>6}")
+    totals = [0.0, 0.0, 0.0, 0.0]
+    for page in pages:
+        html = page.read_text(encoding="utf-8")
+        slow = _without_lxml(lambda: _timeit(lambda: ae._extract_from_html(html, 10), args.repeat))
+        fast = _timeit(lambda: ae._extract_from_html(html, 10), args.repeat)
+        reparse = _without_lxml(lambda: _timeit(lambda: _chain(html, None), args.repeat))
+        shared = _timeit(lambda: _chain(html, text_utils.parse_html(html)), args.repeat)
+        for i, v in enumerate((slow, fast, reparse, shared)):
+            totals[i] += v
+        print(
+            f"{page.stem:<22}{len(html) / 1024:>6.0f}{slow:>10.2f}{fast:>10.2f}{slow / fast:>6.1f}"
+            f"{reparse:>12.2f}{shared:>11.2f}{reparse / shared:>6.1f}"
+        )
+    slow, fast, reparse, shared = totals
+    print(f"{'total':<28}{slow:>10.2f}{fast:>10.2f}{slow / fast:>6.1f}{reparse:>12.2f}{shared:>11.2f}{reparse / shared:>6.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Find the fastest worker × thread split for the summary worker pool.
+
+Usage::
+
+    python benchmarks/bench_pool.py [--repeat 2] [--max-workers 8]
+
+The model is loaded once; for every combination of worker count and torch
+threads per worker that fits the CPU count, a :class:`SummaryPool` is forked
+from it and the gold texts in ``corpus/`` are summarized ``--repeat`` times.
+The table lists articles per second per combination and the best one, which
+gives the ``SUMMARY_WORKERS`` / ``SUMMARY_THREADS_PER_WORKER`` to use on this
+machine. The summary cache is disabled while measuring.
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+# cached summaries would hide the model cost
+os.environ["UTUBENEWS_CACHE_DIR"] = "off"
+
+from utubenews import summarizer  # noqa: E402
+from utubenews.summary_pool import SummaryPool  # noqa: E402
+
+CORPUS_DIR = Path(__file__).resolve().parent / "corpus"
+
+
+def _powers_of_two(limit: int) -> list[int]:
+    values, n = [], 1
+    while n <= limit:
+        values.append(n)
+        n *= 2
+    if values[-1] != limit:
+        values.append(limit)
+    return values
+
+
+def throughput(workers: int, threads: int, texts: list[str]) -> float:
+    """Return articles per second of a pool with the given split."""
+    pool = SummaryPool(workers, threads)
+    try:
+        pool.summarize(texts[:workers])  # let every worker start up
+        start = time.perf_counter()
+        pool.summarize(texts)
+        elapsed = time.perf_counter() - start
+    finally:
+        pool.close()
+    return len(texts) / elapsed if elapsed else 0.0
+
+
+def main(argv=None) -> None:
+    cpus = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=2, help="passes over the corpus")
+    parser.add_argument("--max-workers", type=int, default=cpus, help="largest worker count")
+    args = parser.parse_args(argv)
+    logging.disable(logging.WARNING)
+
+    try:
+        summarizer._load_pipeline()
+    except Exception as exc:
+        sys.exit(f"summarization model unavailable: {exc}")
+    texts = [p.read_text(encoding="utf-8") for p in sorted(CORPUS_DIR.glob("*.txt"))]
+    texts *= args.repeat
+
+    print(f"{cpus} CPUs, {len(texts)} articles")
+    print(f"{'workers':>8}{'threads':>9}{'art/s':>9}")
+    best = None
+    for workers in _powers_of_two(min(args.max_workers, cpus)):
+        for threads in _powers_of_two(cpus // workers):
+            rate = throughput(workers, threads, texts)
+            print(f"{workers:>8}{threads:>9}{rate:>9.2f}")
+            if best is None or rate > best[0]:
+                best = (rate, workers, threads)
+    rate, workers, threads = best
+    print(f"best: SUMMARY_WORKERS={workers} SUMMARY_THREADS_PER_WORKER={threads} ({rate:.2f} art/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Compare latency, throughput and output quality of summarization backends.
+
+Usage::
+
+    python benchmarks/bench_summarize.py [--repeat 3] [--backend onnx-int8]
+
+The gold article texts in ``corpus/`` are summarized once per backend of
+``summarizer.SUMMARY_BACKENDS`` (PyTorch, ONNX Runtime, int8-quantized ONNX
+Runtime). For every backend the harness reports the model load time, the
+mean and worst single-article latency of ``llm_summarize``, the throughput
+of ``llm_summarize_batch`` in articles per second and ROUGE-1/2/L F1 of its
+summaries against those of the PyTorch backend, i.e. how much the faster
+backends change the output. The summary cache is disabled while measuring;
+ONNX exports are kept in ``.cache/onnx`` so only the first run pays for them.
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import re
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+# cached summaries would hide the model cost
+os.environ["UTUBENEWS_CACHE_DIR"] = "off"
+
+from utubenews import summarizer  # noqa: E402
+from utubenews.onnx_backend import load_onnx_pipeline  # noqa: E402
+
+CORPUS_DIR = Path(__file__).resolve().parent / "corpus"
+
+_TOKEN_PAT = re.compile(r"\w+")
+
+
+def load_texts(corpus_dir: Path = CORPUS_DIR) -> list[str]:
+    """Return the gold article texts of the corpus."""
+    return [p.read_text(encoding="utf-8") for p in sorted(corpus_dir.glob("*.txt"))]
+
+
+def _ngrams(tokens: list[str], n: int) -> Counter:
+    return Counter(tuple(tokens[i : i + n]) for i in range(len(tokens) - n + 1))
+
+
+def _f1(overlap: int, predicted: int, reference: int) -> float:
+    if not overlap:
+        return 0.0
+    precision, recall = overlap / predicted, overlap / reference
+    return 2 * precision * recall / (precision + recall)
+
+
+def _lcs(a: list[str], b: list[str]) -> int:
+    row = [0] * (len(b) + 1)
+    for x in a:
+        prev = 0
+        for j, y in enumerate(b, 1):
+            prev, row[j] = row[j], prev + 1 if x == y else max(row[j], row[j - 1])
+    return row[-1]
+
+
+def rouge(predicted: str, reference: str) -> tuple[float, float, float]:
+    """Return ROUGE-1, ROUGE-2 and ROUGE-L F1 of ``predicted``."""
+    pred = _TOKEN_PAT.findall(predicted.lower())
+    ref = _TOKEN_PAT.findall(reference.lower())
+    scores = []
+    for n in (1, 2):
+        p, r = _ngrams(pred, n), _ngrams(ref, n)
+        scores.append(_f1(sum((p & r).values()), sum(p.values()), sum(r.values())))
+    scores.append(_f1(_lcs(pred, ref), len(pred), len(ref)))
+    return scores[0], scores[1], scores[2]
+
+
+def run_backend(backend: str, texts: list[str], repeat: int) -> dict:
+    """Return load time, latency, throughput and summaries for ``backend``."""
+    summarizer.SUMMARY_BACKEND = backend
+    summarizer.set_pipeline(None)
+    start = time.perf_counter()
+    if backend == "torch":
+        summarizer._load_pipeline()
+    else:
+        # load directly: _load_pipeline would quietly fall back to torch
+        summarizer.set_pipeline(load_onnx_pipeline(
+            summarizer.MODEL_NAME,
+            summarizer.MODEL_REVISION,
+            quantize=backend == "onnx-int8",
+            cache_dir=ROOT / ".cache",
+        ))
+    load = time.perf_counter() - start
+
+    latencies = []
+    for _ in range(repeat):
+        for text in texts:
+            start = time.perf_counter()
+            summarizer.llm_summarize(text)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        summaries = summarizer.llm_summarize_batch(texts)
+    elapsed = time.perf_counter() - start
+    return {
+        "load_s": load,
+        "mean_ms": 1000 * sum(latencies) / len(latencies),
+        "max_ms": 1000 * max(latencies),
+        "articles_per_sec": len(texts) * repeat / elapsed if elapsed else 0.0,
+        "summaries": summaries,
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3, help="timed passes over the corpus")
+    parser.add_argument(
+        "--backend", action="append", choices=summarizer.SUMMARY_BACKENDS,
+        help="run only these backends (torch always runs as the reference)",
+    )
+    args = parser.parse_args(argv)
+    logging.disable(logging.WARNING)
+
+    texts = load_texts()
+    backends = ["torch"] + [b for b in args.backend or summarizer.SUMMARY_BACKENDS if b != "torch"]
+    print(f"{'backend':<12}{'load s':>8}{'mean ms':>10}{'max ms':>10}{'art/s':>8}{'R-1':>7}{'R-2':>7}{'R-L':>7}")
+    reference = None
+    for backend in backends:
+        try:
+            r = run_backend(backend, texts, args.repeat)
+        except Exception as exc:  # library or model missing
+            print(f"{backend:<12}{'unavailable':>12}  ({exc})")
+            continue
+        if backend == "torch":
+            reference = r["summaries"]
+        line = (
+            f"{backend:<12}{r['load_s']:>8.1f}{r['mean_ms']:>10.0f}{r['max_ms']:>10.0f}"
+            f"{r['articles_per_sec']:>8.2f}"
+        )
+        if reference is not None:
+            scores = [rouge(s, ref) for s, ref in zip(r["summaries"], reference)]
+            n = len(scores) or 1
+            line += "".join(f"{sum(s[i] for s in scores) / n:>7.2f}" for i in range(3))
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Measure the CPU spent preparing summarizer input, before and after.
+
+Usage::
+
+    python benchmarks/bench_tokenize.py [--repeat 50]
+
+The string path that ``llm_summarize`` used to take encodes the text with
+truncation, decodes it back to a string, splits it on whitespace for the
+length limits and lets the pipeline tokenize it once more. The token path
+tokenizes once (with character offsets, which map-reduce chunking reuses)
+and hands the ids to ``model.generate``. Only the tokenizer is loaded, so
+the numbers show the preprocessing cost without generation. Inputs are the
+gold texts in ``corpus/`` and, for long articles, all of them joined.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from utubenews import summarizer  # noqa: E402
+
+CORPUS_DIR = Path(__file__).resolve().parent / "corpus"
+
+
+class _Pipe:
+    """Just enough of a pipeline for ``summarizer._encode_input``."""
+
+    model = None
+
+    def __init__(self, tokenizer) -> None:
+        self.tokenizer = tokenizer
+
+
+def string_path(tokenizer, text: str, max_in: int) -> None:
+    ids = tokenizer.encode(text, max_length=max_in, truncation=True)
+    text = tokenizer.decode(ids, skip_special_tokens=True)
+    len(text.split())
+    tokenizer(text, truncation=True, max_length=max_in)  # inside the pipeline
+
+
+def token_path(tokenizer, text: str, max_in: int) -> None:
+    pipe = _Pipe(tokenizer)
+    summarizer._encode_input(pipe, text)
+
+
+def cpu_ms(func, tokenizer, texts: list[str], repeat: int, max_in: int) -> float:
+    """Return the CPU milliseconds per text spent by ``func``."""
+    start = time.process_time()
+    for _ in range(repeat):
+        for text in texts:
+            func(tokenizer, text, max_in)
+    return 1000 * (time.process_time() - start) / (repeat * len(texts))
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=50, help="passes over the inputs")
+    args = parser.parse_args(argv)
+
+    try:
+        from transformers import AutoTokenizer  # type: ignore
+    except ImportError:
+        sys.exit("transformers is required for this benchmark")
+    tokenizer = AutoTokenizer.from_pretrained(summarizer.MODEL_NAME, revision=summarizer.MODEL_REVISION)
+    max_in = min(summarizer.MAX_LLM_INPUT_TOKENS, tokenizer.model_max_length)
+    # both paths truncate long articles, as the string path always did
+    summarizer.MAP_REDUCE_MIN_TOKENS = 0
+
+    texts = [p.read_text(encoding="utf-8") for p in sorted(CORPUS_DIR.glob("*.txt"))]
+    inputs = {"articles": texts, "long article": ["\n".join(texts * 3)]}
+    print(f"{'input':<16}{'string ms':>11}{'token ms':>10}{'saved':>8}")
+    for label, batch in inputs.items():
+        old = cpu_ms(string_path, tokenizer, batch, args.repeat, max_in)
+        new = cpu_ms(token_path, tokenizer, batch, args.repeat, max_in)
+        print(f"{label:<16}{old:>11.2f}{new:>10.2f}{1 - new / old:>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,7 +9,20 @@ class DummyRequestException(Exception):
 dummy_requests = types.ModuleType("requests")
 dummy_requests.exceptions = types.SimpleNamespace(RequestException=DummyRequestException)
 
-class DummyResponse:
+class StreamingResponse:
+    """Mimic the streaming API used by ``fetch_html`` on top of ``text``."""
+
+    headers = {"Content-Type": "text/html; charset=utf-8"}
+
+    def iter_content(self, chunk_size=1):
+        data = self.text.encode("utf-8")
+        for i in range(0, len(data), chunk_size):
+            yield data[i : i + chunk_size]
+
+    def close(self):
+        pass
+
+class DummyResponse(StreamingResponse):
     def raise_for_status(self):
         raise DummyRequestException("boom")
     @property
@@ -32,6 +45,7 @@ sys.modules["newspaper"] = dummy_newspaper
 
 import utubenews.article_extractor as ae
 from utubenews.article_extractor import extract_main_text
+from utubenews import text_utils
 
 class TestExtractMainText(unittest.TestCase):
     def test_returns_empty_on_request_error(self):
@@ -44,7 +58,7 @@ class TestExtractMainText(unittest.TestCase):
             del dummy_newspaper.Article
         html = "<html><article><p>Short line.</p><p>Another one.</p></article></html>"
 
-        class OkResponse:
+        class OkResponse(StreamingResponse):
             def raise_for_status(self):
                 pass
 
@@ -68,17 +82,46 @@ class TestExtractMainText(unittest.TestCase):
         class GoodArticle:
             def __init__(self, url):
                 self.url = url
-            def download(self):
-                pass
+            def download(self, input_html=None):
+                self.html = input_html
             def parse(self):
-                self.text = "NP text success"
+                self.text = "NP text success" if self.html else ""
+
+        class OkResponse(StreamingResponse):
+            text = "<html><p>page</p></html>"
+
+            def raise_for_status(self):
+                pass
 
         dummy_newspaper.Article = GoodArticle
+        dummy_requests.get = lambda *a, **k: OkResponse()
         try:
             text = extract_main_text("http://np")
         finally:
+            dummy_requests.get = dummy_get
+            del dummy_newspaper.Article
+        self.assertEqual(text, "NP text success")
+
+    def test_page_is_parsed_only_after_newspaper_fails(self):
+        class GoodArticle:
+            def __init__(self, url):
+                self.text = "NP text success"
+            def download(self, input_html=None):
+                pass
+            def parse(self):
+                pass
+
+        parsed = []
+        orig_parse = ae.parse_html
+        ae.parse_html = lambda *a: parsed.append(a) or orig_parse(*a)
+        dummy_newspaper.Article = GoodArticle
+        try:
+            text = ae.extract_from_bytes("http://np", b"<html><p>page</p></html>", "utf-8")
+        finally:
+            ae.parse_html = orig_parse
             del dummy_newspaper.Article
         self.assertEqual(text, "NP text success")
+        self.assertEqual(parsed, [])
 
     def test_newspaper_failure_falls_back(self):
         class BadArticle:
@@ -93,7 +136,7 @@ class TestExtractMainText(unittest.TestCase):
 
         html = "<html><article><p>Fallback.</p></article></html>"
 
-        class OkResponse:
+        class OkResponse(StreamingResponse):
             def raise_for_status(self):
                 pass
             @property
@@ -122,7 +165,7 @@ class TestExtractMainText(unittest.TestCase):
             def raise_for_status(self):
                 raise DummyRequestException("boom")
 
-        class OkResponse:
+        class OkResponse(StreamingResponse):
             def raise_for_status(self):
                 pass
 
@@ -164,7 +207,7 @@ class TestExtractMainText(unittest.TestCase):
 
         html = "<html><p>R news</p></html>"
 
-        class OkResponse:
+        class OkResponse(StreamingResponse):
             def raise_for_status(self):
                 pass
 
@@ -222,7 +265,7 @@ class TestExtractMainText(unittest.TestCase):
 
         html = "<html><p>T news</p></html>"
 
-        class OkResponse:
+        class OkResponse(StreamingResponse):
             def raise_for_status(self):
                 pass
 
@@ -261,5 +304,312 @@ class TestExtractMainText(unittest.TestCase):
 
         self.assertEqual(text, "T news")
 
+@unittest.skipUnless(text_utils._lxml_html is not None, "lxml not installed")
+class TestLxmlPath(unittest.TestCase):
+    def test_short_page_keeps_its_lines(self):
+        self.assertEqual(ae._extract_from_html("<html><p>T news</p></html>", 10), "T news")
+
+    def test_lines_below_min_len_are_dropped(self):
+        html = "<html><body><div>Menu</div><div>A long enough body line.</div></body></html>"
+        self.assertEqual(ae._extract_from_html(html, 10), "A long enough body line.")
+
+    def test_container_paragraphs_win(self):
+        html = "<html><div>Navigation text here</div><article><p>Body one.</p><p>Body two.</p></article></html>"
+        self.assertEqual(ae._extract_from_html(html, 10), "Body one. Body two.")
+
+
+class TestFetchRetryPolicy(unittest.TestCase):
+    def test_not_found_is_not_retried(self):
+        class NotFound:
+            status_code = 404
+            headers = {}
+
+            def raise_for_status(self):
+                exc = DummyRequestException("404")
+                exc.response = self
+                raise exc
+
+        calls = {"n": 0}
+
+        def get_404(*a, **k):
+            calls["n"] += 1
+            return NotFound()
+
+        dummy_requests.get = get_404
+        try:
+            with self.assertRaises(DummyRequestException):
+                ae._get_with_retries("http://gone/a", {})
+        finally:
+            dummy_requests.get = dummy_get
+        self.assertEqual(calls["n"], 1)
+
+    def test_open_breaker_fails_fast(self):
+        if hasattr(dummy_newspaper, "Article"):
+            del dummy_newspaper.Article
+
+        breaker = ae.CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        policy = ae.RetryPolicy(attempts=2, base_delay=0)
+        calls = {"n": 0}
+
+        def counting_get(*a, **k):
+            calls["n"] += 1
+            return DummyResponse()
+
+        dummy_requests.get = counting_get
+        try:
+            with self.assertRaises(DummyRequestException):
+                ae._get_with_retries("http://down/1", {}, policy, breaker)
+            with self.assertRaises(ae.CircuitOpenError):
+                ae._get_with_retries("http://down/2", {}, policy, breaker)
+        finally:
+            dummy_requests.get = dummy_get
+        self.assertEqual(calls["n"], 2)
+        self.assertEqual(breaker.stats()["down"]["state"], "open")
+
+    def test_deadline_caps_timeout_and_skips_late_retry(self):
+        from utubenews.deadline import Deadline, DeadlineExceeded
+
+        policy = ae.RetryPolicy(attempts=3)
+        policy.next_delay = lambda attempt, exc: 100.0
+        timeouts = []
+
+        def failing_get(*a, **k):
+            timeouts.append(k["timeout"])
+            return DummyResponse()
+
+        dummy_requests.get = failing_get
+        try:
+            with self.assertRaises(DummyRequestException):
+                ae._get_with_retries("http://slow/a", {}, policy, ae.CircuitBreaker(), deadline=Deadline(5))
+            with self.assertRaises(DeadlineExceeded):
+                ae._get_with_retries("http://slow/b", {}, policy, ae.CircuitBreaker(), deadline=Deadline(0))
+            self.assertEqual(extract_main_text("http://slow/c", deadline=Deadline(0)), "")
+        finally:
+            dummy_requests.get = dummy_get
+        # one attempt only: waiting up to 100 s for a retry would overrun
+        self.assertEqual(len(timeouts), 1)
+        self.assertLessEqual(timeouts[0], 5)
+
+
+class TestFetchHtmlGating(unittest.TestCase):
+    def _serve(self, headers, body):
+        class Resp(StreamingResponse):
+            text = body
+            closed = False
+
+            def raise_for_status(self):
+                pass
+
+            def close(self):
+                Resp.closed = True
+
+        Resp.headers = headers
+        dummy_requests.get = lambda *a, **k: Resp()
+        return Resp
+
+    def test_non_html_is_skipped_and_counted(self):
+        from utubenews.fetch_policy import skip_stats
+
+        before = skip_stats().get("content_type", 0)
+        resp = self._serve({"Content-Type": "application/pdf"}, "%PDF-1.4")
+        try:
+            with self.assertRaises(ae.SkippedPage):
+                ae.fetch_html("http://pdf/a.pdf")
+            self.assertEqual(extract_main_text("http://pdf/b.pdf"), "")
+        finally:
+            dummy_requests.get = dummy_get
+        self.assertTrue(resp.closed)
+        self.assertEqual(skip_stats()["content_type"], before + 2)
+
+    def test_body_is_truncated_at_cap(self):
+        from utubenews.fetch_policy import skip_stats
+
+        before = skip_stats().get("truncated", 0)
+        self._serve({"Content-Type": "text/html"}, "<p>" + "x" * 500 + "</p>")
+        try:
+            html = ae.fetch_html("http://big/a", max_bytes=100)
+        finally:
+            dummy_requests.get = dummy_get
+        self.assertEqual(len(html), 100)
+        self.assertEqual(skip_stats()["truncated"], before + 1)
+
+    def test_body_of_exactly_the_cap_is_not_truncated(self):
+        from utubenews.fetch_policy import CappedBuffer, reset_skip_stats, skip_stats
+
+        reset_skip_stats()
+        buf = CappedBuffer("http://exact/a", max_bytes=8)
+        self.assertFalse(buf.feed(b"1234"))
+        self.assertFalse(buf.feed(b"5678"))
+        self.assertEqual(skip_stats(), {})
+        self.assertTrue(buf.feed(b"9"))
+        self.assertEqual(buf.getvalue(), b"12345678")
+        self.assertEqual(skip_stats(), {"truncated": 1})
+        reset_skip_stats()
+        self.assertEqual(skip_stats(), {})
+
+
+class TestFetchCharset(unittest.TestCase):
+    def test_euc_kr_page_without_header_charset(self):
+        page = (
+            '<html><head><meta charset="euc-kr"></head>'
+            "<body><article><p>똠방각하 한글 기사 본문</p></article></body></html>"
+        ).encode("cp949")
+
+        class Resp(StreamingResponse):
+            headers = {"Content-Type": "text/html"}
+
+            def raise_for_status(self):
+                pass
+
+            def iter_content(self, chunk_size=1):
+                yield page
+
+        dummy_requests.get = lambda *a, **k: Resp()
+        try:
+            data, charset = ae.fetch_bytes("http://kr/a")
+            html = ae.fetch_html("http://kr/a")
+        finally:
+            dummy_requests.get = dummy_get
+        self.assertEqual((data, charset), (page, "cp949"))
+        self.assertIn("똠방각하 한글 기사 본문", html)
+        self.assertIn("똠방각하 한글 기사 본문", ae.extract_from_bytes("http://kr/a", data, None))
+
+
+class TestExtractMainTextAsync(unittest.TestCase):
+    def test_fetches_once_and_parses_in_executor(self):
+        import asyncio
+
+        if hasattr(dummy_newspaper, "Article"):
+            del dummy_newspaper.Article
+
+        class FakeHTTPError(Exception):
+            pass
+
+        dummy_httpx = types.ModuleType("httpx")
+        dummy_httpx.HTTPError = FakeHTTPError
+
+        class OkResponse:
+            headers = {"Content-Type": "text/html"}
+
+            def raise_for_status(self):
+                pass
+
+            async def aiter_bytes(self, chunk_size=None):
+                yield b"<html><article><p>Async body.</p></article></html>"
+
+            async def aclose(self):
+                pass
+
+        class FakeClient:
+            calls = []
+
+            def build_request(self, method, url, headers=None):
+                return url
+
+            async def send(self, request, stream=False):
+                FakeClient.calls.append(request)
+                return OkResponse()
+
+        orig_httpx = sys.modules.get("httpx")
+        sys.modules["httpx"] = dummy_httpx
+        try:
+            text = asyncio.run(ae.extract_main_text_async("http://a", FakeClient()))
+        finally:
+            if orig_httpx is not None:
+                sys.modules["httpx"] = orig_httpx
+            else:
+                del sys.modules["httpx"]
+
+        self.assertEqual(text, "Async body.")
+        self.assertEqual(FakeClient.calls, ["http://a"])
+
+    def test_timeout_is_logged_with_a_reason(self):
+        import asyncio
+
+        from utubenews.deadline import Deadline
+
+        dummy_httpx = types.ModuleType("httpx")
+        dummy_httpx.HTTPError = type("FakeHTTPError", (Exception,), {})
+
+        class HangingClient:
+            def build_request(self, method, url, headers=None):
+                return url
+
+            async def send(self, request, stream=False):
+                await asyncio.sleep(60)
+
+        orig_httpx = sys.modules.get("httpx")
+        sys.modules["httpx"] = dummy_httpx
+        try:
+            with self.assertLogs(ae._LOG, level="INFO") as logs:
+                text = asyncio.run(
+                    ae.extract_main_text_async("http://slow", HangingClient(), deadline=Deadline(0.05))
+                )
+        finally:
+            if orig_httpx is not None:
+                sys.modules["httpx"] = orig_httpx
+            else:
+                del sys.modules["httpx"]
+
+        self.assertEqual(text, "")
+        self.assertIn("Gave up on http://slow: time budget exhausted", logs.output[-1])
+
+
+class TestHalfOpenProbe(unittest.TestCase):
+    def _half_open_breaker(self):
+        from utubenews.fetch_policy import CircuitBreaker
+
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+        breaker.before_request("probe")
+        breaker.record_failure("probe")
+        return breaker
+
+    def test_interrupted_sync_probe_frees_the_host(self):
+        breaker = self._half_open_breaker()
+
+        def interrupted_get(*args, **kwargs):
+            raise KeyboardInterrupt
+
+        dummy_requests.get = interrupted_get
+        try:
+            with self.assertRaises(KeyboardInterrupt):
+                ae._get_with_retries("http://probe/a", {}, breaker=breaker)
+        finally:
+            dummy_requests.get = dummy_get
+        breaker.before_request("probe")  # a new probe is allowed
+
+    def test_cancelled_async_probe_frees_the_host(self):
+        import asyncio
+
+        from utubenews.async_fetch import aget_with_retries
+
+        breaker = self._half_open_breaker()
+        dummy_httpx = types.ModuleType("httpx")
+        dummy_httpx.HTTPError = type("FakeHTTPError", (Exception,), {})
+
+        class HangingClient:
+            def build_request(self, method, url, headers=None):
+                return url
+
+            async def send(self, request, stream=False):
+                await asyncio.sleep(60)
+
+        async def probe():
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(
+                    aget_with_retries(HangingClient(), "http://probe/a", breaker=breaker), 0.01
+                )
+
+        orig_httpx = sys.modules.get("httpx")
+        sys.modules["httpx"] = dummy_httpx
+        try:
+            asyncio.run(probe())
+        finally:
+            if orig_httpx is not None:
+                sys.modules["httpx"] = orig_httpx
+            else:
+                del sys.modules["httpx"]
+        breaker.before_request("probe")  # a new probe is allowed
+
 if __name__ == "__main__":
     unittest.main()
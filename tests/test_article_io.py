@@ -0,0 +1,72 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from utubenews import article_io
+from utubenews.article_io import iter_articles, open_writer
+
+
+class TestArticleIO(unittest.TestCase):
+    ARTS = [{"title": "제목", "link": "L1", "tags": [1, 2]}, {"title": "B", "n": 12345}, {}]
+
+    def test_json_array_streamed_in_small_chunks(self):
+        orig = article_io._READ_CHUNK
+        article_io._READ_CHUNK = 5
+        try:
+            with tempfile.TemporaryDirectory() as td:
+                path = Path(td) / "a.json"
+                path.write_text(json.dumps(self.ARTS, ensure_ascii=False, indent=2), encoding="utf-8")
+                self.assertEqual(list(iter_articles(path)), self.ARTS)
+                path.write_text(" [1, 22 ,333]")
+                self.assertEqual(list(iter_articles(path)), [1, 22, 333])
+                # the first chunk ends inside the number, right after its "."
+                article_io._READ_CHUNK = 7
+                path.write_text("[-15000000000.0, 1e5]")
+                self.assertEqual(list(iter_articles(path)), [-15000000000.0, 1e5])
+        finally:
+            article_io._READ_CHUNK = orig
+
+    def test_jsonl_detected_by_content(self):
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "a.json"
+            path.write_text("\n".join(json.dumps(a) for a in self.ARTS) + "\n\n")
+            self.assertEqual(list(iter_articles(path)), self.ARTS)
+
+    def test_truncated_array_raises(self):
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "a.json"
+            path.write_text('[{"a": 1}, {"b"')
+            with self.assertRaises(ValueError):
+                list(iter_articles(path))
+
+    def test_writer_matches_json_dump_layout(self):
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "out.json"
+            with open_writer(path) as out:
+                for art in self.ARTS:
+                    out.write(art)
+            self.assertEqual(
+                path.read_text(encoding="utf-8"),
+                json.dumps(self.ARTS, ensure_ascii=False, indent=2),
+            )
+            jsonl = Path(td) / "out.jsonl"
+            with open_writer(jsonl) as out:
+                for art in self.ARTS:
+                    out.write(art)
+            self.assertEqual(list(iter_articles(jsonl)), self.ARTS)
+
+    def test_failed_write_keeps_previous_file(self):
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "out.json"
+            path.write_text("[]")
+            with self.assertRaises(RuntimeError):
+                with open_writer(path) as out:
+                    out.write({"a": 1})
+                    raise RuntimeError("crash")
+            self.assertEqual(path.read_text(), "[]")
+            self.assertEqual(list(Path(td).iterdir()), [path])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -50,5 +50,139 @@ class TestBodyExtractorCLI(unittest.TestCase):
             self.assertEqual(called["url"], "L")
 
 
+class TestBodyExtractorBatch(unittest.TestCase):
+    def _run(self, argv, fake_extract):
+        orig_extract = be.extract_body
+        be.extract_body = fake_extract
+        try:
+            return be.main(argv + ["--log-level", "ERROR"])
+        finally:
+            be.extract_body = orig_extract
+
+    def test_workers_keep_input_order_and_remove_checkpoint(self):
+        articles = [{"link": f"L{i}"} for i in range(6)]
+        with tempfile.TemporaryDirectory() as td:
+            inp = Path(td) / "in.json"
+            outp = Path(td) / "out.json"
+            inp.write_text(json.dumps(articles))
+
+            self._run([str(inp), str(outp), "--workers", "3"], lambda url: f"BODY-{url}")
+
+            result = json.loads(outp.read_text(encoding="utf-8"))
+            self.assertEqual([a["body"] for a in result], [f"BODY-L{i}" for i in range(6)])
+            self.assertFalse((Path(td) / "out.json.partial").exists())
+
+    def test_resume_skips_checkpointed_articles(self):
+        articles = [{"link": "L1"}, {"link": "L2"}, {"link": "L3"}]
+        with tempfile.TemporaryDirectory() as td:
+            inp = Path(td) / "in.json"
+            outp = Path(td) / "out.json"
+            inp.write_text(json.dumps(articles))
+            # a crash left one finished article and half of another line
+            (Path(td) / "out.json.partial").write_text(
+                json.dumps({"link": "L2", "body": "OLD"}) + "\n" + '{"link": "L3", "bo'
+            )
+
+            calls = []
+
+            def fake_extract(url):
+                calls.append(url)
+                return f"NEW-{url}"
+
+            self._run([str(inp), str(outp), "--resume"], fake_extract)
+
+            result = json.loads(outp.read_text(encoding="utf-8"))
+            self.assertEqual(sorted(calls), ["L1", "L3"])
+            self.assertEqual([a["body"] for a in result], ["NEW-L1", "OLD", "NEW-L3"])
+
+    def test_interrupted_resume_keeps_checkpoint(self):
+        articles = [{"link": "L1"}, {"link": "L2"}]
+        with tempfile.TemporaryDirectory() as td:
+            inp = Path(td) / "in.json"
+            outp = Path(td) / "out.json"
+            partial = Path(td) / "out.json.partial"
+            inp.write_text(json.dumps(articles))
+            partial.write_text(json.dumps({"link": "L1", "body": "OLD"}) + "\n")
+
+            def interrupt(url):
+                raise KeyboardInterrupt
+
+            with self.assertRaises(KeyboardInterrupt):
+                self._run([str(inp), str(outp), "--resume"], interrupt)
+
+            self.assertEqual(partial.read_text(), json.dumps({"link": "L1", "body": "OLD"}) + "\n")
+
+    def test_resume_keeps_articles_without_link_apart(self):
+        articles = [{"title": "A"}, {"title": "B"}, {"link": "L"}]
+        with tempfile.TemporaryDirectory() as td:
+            inp = Path(td) / "in.json"
+            outp = Path(td) / "out.json"
+            inp.write_text(json.dumps(articles))
+            (Path(td) / "out.json.partial").write_text(
+                json.dumps({"title": "A", "body": "OLD"}) + "\n"
+            )
+
+            calls = []
+
+            def fake_extract(url):
+                calls.append(url)
+                return f"NEW-{url}"
+
+            self._run([str(inp), str(outp), "--resume"], fake_extract)
+
+            result = json.loads(outp.read_text(encoding="utf-8"))
+            self.assertEqual(sorted(calls), ["", "L"])
+            self.assertEqual([a["body"] for a in result], ["OLD", "NEW-", "NEW-L"])
+
+    def test_jsonl_output_is_streamed(self):
+        articles = [{"link": "L1"}, {"link": "L2"}]
+        with tempfile.TemporaryDirectory() as td:
+            inp = Path(td) / "in.json"
+            outp = Path(td) / "out.jsonl"
+            inp.write_text(json.dumps(articles))
+
+            self._run([str(inp), str(outp)], lambda url: f"BODY-{url}")
+            self._run([str(inp), str(outp), "--resume"], lambda url: self.fail("nothing left to do"))
+
+            lines = [json.loads(l) for l in outp.read_text(encoding="utf-8").splitlines()]
+            self.assertEqual(sorted(a["body"] for a in lines), ["BODY-L1", "BODY-L2"])
+
+    def test_ndjson_output_is_streamed(self):
+        with tempfile.TemporaryDirectory() as td:
+            inp = Path(td) / "in.json"
+            outp = Path(td) / "out.ndjson"
+            inp.write_text(json.dumps([{"link": "L1"}]))
+
+            self._run([str(inp), str(outp)], lambda url: f"BODY-{url}")
+
+            self.assertEqual(json.loads(outp.read_text(encoding="utf-8"))["body"], "BODY-L1")
+            self.assertFalse((Path(td) / "out.ndjson.partial").exists())
+
+    def test_input_is_read_as_bodies_are_extracted(self):
+        articles = [{"link": f"L{i}"} for i in range(20)]
+        read = []
+
+        def iter_articles(path):
+            for art in articles:
+                read.append(art["link"])
+                yield dict(art)
+
+        seen = []
+
+        def fake_extract(url):
+            seen.append(len(read))
+            return f"BODY-{url}"
+
+        orig = be.iter_articles
+        be.iter_articles = iter_articles
+        try:
+            with tempfile.TemporaryDirectory() as td:
+                self._run(["in.json", str(Path(td) / "out.jsonl")], fake_extract)
+        finally:
+            be.iter_articles = orig
+        self.assertLess(seen[0], len(articles))
+
+
+
 if __name__ == "__main__":
     unittest.main()
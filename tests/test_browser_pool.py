@@ -0,0 +1,173 @@
+import sys
+import types
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# stub modules so import succeeds
+for mod in ["requests", "bs4"]:
+    if mod not in sys.modules:
+        m = types.ModuleType(mod)
+        if mod == "bs4":
+            m.BeautifulSoup = lambda *a, **k: None
+        if mod == "requests":
+            m.get = lambda *a, **k: None
+            m.exceptions = types.SimpleNamespace(RequestException=Exception)
+        sys.modules[mod] = m
+
+from utubenews import browser_pool
+from utubenews.browser_pool import BrowserPool, wait_for_page
+
+
+class FakeDriver:
+    def __init__(self, ready_after=0, matches=True):
+        self.alive = True
+        self.quit_called = False
+        self.ready_after = ready_after
+        self.matches = matches
+        self.polls = 0
+        self.page_source = "<html></html>"
+        self.visited = []
+
+    def get(self, url):
+        self.visited.append(url)
+        self.page_source = f"<html>{url}</html>"
+
+    def execute_script(self, js):
+        if not self.alive:
+            raise RuntimeError("session deleted")
+        if js == "return 1":
+            return 1
+        self.polls += 1
+        return "complete" if self.polls > self.ready_after else "loading"
+
+    def find_elements(self, by, value):
+        return [object()] if self.matches else []
+
+    def quit(self):
+        self.quit_called = True
+
+
+class TestBrowserPool(unittest.TestCase):
+    def setUp(self):
+        self.drivers = []
+
+        def factory():
+            d = FakeDriver()
+            self.drivers.append(d)
+            return d
+
+        self.factory = factory
+
+    def test_session_reused_between_leases(self):
+        pool = BrowserPool(size=1, factory=self.factory)
+        with pool.lease() as a:
+            pass
+        with pool.lease() as b:
+            pass
+        self.assertIs(a, b)
+        self.assertEqual(pool.stats()["started"], 1)
+
+    def test_recycled_after_max_pages(self):
+        pool = BrowserPool(size=1, max_pages=2, factory=self.factory)
+        for _ in range(3):
+            with pool.lease():
+                pass
+        self.assertEqual(len(self.drivers), 2)
+        self.assertTrue(self.drivers[0].quit_called)
+        self.assertFalse(self.drivers[1].quit_called)
+
+    def test_unhealthy_session_replaced(self):
+        pool = BrowserPool(size=1, factory=self.factory)
+        with pool.lease() as first:
+            pass
+        first.alive = False
+        with pool.lease() as second:
+            pass
+        self.assertIsNot(first, second)
+        self.assertTrue(first.quit_called)
+
+    def test_session_discarded_on_error(self):
+        pool = BrowserPool(size=1, factory=self.factory)
+        with self.assertRaises(ValueError):
+            with pool.lease():
+                raise ValueError("boom")
+        self.assertTrue(self.drivers[0].quit_called)
+        self.assertEqual(pool.stats()["idle"], 0)
+
+    def test_lease_times_out_when_exhausted(self):
+        pool = BrowserPool(size=1, factory=self.factory)
+        with pool.lease():
+            with self.assertRaises(TimeoutError):
+                with pool.lease(timeout=0.01):
+                    pass
+
+    def test_close_quits_idle_sessions(self):
+        pool = BrowserPool(size=2, factory=self.factory)
+        with pool.lease():
+            pass
+        pool.close()
+        self.assertTrue(self.drivers[0].quit_called)
+        with self.assertRaises(RuntimeError):
+            with pool.lease():
+                pass
+
+
+class TestWaitForPage(unittest.TestCase):
+    def test_waits_until_ready(self):
+        driver = FakeDriver(ready_after=2)
+        self.assertTrue(wait_for_page(driver, timeout=1.0, poll=0))
+        self.assertEqual(driver.polls, 3)
+
+    def test_gives_up_after_timeout(self):
+        driver = FakeDriver(matches=False)
+        self.assertFalse(wait_for_page(driver, timeout=0.05, selector="#app", poll=0.01))
+
+
+class TestFetchHtmlSelenium(unittest.TestCase):
+    def test_uses_pool_and_returns_source(self):
+        from utubenews import article_extractor as ae
+
+        drivers = []
+
+        def factory():
+            drivers.append(FakeDriver())
+            return drivers[-1]
+
+        orig = browser_pool._POOL
+        browser_pool._POOL = BrowserPool(size=1, factory=factory)
+        try:
+            html1 = ae.fetch_html_selenium("http://a", wait=0.1)
+            html2 = ae.fetch_html_selenium("http://b", wait=0.1, selector="article")
+        finally:
+            browser_pool._POOL.close()
+            browser_pool._POOL = orig
+        self.assertEqual(html1, "<html>http://a</html>")
+        self.assertEqual(html2, "<html>http://b</html>")
+        self.assertEqual(len(drivers), 1)
+
+
+class TestInstallOnce(unittest.TestCase):
+    def test_chromedriver_installed_once(self):
+        calls = []
+        cda = types.ModuleType("chromedriver_autoinstaller")
+        cda.install = lambda: calls.append(1)
+        backup = sys.modules.get("chromedriver_autoinstaller")
+        sys.modules["chromedriver_autoinstaller"] = cda
+        orig = browser_pool._INSTALLED
+        browser_pool._INSTALLED = False
+        try:
+            browser_pool._install_driver()
+            browser_pool._install_driver()
+        finally:
+            browser_pool._INSTALLED = orig
+            if backup is not None:
+                sys.modules["chromedriver_autoinstaller"] = backup
+            else:
+                del sys.modules["chromedriver_autoinstaller"]
+        self.assertEqual(calls, [1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import pickle
+import time
+import unittest
+
+from utubenews.deadline import Deadline, DeadlineExceeded
+
+
+class TestDeadline(unittest.TestCase):
+    def test_unbounded_deadline_never_expires(self):
+        d = Deadline()
+        self.assertFalse(d.expired())
+        self.assertIsNone(d.timeout())
+        self.assertEqual(d.timeout(10), 10)
+
+    def test_timeout_is_capped_by_remaining_time(self):
+        d = Deadline(2)
+        self.assertLessEqual(d.timeout(10), 2)
+        self.assertEqual(d.timeout(1), 1)
+
+    def test_expired_deadline_raises(self):
+        d = Deadline(0.01)
+        time.sleep(0.02)
+        self.assertTrue(d.expired())
+        with self.assertRaises(DeadlineExceeded):
+            d.check("summary")
+        with self.assertRaises(TimeoutError):
+            d.timeout(5)
+
+    def test_paused_deadline_does_not_run_down(self):
+        d = Deadline(0.05)
+        d.pause()
+        time.sleep(0.1)
+        self.assertFalse(d.expired())
+        d.resume()
+        self.assertGreater(d.remaining(), 0.02)
+        time.sleep(0.1)
+        self.assertTrue(d.expired())
+
+    def test_pickle_keeps_remaining_time(self):
+        d = pickle.loads(pickle.dumps(Deadline(30)))
+        self.assertGreater(d.remaining(), 25)
+        self.assertIsNone(pickle.loads(pickle.dumps(Deadline())).timeout())
+
+
+if __name__ == "__main__":
+    unittest.main()
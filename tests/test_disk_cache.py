@@ -0,0 +1,99 @@
+import sys
+import tempfile
+import types
+import unittest
+from pathlib import Path
+
+# stub modules so imports succeed without heavy deps
+for mod in ["requests", "bs4"]:
+    if mod not in sys.modules:
+        sys.modules[mod] = types.ModuleType(mod)
+
+from utubenews import summarizer
+from utubenews.disk_cache import SummaryCache, make_key
+
+
+class TestSummaryCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = SummaryCache(Path(self.tmp.name) / "s.sqlite3", max_entries=2)
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmp.cleanup()
+
+    def test_key_ignores_spacing_but_not_config(self):
+        self.assertEqual(make_key("A  b\n c", "m", 1), make_key(" A b c ", "m", 1))
+        self.assertNotEqual(make_key("A b c", "m", 1), make_key("A b c", "m", 2))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        self.cache.put("a", "A")
+        self.cache.put("b", "B")
+        self.assertEqual(self.cache.get("a"), "A")  # b is now the oldest
+        self.cache.put("c", "C")
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(self.cache.get("c"), "C")
+        st = self.cache.stats()
+        self.assertEqual((st["hits"], st["misses"], st["entries"]), (2, 1, 2))
+        self.assertAlmostEqual(st["hit_rate"], 2 / 3)
+
+    def test_summaries_survive_reopening(self):
+        self.cache.put("k", "요약")
+        again = SummaryCache(self.cache.path)
+        try:
+            self.assertEqual(again.get("k"), "요약")
+        finally:
+            again.close()
+
+
+class TestSummarizerUsesCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = SummaryCache(Path(self.tmp.name) / "s.sqlite3")
+        self.orig_get = summarizer.get_cache
+        summarizer.get_cache = lambda: self.cache
+        self.calls = []
+
+        def fake_pipe(texts, **_k):
+            self.calls.append(texts)
+            if isinstance(texts, list):
+                return [{"summary_text": f"S:{t}"} for t in texts]
+            return [{"summary_text": f"S:{texts}"}]
+
+        summarizer.set_pipeline(fake_pipe)
+
+    def tearDown(self):
+        summarizer.get_cache = self.orig_get
+        summarizer.set_pipeline(None)
+        self.cache.close()
+        self.tmp.cleanup()
+
+    def test_cached_texts_skip_the_model(self):
+        self.assertEqual(summarizer.llm_summarize("one text"), "S:one text")
+        self.assertEqual(summarizer.llm_summarize("one  text\n"), "S:one text")
+        out = summarizer.llm_summarize_batch(["one text", "two text"])
+        self.assertEqual(out, ["S:one text", "S:two text"])
+        self.assertEqual(self.calls, ["one text", ["two text"]])
+        self.assertEqual(self.cache.hits, 2)
+
+    def test_max_tokens_is_part_of_the_key(self):
+        summarizer.llm_summarize("one text", max_tokens=50)
+        summarizer.llm_summarize("one text", max_tokens=60)
+        self.assertEqual(len(self.calls), 2)
+
+    def test_quick_summarize_fallback_is_cached(self):
+        summarizer.set_pipeline(lambda *a, **k: [])
+        import utubenews.article_extractor as ae
+
+        orig_qs = ae.quick_summarize
+        ae.quick_summarize = lambda text, *a, **k: self.calls.append(text) or "FB"
+        try:
+            self.assertEqual(summarizer.llm_summarize("no model"), "FB")
+            self.assertEqual(summarizer.llm_summarize("no model"), "FB")
+        finally:
+            ae.quick_summarize = orig_qs
+        self.assertEqual(self.calls, ["no model"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -29,14 +29,15 @@ class TestEnrichJsonCLI(unittest.TestCase):
 
             called = {}
 
-            def fake_enrich(arts, *, with_screenshot=False):
-                called["arts"] = arts
+            def fake_enrich(arts, *, with_screenshot=False, incremental=False):
+                called["arts"] = list(arts)
                 called["with_screenshot"] = with_screenshot
-                return [{"done": True}]
+                called["incremental"] = incremental
+                return iter([{"done": True}])
 
-            orig_enrich = pipeline.enrich_articles
+            orig_enrich = pipeline.iter_enrich_articles
             orig_log = ut.setup_logging
-            pipeline.enrich_articles = fake_enrich
+            pipeline.iter_enrich_articles = fake_enrich
             ut.setup_logging = lambda *a, **k: None
 
             argv = sys.argv
@@ -48,7 +49,7 @@ class TestEnrichJsonCLI(unittest.TestCase):
             try:
                 runpy.run_module("utubenews.enrich_json", run_name="__main__")
             finally:
-                pipeline.enrich_articles = orig_enrich
+                pipeline.iter_enrich_articles = orig_enrich
                 ut.setup_logging = orig_log
                 sys.argv = argv
 
@@ -59,6 +60,7 @@ class TestEnrichJsonCLI(unittest.TestCase):
             self.assertEqual(result, [{"done": True}])
             self.assertEqual(called["arts"], articles)
             self.assertTrue(called["with_screenshot"])
+            self.assertTrue(called["incremental"])
 
     def test_cli_default_no_screenshot(self):
         articles = [{"title": "T", "link": "L"}]
@@ -68,13 +70,14 @@ class TestEnrichJsonCLI(unittest.TestCase):
 
             called = {}
 
-            def fake_enrich(arts, *, with_screenshot=False):
+            def fake_enrich(arts, *, with_screenshot=False, incremental=False):
                 called["with_screenshot"] = with_screenshot
+                called["incremental"] = incremental
                 return arts
 
-            orig_enrich = pipeline.enrich_articles
+            orig_enrich = pipeline.iter_enrich_articles
             orig_log = ut.setup_logging
-            pipeline.enrich_articles = fake_enrich
+            pipeline.iter_enrich_articles = fake_enrich
             ut.setup_logging = lambda *a, **k: None
 
             argv = sys.argv
@@ -82,12 +85,61 @@ class TestEnrichJsonCLI(unittest.TestCase):
             try:
                 runpy.run_module("utubenews.enrich_json", run_name="__main__")
             finally:
-                pipeline.enrich_articles = orig_enrich
+                pipeline.iter_enrich_articles = orig_enrich
                 ut.setup_logging = orig_log
                 sys.argv = argv
 
             self.assertFalse(called["with_screenshot"])
 
+    def test_cli_force_disables_incremental(self):
+        from utubenews import enrich_json
+
+        with tempfile.TemporaryDirectory() as td:
+            in_path = Path(td) / "in.json"
+            in_path.write_text(json.dumps([{"title": "T", "link": "L"}]))
+            called = {}
+
+            def fake_enrich(arts, *, with_screenshot=False, incremental=False):
+                called["incremental"] = incremental
+                return arts
+
+            orig_enrich = pipeline.iter_enrich_articles
+            pipeline.iter_enrich_articles = fake_enrich
+            try:
+                enrich_json.main([str(in_path), "--force", "--log-level", "ERROR"])
+            finally:
+                pipeline.iter_enrich_articles = orig_enrich
+
+            self.assertFalse(called["incremental"])
+
+
+    def test_jsonl_input_is_streamed_to_jsonl(self):
+        from utubenews import enrich_json
+
+        with tempfile.TemporaryDirectory() as td:
+            in_path = Path(td) / "in.jsonl"
+            in_path.write_text(
+                "\n".join(json.dumps({"title": f"T{i}", "link": f"L{i}"}) for i in range(3)) + "\n"
+            )
+            seen = []
+
+            def fake_enrich(arts, *, with_screenshot=False, incremental=False):
+                for art in arts:
+                    seen.append(art["link"])
+                    yield dict(art, body=f"B-{art['link']}")
+
+            orig_enrich = pipeline.iter_enrich_articles
+            pipeline.iter_enrich_articles = fake_enrich
+            try:
+                out_path = enrich_json.main([str(in_path), "--log-level", "ERROR"])
+            finally:
+                pipeline.iter_enrich_articles = orig_enrich
+
+            self.assertEqual(seen, ["L0", "L1", "L2"])
+            self.assertEqual(out_path.suffix, ".jsonl")
+            lines = [json.loads(l) for l in out_path.read_text(encoding="utf-8").splitlines()]
+            self.assertEqual([a["body"] for a in lines], ["B-L0", "B-L1", "B-L2"])
+
 
 if __name__ == "__main__":
     unittest.main()
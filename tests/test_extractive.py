@@ -0,0 +1,70 @@
+import random
+import sys
+import types
+import unittest
+
+for mod in ["requests", "bs4"]:
+    if mod not in sys.modules:
+        sys.modules[mod] = types.ModuleType(mod)
+
+from utubenews import extractive, summarizer
+
+_WORDS = ["AI", "chip", "model", "Model", "data", "보안", "게임", "출시", "İstanbul", "Kelvin", "x"]
+_ENDS = [". ", "! ", "? ", "。", ".\n", "\n\n", ".  \t", " ", ", "]
+
+
+def _random_text(rng: random.Random) -> str:
+    parts = []
+    for _ in range(rng.randint(0, 40)):
+        parts.append(" ".join(rng.choice(_WORDS) for _ in range(rng.randint(0, 8))))
+        parts.append(rng.choice(_ENDS))
+    return rng.choice(["", " ", "\n"]) + "".join(parts)
+
+
+@unittest.skipUnless(extractive.np is not None, "numpy not installed")
+class TestVectorizedSummaries(unittest.TestCase):
+    def test_matches_pure_python_version(self):
+        rng = random.Random(7)
+        for _ in range(300):
+            text = _random_text(rng)
+            for max_sent in (1, 3):
+                self.assertEqual(
+                    extractive.textrank_summary(text, max_sent),
+                    summarizer._textrank_summary_py(text, max_sent),
+                    text,
+                )
+
+    def test_ties_keep_pure_python_order(self):
+        # equal scores: the earlier sentence wins
+        text = " ".join(f"Alpha beta gamma delta number{i} item." for i in range(8))
+        self.assertEqual(
+            extractive.textrank_summary(text, 2), summarizer._textrank_summary_py(text, 2)
+        )
+
+    def test_textrank_splits_common_terms_into_blocks(self):
+        rng = random.Random(11)
+        orig = extractive._TERM_BLOCK
+        extractive._TERM_BLOCK = 2
+        try:
+            for _ in range(100):
+                text = _random_text(rng)
+                self.assertEqual(
+                    extractive.textrank_summary(text, 2), summarizer._textrank_summary_py(text, 2), text
+                )
+        finally:
+            extractive._TERM_BLOCK = orig
+
+    def test_textrank_uses_numpy(self):
+        text = " ".join(f"Sentence {i} about the new chip." for i in range(6))
+        calls = []
+        orig = extractive.textrank_summary
+        extractive.textrank_summary = lambda *a, **k: calls.append(a) or orig(*a, **k)
+        try:
+            summarizer.textrank_summary(text)
+        finally:
+            extractive.textrank_summary = orig
+        self.assertEqual(len(calls), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
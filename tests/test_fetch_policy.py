@@ -0,0 +1,103 @@
+import random
+import types
+import unittest
+
+from utubenews.fetch_policy import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    host_of,
+    sniff_charset,
+)
+
+
+class HTTPFailure(Exception):
+    def __init__(self, status, headers=None):
+        super().__init__(f"status {status}")
+        self.response = types.SimpleNamespace(status_code=status, headers=headers or {})
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_client_errors_are_not_retried(self):
+        policy = RetryPolicy(attempts=3)
+        self.assertIsNone(policy.next_delay(0, HTTPFailure(404)))
+        self.assertIsNotNone(policy.next_delay(0, HTTPFailure(503)))
+        self.assertIsNotNone(policy.next_delay(0, ConnectionError("down")))
+        self.assertIsNone(policy.next_delay(0, ValueError("bad url")))
+
+    def test_backoff_is_jittered_and_capped(self):
+        policy = RetryPolicy(attempts=10, base_delay=1.0, max_delay=4.0, rng=random.Random(1))
+        delays = [policy.next_delay(i, HTTPFailure(500)) for i in range(6)]
+        for i, d in enumerate(delays):
+            self.assertGreaterEqual(d, 0)
+            self.assertLessEqual(d, min(4.0, 2 ** i))
+        self.assertIsNone(policy.next_delay(9, HTTPFailure(500)))
+
+    def test_retry_after_is_honored(self):
+        policy = RetryPolicy(attempts=3, max_delay=10.0)
+        self.assertEqual(policy.next_delay(0, HTTPFailure(429, {"Retry-After": "7"})), 7.0)
+        # asking for longer than max_delay gives up instead of stalling
+        self.assertIsNone(policy.next_delay(0, HTTPFailure(429, {"Retry-After": "120"})))
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_opens_after_threshold_and_probes_after_timeout(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60.0)
+        for _ in range(2):
+            breaker.before_request("h")
+            breaker.record_failure("h")
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_request("h")
+        stats = breaker.stats()["h"]
+        self.assertEqual(stats["state"], "open")
+        self.assertEqual(stats["short_circuited"], 1)
+        self.assertEqual(stats["times_opened"], 1)
+
+        breaker.reset_timeout = 0.0
+        breaker.before_request("h")  # half-open probe allowed
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_request("h")  # only one probe at a time
+        breaker.record_success("h")
+        self.assertEqual(breaker.stats()["h"]["state"], "closed")
+
+    def test_client_errors_keep_breaker_closed(self):
+        breaker = CircuitBreaker(failure_threshold=1)
+        breaker.before_request("h")
+        breaker.record("h", HTTPFailure(404), RetryPolicy())
+        self.assertEqual(breaker.stats()["h"]["state"], "closed")
+
+    def test_host_of(self):
+        self.assertEqual(host_of("https://News.Example.com:8080/a?b=1"), "news.example.com")
+
+
+class TestSniffCharset(unittest.TestCase):
+    KO = "<p>똠방각하 한글 기사</p>"
+
+    def test_header_wins_and_euc_kr_means_cp949(self):
+        data = self.KO.encode("cp949")
+        self.assertEqual(sniff_charset(data, "EUC-KR"), "cp949")
+        self.assertEqual(sniff_charset(b"<meta charset=euc-kr>", "utf-8"), "utf-8")
+
+    def test_latin_1_means_cp1252(self):
+        data = b"<p>\x93quoted\x94</p>"
+        charset = sniff_charset(data, "iso-8859-1")
+        self.assertEqual(charset, "cp1252")
+        self.assertEqual(data.decode(charset), "<p>\u201cquoted\u201d</p>")
+
+    def test_meta_declaration(self):
+        head = b'<meta http-equiv="Content-Type" content="text/html; charset=ks_c_5601-1987">'
+        self.assertEqual(sniff_charset(head + self.KO.encode("cp949")), "cp949")
+        self.assertEqual(sniff_charset(b'<meta charset="UTF-8">'), "utf-8")
+
+    def test_unknown_labels_are_ignored(self):
+        self.assertEqual(sniff_charset(b"<meta charset=bogus><p>a</p>", "x-nope"), "utf-8")
+
+    def test_undeclared_falls_back_by_validity(self):
+        self.assertEqual(sniff_charset(self.KO.encode("utf-8")), "utf-8")
+        # a multi-byte character cut off by the size cap is still utf-8
+        self.assertEqual(sniff_charset(self.KO.encode("utf-8")[:5]), "utf-8")
+        self.assertEqual(sniff_charset(self.KO.encode("cp949")), "cp949")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import os
+import sys
+import threading
+import time
+import types
+import unittest
+from unittest import mock
+
+os.environ.setdefault("UTUBENEWS_CACHE_DIR", "off")
+
+for mod in ["requests", "bs4"]:
+    if mod not in sys.modules:
+        sys.modules[mod] = types.ModuleType(mod)
+
+from utubenews import summarizer
+from utubenews.model_registry import ModelRegistry
+
+
+class _Loader:
+    def __init__(self, delay=0.0):
+        self.calls = 0
+        self.delay = delay
+        self.lock = threading.Lock()
+
+    def __call__(self):
+        with self.lock:
+            self.calls += 1
+            n = self.calls
+        time.sleep(self.delay)
+        return f"model {n}"
+
+
+class TestModelRegistry(unittest.TestCase):
+    def test_concurrent_callers_load_once(self):
+        loader = _Loader(delay=0.05)
+        registry = ModelRegistry(loader)
+        got = []
+        threads = [threading.Thread(target=lambda: got.append(registry.get())) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(loader.calls, 1)
+        self.assertEqual(set(got), {"model 1"})
+
+    def test_leases_load_replicas_up_to_the_limit(self):
+        loader = _Loader()
+        registry = ModelRegistry(loader, max_replicas=2)
+        with registry.lease() as first:
+            with registry.lease() as second:
+                self.assertNotEqual(first, second)
+                with self.assertRaises(TimeoutError):
+                    with registry.lease(timeout=0.05):
+                        pass
+        with registry.lease() as again:
+            self.assertIn(again, {first, second})
+        self.assertEqual(loader.calls, 2)
+
+    def test_waiting_lease_gets_returned_replica(self):
+        registry = ModelRegistry(_Loader())
+        got = []
+
+        def borrow():
+            with registry.lease(timeout=5) as model:
+                got.append(model)
+
+        with registry.lease():
+            t = threading.Thread(target=borrow)
+            t.start()
+            time.sleep(0.05)
+            self.assertEqual(got, [])
+        t.join()
+        self.assertEqual(got, ["model 1"])
+
+    def test_stats_report_load_time_and_utilization(self):
+        registry = ModelRegistry(_Loader(delay=0.01))
+        with registry.lease():
+            time.sleep(0.02)
+        (st,) = registry.stats()["replicas"]
+        self.assertGreaterEqual(st["load_s"], 0.01)
+        self.assertEqual(st["leases"], 1)
+        self.assertGreater(st["busy_s"], 0.0)
+        self.assertGreater(st["utilization"], 0.0)
+        self.assertLessEqual(st["utilization"], 1.0)
+
+
+class TestSummarizerRegistry(unittest.TestCase):
+    def tearDown(self):
+        summarizer.set_pipeline(None)
+
+    def test_set_and_reset_pipeline(self):
+        fake = lambda text, **k: [{"summary_text": "fake"}]
+        summarizer.set_pipeline(fake)
+        self.assertIs(summarizer._load_pipeline(), fake)
+        self.assertEqual(summarizer.llm_summarize("some text"), "fake")
+        self.assertEqual(summarizer.model_stats()["replicas"][0]["leases"], 1)
+
+        other = lambda text, **k: [{"summary_text": "other"}]
+        summarizer.set_pipeline(None)
+        self.assertEqual(summarizer.model_stats()["replicas"], [])
+        with mock.patch.object(summarizer._REGISTRY, "_loader", lambda: other):
+            self.assertIs(summarizer._load_pipeline(), other)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import sys
+import tempfile
+import types
+import unittest
+from pathlib import Path
+
+# stub modules so imports succeed without heavy deps
+for mod in ["requests", "bs4"]:
+    if mod not in sys.modules:
+        sys.modules[mod] = types.ModuleType(mod)
+
+from utubenews import onnx_backend
+
+
+class FakeORTModel:
+    calls = []
+
+    def __init__(self, path):
+        self.path = path
+
+    @classmethod
+    def from_pretrained(cls, path, **kwargs):
+        cls.calls.append((str(path), kwargs))
+        return cls(path)
+
+    def save_pretrained(self, directory):
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        for name in onnx_backend.ONNX_FILES + ("config.json",):
+            (Path(directory) / name).write_text("x")
+
+
+class FakeQuantizer:
+    def __init__(self, source, file_name):
+        self.source, self.file_name = source, file_name
+
+    @classmethod
+    def from_pretrained(cls, source, file_name):
+        return cls(source, file_name)
+
+    def quantize(self, save_dir, quantization_config):
+        name = self.file_name.replace(".onnx", "_quantized.onnx")
+        (Path(save_dir) / name).write_text(quantization_config)
+
+
+class FakeTokenizer:
+    @classmethod
+    def from_pretrained(cls, path, **kwargs):
+        return cls()
+
+    def save_pretrained(self, directory):
+        (Path(directory) / "tokenizer.json").write_text("{}")
+
+
+class TestLoadOnnxPipeline(unittest.TestCase):
+    def setUp(self):
+        FakeORTModel.calls = []
+        ort = types.ModuleType("optimum.onnxruntime")
+        ort.ORTModelForSeq2SeqLM = FakeORTModel
+        ort.ORTQuantizer = FakeQuantizer
+        conf = types.ModuleType("optimum.onnxruntime.configuration")
+        conf.AutoQuantizationConfig = types.SimpleNamespace(
+            avx2=lambda **k: "avx2", arm64=lambda **k: "arm64"
+        )
+        trans = types.ModuleType("transformers")
+        trans.AutoTokenizer = FakeTokenizer
+        trans.pipeline = lambda task, model, tokenizer: (task, model, tokenizer)
+        fakes = {
+            "optimum": types.ModuleType("optimum"),
+            "optimum.onnxruntime": ort,
+            "optimum.onnxruntime.configuration": conf,
+            "transformers": trans,
+        }
+        self.saved = {name: sys.modules.get(name) for name in fakes}
+        sys.modules.update(fakes)
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        for name, mod in self.saved.items():
+            if mod is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = mod
+        self.tmp.cleanup()
+
+    def test_export_is_cached_on_disk(self):
+        cache = Path(self.tmp.name)
+        task, model, _ = onnx_backend.load_onnx_pipeline("org/model", "rev", cache_dir=cache)
+        onnx_backend.load_onnx_pipeline("org/model", "rev", cache_dir=cache)
+
+        exports = [c for c in FakeORTModel.calls if c[1].get("export")]
+        self.assertEqual(exports, [("org/model", {"revision": "rev", "export": True})])
+        self.assertEqual(task, "summarization")
+        self.assertEqual(Path(model.path), cache / "onnx" / "org--model-rev")
+        self.assertTrue((Path(model.path) / "encoder_model.onnx").exists())
+
+    def test_int8_loads_quantized_graphs(self):
+        cache = Path(self.tmp.name)
+        _, model, _ = onnx_backend.load_onnx_pipeline(
+            "org/model", "rev", quantize=True, cache_dir=cache
+        )
+
+        int8_dir = Path(model.path)
+        self.assertEqual(int8_dir.name, "org--model-rev-int8")
+        self.assertTrue((int8_dir / "config.json").exists())
+        self.assertTrue((int8_dir / "tokenizer.json").exists())
+        self.assertEqual(FakeORTModel.calls[-1][1], {
+            "encoder_file_name": "encoder_model_quantized.onnx",
+            "decoder_file_name": "decoder_model_quantized.onnx",
+            "decoder_with_past_file_name": "decoder_with_past_model_quantized.onnx",
+        })
+
+
+if __name__ == "__main__":
+    unittest.main()
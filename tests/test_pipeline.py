@@ -1,8 +1,12 @@
+import os
 import types
 import sys
 import unittest
 from pathlib import Path
 
+# keep fake model outputs out of the on-disk summary cache
+os.environ.setdefault("UTUBENEWS_CACHE_DIR", "off")
+
 # ensure heavy deps are stubbed
 for mod in ["feedparser", "yaml", "requests", "bs4", "slugify", "utubenews.screenshot"]:
     if mod not in sys.modules:
@@ -229,35 +233,40 @@ class TestCollectAll(unittest.TestCase):
         self.assertEqual(len(result), 30)
         self.assertGreaterEqual(naver_count, 10)
 
+def _batched(fake_sum):
+    """Wrap a per-text fake summarizer as ``llm_summarize_batch``."""
+    return lambda srcs, **k: [fake_sum(src, **k) for src in srcs]
+
+
 class TestEnrichArticles(unittest.TestCase):
     def test_enrich_articles_uses_summary_or_body(self):
         art_with_sum = {"title": "T1", "link": "L1", "summary": "SUM"}
         art_no_sum = {"title": "T2", "link": "L2"}
         arts = [art_with_sum, art_no_sum]
 
-        def fake_extract(link):
+        def fake_extract(link, **kwargs):
             return f"BODY-{link}"
 
         def fake_clean(text):
             return text
 
-        def fake_sum(src):
+        def fake_sum(src, **kwargs):
             return f"SCRIPT-{src}"
 
         orig = {
             "ext": pipeline.extract_main_text,
             "clean": pipeline.clean_text,
-            "llm": pipeline.llm_summarize,
+            "llm": pipeline.llm_summarize_batch,
         }
         pipeline.extract_main_text = fake_extract
         pipeline.clean_text = fake_clean
-        pipeline.llm_summarize = fake_sum
+        pipeline.llm_summarize_batch = _batched(fake_sum)
         try:
             out = pipeline.enrich_articles(arts)
         finally:
             pipeline.extract_main_text = orig["ext"]
             pipeline.clean_text = orig["clean"]
-            pipeline.llm_summarize = orig["llm"]
+            pipeline.llm_summarize_batch = orig["llm"]
 
         self.assertEqual(out[0]["script"], "SCRIPT-BODY-L1…")
         self.assertEqual(out[1]["script"], "SCRIPT-BODY-L2…")
@@ -267,30 +276,30 @@ class TestEnrichArticles(unittest.TestCase):
     def test_enrich_articles_warns_on_short_script(self):
         art = {"title": "T", "link": "L"}
 
-        def fake_extract(link):
-            return ""
+        def fake_extract(link, **kwargs):
+            return "Body text"
 
         def fake_clean(text):
             return text
 
-        def fake_sum(src):
+        def fake_sum(src, **kwargs):
             return "short"
 
         orig = {
             "ext": pipeline.extract_main_text,
             "clean": pipeline.clean_text,
-            "llm": pipeline.llm_summarize,
+            "llm": pipeline.llm_summarize_batch,
         }
         pipeline.extract_main_text = fake_extract
         pipeline.clean_text = fake_clean
-        pipeline.llm_summarize = fake_sum
+        pipeline.llm_summarize_batch = _batched(fake_sum)
         try:
             with self.assertLogs(pipeline._LOG, level="WARNING") as log:
                 out = pipeline.enrich_articles([art])
         finally:
             pipeline.extract_main_text = orig["ext"]
             pipeline.clean_text = orig["clean"]
-            pipeline.llm_summarize = orig["llm"]
+            pipeline.llm_summarize_batch = orig["llm"]
 
         self.assertEqual(out[0]["script"], "short…")
         self.assertTrue(any("Suspicious script" in m for m in log.output))
@@ -316,30 +325,30 @@ class TestEnrichArticles(unittest.TestCase):
     def test_enrich_articles_warns_on_unbalanced_quote(self):
         art = {"title": "T", "link": "L"}
 
-        def fake_extract(link):
-            return ""
+        def fake_extract(link, **kwargs):
+            return "Body text"
 
         def fake_clean(text):
             return text
 
-        def fake_sum(src):
+        def fake_sum(src, **kwargs):
             return "Bad text\""
 
         orig = {
             "ext": pipeline.extract_main_text,
             "clean": pipeline.clean_text,
-            "llm": pipeline.llm_summarize,
+            "llm": pipeline.llm_summarize_batch,
         }
         pipeline.extract_main_text = fake_extract
         pipeline.clean_text = fake_clean
-        pipeline.llm_summarize = fake_sum
+        pipeline.llm_summarize_batch = _batched(fake_sum)
         try:
             with self.assertLogs(pipeline._LOG, level="WARNING") as log:
                 out = pipeline.enrich_articles([art])
         finally:
             pipeline.extract_main_text = orig["ext"]
             pipeline.clean_text = orig["clean"]
-            pipeline.llm_summarize = orig["llm"]
+            pipeline.llm_summarize_batch = orig["llm"]
 
         self.assertEqual(out[0]["script"], "Bad text…")
         self.assertTrue(any("Suspicious script" in m for m in log.output))
@@ -365,30 +374,30 @@ class TestEnrichArticles(unittest.TestCase):
     def test_enrich_articles_falls_back_on_non_text_script(self):
         art = {"title": "T", "link": "L"}
 
-        def fake_extract(link):
-            return ""
+        def fake_extract(link, **kwargs):
+            return "Body text"
 
         def fake_clean(text):
             return text
 
-        def fake_sum(src):
+        def fake_sum(src, **kwargs):
             return "?!"
 
         orig = {
             "ext": pipeline.extract_main_text,
             "clean": pipeline.clean_text,
-            "llm": pipeline.llm_summarize,
+            "llm": pipeline.llm_summarize_batch,
         }
         pipeline.extract_main_text = fake_extract
         pipeline.clean_text = fake_clean
-        pipeline.llm_summarize = fake_sum
+        pipeline.llm_summarize_batch = _batched(fake_sum)
         try:
             with self.assertLogs(pipeline._LOG, level="WARNING") as log:
                 out = pipeline.enrich_articles([art])
         finally:
             pipeline.extract_main_text = orig["ext"]
             pipeline.clean_text = orig["clean"]
-            pipeline.llm_summarize = orig["llm"]
+            pipeline.llm_summarize_batch = orig["llm"]
 
         self.assertEqual(out[0]["script"], "T…")
         self.assertTrue(any("Suspicious script" in m for m in log.output))
@@ -413,6 +422,267 @@ class TestEnrichArticles(unittest.TestCase):
         self.assertTrue(str(called["path"]).endswith(".png"))
         self.assertEqual(out[0]["screenshot"], f"screens/{Path(called['path']).name}")
 
+    def test_exhausted_budget_degrades_to_summary(self):
+        arts = [{"title": "Title one", "link": "L1", "summary": "RSS summary text"}]
+        calls = []
+
+        def fake_extract(link, deadline=None, **kwargs):
+            calls.append(("extract", deadline.expired()))
+            return ""
+
+        def fake_sum(src, **kwargs):
+            calls.append(("llm", src))
+            return src
+
+        def fake_capture(url, path, **kwargs):
+            calls.append(("capture", url))
+
+        orig = {
+            "ext": pipeline.extract_main_text,
+            "llm": pipeline.llm_summarize_batch,
+            "cap": pipeline.capture,
+        }
+        pipeline.extract_main_text = fake_extract
+        pipeline.llm_summarize_batch = _batched(fake_sum)
+        pipeline.capture = fake_capture
+        try:
+            out = pipeline.enrich_articles(arts, with_screenshot=True, article_budget=0)
+        finally:
+            pipeline.extract_main_text = orig["ext"]
+            pipeline.llm_summarize_batch = orig["llm"]
+            pipeline.capture = orig["cap"]
+
+        self.assertEqual(calls, [("extract", True)])
+        self.assertEqual(out[0]["body"], "")
+        self.assertEqual(out[0]["script"], "RSS summary text…")
+        self.assertNotIn("screenshot", out[0])
+
+    def test_summary_tier_is_recorded(self):
+        rss = {"title": "T1", "link": "L1", "summary": "Short RSS summary."}
+        full = {"title": "T2", "link": "L2"}
+        summarized = []
+
+        def fake_extract(link, **kwargs):
+            return "" if link == "L1" else "Long body text."
+
+        def fake_sum(src, **kwargs):
+            summarized.append(src)
+            return f"SCRIPT-{src}"
+
+        orig = {"ext": pipeline.extract_main_text, "llm": pipeline.llm_summarize_batch}
+        pipeline.extract_main_text = fake_extract
+        pipeline.llm_summarize_batch = _batched(fake_sum)
+        try:
+            out = pipeline.enrich_articles([rss, full])
+        finally:
+            pipeline.extract_main_text = orig["ext"]
+            pipeline.llm_summarize_batch = orig["llm"]
+
+        self.assertEqual([a["summary_tier"] for a in out], ["passthrough", "llm"])
+        self.assertEqual(out[0]["script"], "Short RSS summary.")
+        self.assertEqual(summarized, ["Long body text."])
+
+    def test_incremental_only_fills_missing_or_stale(self):
+        done = {"title": "T1", "link": "L1", "body": "B1", "script": "S1"}
+        done["enrich_fp"] = pipeline.input_fingerprint(done)
+        legacy = {"title": "T2", "link": "L2", "body": "B2", "script": "S2"}
+        changed = {"title": "T3 edited", "link": "L3", "body": "B3", "script": "S3"}
+        changed["enrich_fp"] = "outdated"
+        no_script = {"title": "T4", "link": "L4", "body": "B4"}
+        fresh = {"title": "T5", "link": "L5"}
+        arts = [done, legacy, changed, no_script, fresh]
+        extracted, summarized, captured = [], [], []
+
+        def fake_extract(link, **kwargs):
+            extracted.append(link)
+            return f"NEW-{link}"
+
+        def fake_sum(src, **kwargs):
+            summarized.append(src)
+            return f"Script of {src}"
+
+        def fake_capture(url, path, **kwargs):
+            captured.append(url)
+
+        orig = {
+            "ext": pipeline.extract_main_text,
+            "llm": pipeline.llm_summarize_batch,
+            "cap": pipeline.capture,
+            "has": pipeline._has_screenshot,
+        }
+        pipeline.extract_main_text = fake_extract
+        pipeline.llm_summarize_batch = _batched(fake_sum)
+        pipeline.capture = fake_capture
+        pipeline._has_screenshot = lambda art: art["link"] == "L1"
+        try:
+            out = pipeline.enrich_articles(arts, with_screenshot=True, incremental=True)
+        finally:
+            pipeline.extract_main_text = orig["ext"]
+            pipeline.llm_summarize_batch = orig["llm"]
+            pipeline.capture = orig["cap"]
+            pipeline._has_screenshot = orig["has"]
+
+        self.assertEqual(extracted, ["L3", "L5"])
+        self.assertEqual(summarized, ["NEW-L3", "B4", "NEW-L5"])
+        self.assertEqual(captured, ["L2", "L3", "L4", "L5"])
+        self.assertEqual(out[0]["script"], "S1")
+        self.assertEqual(out[1]["body"], "B2")
+        self.assertTrue(all(a["enrich_fp"] == pipeline.input_fingerprint(a) for a in out))
+
+    def test_budget_bounds_summary_time(self):
+        seen = {}
+
+        def fake_sum(src, max_time=None):
+            seen["max_time"] = max_time
+            return "A fine script."
+
+        orig = {"ext": pipeline.extract_main_text, "llm": pipeline.llm_summarize_batch}
+        pipeline.extract_main_text = lambda link, **k: "Body text"
+        pipeline.llm_summarize_batch = _batched(fake_sum)
+        try:
+            pipeline.enrich_articles([{"title": "T", "link": "L"}], article_budget=30)
+            self.assertLessEqual(seen["max_time"], 30)
+            pipeline.enrich_articles([{"title": "T", "link": "L"}], article_budget=None)
+            self.assertIsNone(seen["max_time"])
+        finally:
+            pipeline.extract_main_text = orig["ext"]
+            pipeline.llm_summarize_batch = orig["llm"]
+
+    def test_scripts_are_summarized_in_batches(self):
+        events = []
+
+        def fake_extract(link, **kwargs):
+            events.append(link)
+            return f"Body {link}"
+
+        def fake_batch(sources, **kwargs):
+            events.append(list(sources))
+            return [f"Script of {src}." for src in sources]
+
+        arts = [{"title": f"T{i}", "link": f"L{i}"} for i in range(3)]
+        orig = {
+            "ext": pipeline.extract_main_text,
+            "llm": pipeline.llm_summarize_batch,
+            "size": pipeline.LLM_BATCH_SIZE,
+        }
+        pipeline.extract_main_text = fake_extract
+        pipeline.llm_summarize_batch = fake_batch
+        pipeline.LLM_BATCH_SIZE = 2
+        try:
+            out = pipeline.enrich_articles(arts, article_budget=None)
+        finally:
+            pipeline.extract_main_text = orig["ext"]
+            pipeline.llm_summarize_batch = orig["llm"]
+            pipeline.LLM_BATCH_SIZE = orig["size"]
+
+        self.assertEqual(events, ["L0", "L1", ["Body L0", "Body L1"], "L2", ["Body L2"]])
+        self.assertEqual([a["script"] for a in out], [f"Script of Body L{i}." for i in range(3)])
+
+
+def _installed(*names):
+    """Return ``True`` if fresh interpreters can import ``names`` (not stubs)."""
+    from importlib.machinery import PathFinder
+
+    return all(PathFinder.find_spec(name) is not None for name in names)
+
+
+class TestExtractMainTexts(unittest.TestCase):
+    # parsing processes start fresh and import the real dependencies
+    @unittest.skipUnless(_installed("requests", "bs4"), "requests/bs4 not installed")
+    def test_fetch_on_threads_and_parse_in_processes(self):
+        from utubenews import article_extractor as ae
+
+        pages = {
+            "http://a": b"<html><article><p>Alpha body text.</p></article></html>",
+            "http://b": "<html><article><p>베타 본문입니다.</p></article></html>".encode("euc-kr"),
+        }
+
+        def fake_fetch(url, max_bytes=None, **kwargs):
+            if url == "http://pdf":
+                raise ae.SkippedPage(url, "content type application/pdf")
+            return pages[url], "euc-kr" if url == "http://b" else None
+
+        orig_fetch = ae.fetch_bytes
+        ae.fetch_bytes = fake_fetch
+        try:
+            out = ae.extract_main_texts(["http://a", "http://pdf", "http://b"], cpu_workers=2)
+        finally:
+            ae.fetch_bytes = orig_fetch
+
+        self.assertEqual(out[0], "Alpha body text.")
+        self.assertEqual(out[1], "")
+        self.assertEqual(out[2], "베타 본문입니다.")
+
+    def test_enrich_articles_parallel_uses_batch_extraction(self):
+        arts = [{"title": "T1", "link": "L1"}, {"title": "T2", "link": "L2"}]
+        called = {}
+
+        def fake_batch(urls, **kwargs):
+            called["urls"] = urls
+            return [f"BODY-{u}" for u in urls]
+
+        def fail_single(link, **kwargs):
+            raise AssertionError("serial extraction should not run")
+
+        orig = {
+            "batch": pipeline.extract_main_texts,
+            "ext": pipeline.extract_main_text,
+            "llm": pipeline.llm_summarize_batch,
+        }
+        pipeline.extract_main_texts = fake_batch
+        pipeline.extract_main_text = fail_single
+        pipeline.llm_summarize_batch = _batched(lambda src, **k: f"SCRIPT-{src}.")
+        try:
+            out = pipeline.enrich_articles(arts, parallel=True)
+        finally:
+            pipeline.extract_main_texts = orig["batch"]
+            pipeline.extract_main_text = orig["ext"]
+            pipeline.llm_summarize_batch = orig["llm"]
+
+        self.assertEqual(called["urls"], ["L1", "L2"])
+        self.assertEqual([a["body"] for a in out], ["BODY-L1", "BODY-L2"])
+
+
+class TestEnrichArticlesAsync(unittest.TestCase):
+    def test_fetches_concurrently_and_keeps_order(self):
+        import asyncio
+
+        arts = [{"title": f"T{i}", "link": f"L{i}"} for i in range(5)]
+        active = {"now": 0, "peak": 0}
+
+        class FakeClient:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+        async def fake_extract(link, client, executor=None, deadline=None):
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+            await asyncio.sleep(0.01)
+            active["now"] -= 1
+            return f"BODY-{link}"
+
+        orig = {
+            "client": pipeline.create_client,
+            "ext": pipeline.extract_main_text_async,
+            "llm": pipeline.llm_summarize_batch,
+        }
+        pipeline.create_client = lambda **k: FakeClient()
+        pipeline.extract_main_text_async = fake_extract
+        pipeline.llm_summarize_batch = _batched(lambda src, **k: f"SCRIPT-{src}.")
+        try:
+            out = asyncio.run(pipeline.enrich_articles_async(arts, concurrency=2))
+        finally:
+            pipeline.create_client = orig["client"]
+            pipeline.extract_main_text_async = orig["ext"]
+            pipeline.llm_summarize_batch = orig["llm"]
+
+        self.assertEqual([a["body"] for a in out], [f"BODY-L{i}" for i in range(5)])
+        self.assertEqual(out[3]["script"], "SCRIPT-BODY-L3.")
+        self.assertEqual(active["peak"], 2)
+
 
 class TestNormalizeScript(unittest.TestCase):
     def test_normalize_script_fixes_trailing_quote(self):
@@ -457,7 +727,7 @@ class TestRun(unittest.TestCase):
             self.assertIs(arts, collected)
             return Path("out.json")
 
-        def fake_enrich(arts, *, with_screenshot=False):
+        def fake_enrich(arts, *, with_screenshot=False, parallel=False):
             order.append("enrich")
             self.assertIs(arts, collected)
             self.assertTrue(with_screenshot)
@@ -469,7 +739,9 @@ class TestRun(unittest.TestCase):
             "sort": pipeline.sort_articles,
             "save": pipeline.save_articles,
             "enrich": pipeline.enrich_articles,
+            "warm_up": pipeline.warm_up,
         }
+        pipeline.warm_up = lambda: order.append("warm_up")
         pipeline.collect_articles = fake_collect
         pipeline.deduplicate_fuzzy = fake_dedup
         pipeline.sort_articles = fake_sort
@@ -483,9 +755,10 @@ class TestRun(unittest.TestCase):
             pipeline.sort_articles = orig["sort"]
             pipeline.save_articles = orig["save"]
             pipeline.enrich_articles = orig["enrich"]
+            pipeline.warm_up = orig["warm_up"]
 
         self.assertEqual(path, Path("out.json"))
-        self.assertEqual(order, ["collect", "dedup", "sort", "enrich", "save"])
+        self.assertEqual(order, ["warm_up", "collect", "dedup", "sort", "enrich", "save"])
 
     def test_run_without_screenshot_still_enriches(self):
         collected = [{"title": "A"}]
@@ -507,7 +780,7 @@ class TestRun(unittest.TestCase):
             order.append("save")
             return Path("out.json")
 
-        def fake_enrich(arts, *, with_screenshot=False):
+        def fake_enrich(arts, *, with_screenshot=False, parallel=False):
             order.append("enrich")
             self.assertFalse(with_screenshot)
             return arts
@@ -518,7 +791,9 @@ class TestRun(unittest.TestCase):
             "sort": pipeline.sort_articles,
             "save": pipeline.save_articles,
             "enrich": pipeline.enrich_articles,
+            "warm_up": pipeline.warm_up,
         }
+        pipeline.warm_up = lambda: order.append("warm_up")
         pipeline.collect_articles = fake_collect
         pipeline.deduplicate_fuzzy = fake_dedup
         pipeline.sort_articles = fake_sort
@@ -532,9 +807,10 @@ class TestRun(unittest.TestCase):
             pipeline.sort_articles = orig["sort"]
             pipeline.save_articles = orig["save"]
             pipeline.enrich_articles = orig["enrich"]
+            pipeline.warm_up = orig["warm_up"]
 
         self.assertEqual(path, Path("out.json"))
-        self.assertEqual(order, ["collect", "dedup", "sort", "enrich", "save"])
+        self.assertEqual(order, ["warm_up", "collect", "dedup", "sort", "enrich", "save"])
 
 
 class TestMainCLI(unittest.TestCase):
@@ -1,7 +1,12 @@
+import os
 import sys
+import time
 import types
 import unittest
 
+# keep fake model outputs out of the on-disk summary cache
+os.environ.setdefault("UTUBENEWS_CACHE_DIR", "off")
+
 # stub modules so imports succeed without heavy deps
 if "requests" not in sys.modules:
     sys.modules["requests"] = types.ModuleType("requests")
@@ -16,6 +21,7 @@ from utubenews.summarizer import (
     build_topic_script,
     postprocess_script,
     llm_summarize,
+    llm_summarize_batch,
 )
 from utubenews.article_extractor import quick_summarize
 
@@ -33,7 +39,7 @@ class TestSummaries(unittest.TestCase):
         self.assertTrue(quick_summarize(short).startswith(short))
 
     def test_llm_summarize_uses_transformers_pipeline(self):
-        summarizer._PIPELINE = None
+        summarizer.set_pipeline(None)
         calls = {}
 
         def fake_summary(text, max_length=60, min_length=None, do_sample=False, **_k):
@@ -64,13 +70,38 @@ class TestSummaries(unittest.TestCase):
             else:
                 del sys.modules["transformers"]
             ae.quick_summarize = orig_qs
-            summarizer._PIPELINE = None
+            summarizer.set_pipeline(None)
 
         self.assertEqual(result, "LLM")
         self.assertEqual(calls, {"text": "source text", "max": 7})
 
+    def test_korean_text_skips_the_english_model(self):
+        import utubenews.article_extractor as ae
+
+        seen = []
+
+        def fake_pipe(texts, **_k):
+            texts = [texts] if isinstance(texts, str) else texts
+            seen.extend(texts)
+            return [{"summary_text": "LLM"} for _ in texts]
+
+        orig_qs = ae.quick_summarize
+        ae.quick_summarize = lambda text, max_sent=3: "KO:" + text[:2]
+        summarizer.set_pipeline(fake_pipe)
+        try:
+            korean = "네이버 뉴스 본문입니다. 새 AI 서비스가 출시됐다."
+            self.assertEqual(llm_summarize(korean), "KO:네이")
+            self.assertEqual(
+                llm_summarize_batch([korean, "English text"]),
+                ["KO:네이", "LLM"],
+            )
+        finally:
+            ae.quick_summarize = orig_qs
+            summarizer.set_pipeline(None)
+        self.assertEqual(seen, ["English text"])
+
     def test_llm_summarize_falls_back_without_transformers(self):
-        summarizer._PIPELINE = None
+        summarizer.set_pipeline(None)
         import utubenews.article_extractor as ae
         called = {}
 
@@ -90,13 +121,13 @@ class TestSummaries(unittest.TestCase):
             if orig_trans is not None:
                 sys.modules["transformers"] = orig_trans
             ae.quick_summarize = orig_qs
-            summarizer._PIPELINE = None
+            summarizer.set_pipeline(None)
 
         self.assertEqual(result, "FB")
         self.assertEqual(called["text"], "text here")
 
     def test_llm_summarize_returns_empty_on_blank_input(self):
-        summarizer._PIPELINE = None
+        summarizer.set_pipeline(None)
 
         fake_mod = types.ModuleType("transformers")
         def fake_pipe(name):
@@ -118,12 +149,12 @@ class TestSummaries(unittest.TestCase):
             else:
                 del sys.modules["transformers"]
             ae.quick_summarize = orig_qs
-            summarizer._PIPELINE = None
+            summarizer.set_pipeline(None)
 
         self.assertEqual(result, "")
 
     def test_llm_summarize_reuses_pipeline(self):
-        summarizer._PIPELINE = None
+        summarizer.set_pipeline(None)
 
         calls = {"pipe": 0, "texts": []}
 
@@ -151,7 +182,7 @@ class TestSummaries(unittest.TestCase):
                 sys.modules["transformers"] = orig_mod
             else:
                 del sys.modules["transformers"]
-            summarizer._PIPELINE = None
+            summarizer.set_pipeline(None)
 
         self.assertEqual(first, "OUT-A")
         self.assertEqual(second, "OUT-B")
@@ -159,7 +190,7 @@ class TestSummaries(unittest.TestCase):
         self.assertEqual(calls["texts"], ["A", "B"])
 
     def test_llm_summarize_short_input_no_warning(self):
-        summarizer._PIPELINE = None
+        summarizer.set_pipeline(None)
 
         def fake_summary(text, max_length=60, min_length=None, do_sample=False, **_k):
             if max_length > len(text.split()) + 5:
@@ -190,13 +221,13 @@ class TestSummaries(unittest.TestCase):
                 sys.modules["transformers"] = orig
             else:
                 del sys.modules["transformers"]
-            summarizer._PIPELINE = None
+            summarizer.set_pipeline(None)
 
         self.assertEqual(result, "OK")
         self.assertEqual(len(w), 0)
 
     def test_llm_summarize_sets_min_length(self):
-        summarizer._PIPELINE = None
+        summarizer.set_pipeline(None)
 
         calls = {}
 
@@ -218,14 +249,14 @@ class TestSummaries(unittest.TestCase):
                 sys.modules["transformers"] = orig
             else:
                 del sys.modules["transformers"]
-            summarizer._PIPELINE = None
+            summarizer.set_pipeline(None)
 
         self.assertIsNotNone(calls.get("min"))
         self.assertLessEqual(calls["min"], calls["max"])
 
     def test_llm_summarize_blank_then_min_length(self):
         """Calling with blank text returns empty and later sets min_length."""
-        summarizer._PIPELINE = None
+        summarizer.set_pipeline(None)
 
         calls: list[dict] = []
 
@@ -255,7 +286,7 @@ class TestSummaries(unittest.TestCase):
             else:
                 del sys.modules["transformers"]
             ae.quick_summarize = orig_qs
-            summarizer._PIPELINE = None
+            summarizer.set_pipeline(None)
 
         self.assertEqual(filled_result, "OK")
         self.assertEqual(len(calls), 1)
@@ -263,7 +294,7 @@ class TestSummaries(unittest.TestCase):
         self.assertLessEqual(calls[0]["min"], calls[0]["max"])
 
     def test_llm_summarize_truncates_to_model_length_and_passes_flag(self):
-        summarizer._PIPELINE = None
+        summarizer.set_pipeline(None)
 
         class DummyTokenizer:
             model_max_length = 3
@@ -304,14 +335,14 @@ class TestSummaries(unittest.TestCase):
             else:
                 del sys.modules["transformers"]
             ae.quick_summarize = orig_qs
-            summarizer._PIPELINE = None
+            summarizer.set_pipeline(None)
 
         self.assertEqual(result, "OK")
         self.assertEqual(calls["text"], "w1 w2 w3")
         self.assertTrue(calls["trunc"])
 
-    def test_llm_summarize_handles_more_than_max_input_tokens(self):
-        summarizer._PIPELINE = None
+    def test_llm_summarize_map_reduces_more_than_max_input_tokens(self):
+        summarizer.set_pipeline(None)
 
         class DummyTokenizer:
             model_max_length = summarizer.MAX_LLM_INPUT_TOKENS
@@ -325,11 +356,12 @@ class TestSummaries(unittest.TestCase):
             def decode(self, tokens, skip_special_tokens=True):
                 return " ".join(tokens)
 
-        calls = {}
+        calls = []
 
-        def fake_summary(text, max_length=60, min_length=None, do_sample=False, truncation=False, **_k):
-            calls["length"] = len(text.split())
-            return [{"summary_text": "OK"}]
+        def fake_summary(texts, max_length=60, min_length=None, do_sample=False, truncation=False, **_k):
+            calls.append([len(t.split()) for t in texts])
+            # each chunk summary keeps the chunk's last word
+            return [{"summary_text": t.split()[-1]} for t in texts]
 
         fake_summary.tokenizer = DummyTokenizer()
 
@@ -343,7 +375,7 @@ class TestSummaries(unittest.TestCase):
         orig_qs = ae.quick_summarize
         ae.quick_summarize = lambda *_a, **_k: "BAD"
 
-        long_text = " ".join(f"w{i}" for i in range(2000))
+        long_text = " ".join(f"w{i}." for i in range(2000))
 
         try:
             result = llm_summarize(long_text)
@@ -353,10 +385,272 @@ class TestSummaries(unittest.TestCase):
             else:
                 del sys.modules["transformers"]
             ae.quick_summarize = orig_qs
-            summarizer._PIPELINE = None
+            summarizer.set_pipeline(None)
 
-        self.assertEqual(result, "OK")
-        self.assertLessEqual(calls["length"], summarizer.MAX_LLM_INPUT_TOKENS)
+        # map: chunks cover the whole text, each within the model input
+        self.assertEqual(sum(calls[0]), 2000)
+        self.assertTrue(all(n <= summarizer.MAX_LLM_INPUT_TOKENS for n in calls[0]))
+        self.assertGreater(len(calls[0]), 1)
+        # reduce: one pass over the joined chunk summaries
+        self.assertEqual(calls[1], [len(calls[0])])
+        self.assertEqual(result, "w1999.")
+
+    def test_map_reduce_shares_max_time(self):
+        class DummyTokenizer:
+            model_max_length = summarizer.MAX_LLM_INPUT_TOKENS
+
+            def encode(self, text, max_length=None, truncation=False, **_k):
+                tokens = text.split()
+                return tokens[:max_length] if truncation and max_length else tokens
+
+            def decode(self, tokens, skip_special_tokens=True):
+                return " ".join(tokens)
+
+        budgets = []
+
+        def fake_summary(texts, **kwargs):
+            budgets.append(kwargs.get("max_time"))
+            time.sleep(fake_summary.delay)
+            return [{"summary_text": t.split()[-1]} for t in texts]
+
+        fake_summary.tokenizer = DummyTokenizer()
+        long_text = " ".join(f"w{i}." for i in range(2000))
+        summarizer.set_pipeline(fake_summary)
+        try:
+            fake_summary.delay = 0.01
+            summarizer.llm_summarize_batch([long_text], max_time=10.0)
+            # the reduce step only gets what the map step left
+            self.assertEqual(budgets[0], 10.0)
+            self.assertLess(budgets[1], 10.0)
+
+            budgets.clear()
+            fake_summary.delay = 0.06
+            out = summarizer.llm_summarize_batch([long_text], max_time=0.05)
+        finally:
+            summarizer.set_pipeline(None)
+
+        # no time left: no reduce call, the chunk summaries are joined
+        self.assertEqual(budgets, [0.05])
+        self.assertTrue(out[0].endswith("w1999."))
+        self.assertGreater(len(out[0].split()), 1)
+
+    def test_split_chunks_keeps_sentences_whole(self):
+        text = "a b c. d e. f g h i. " + "x " * 25
+        chunks = summarizer._split_chunks(types.SimpleNamespace(), text)
+        self.assertEqual(chunks[0], text.strip())
+        orig = summarizer.MAX_LLM_INPUT_TOKENS
+        summarizer.MAX_LLM_INPUT_TOKENS = 10  # 7 words per chunk
+        try:
+            chunks = summarizer._split_chunks(types.SimpleNamespace(), text)
+        finally:
+            summarizer.MAX_LLM_INPUT_TOKENS = orig
+        self.assertEqual(chunks[:2], ["a b c. d e.", "f g h i."])
+        self.assertTrue(all(len(c.split()) <= 7 for c in chunks))
+        self.assertEqual(" ".join(chunks).split(), text.split())
+
+    def test_llm_summarize_batch_sorts_by_length_and_keeps_order(self):
+        calls = []
+
+        def fake_summary(texts, max_length, min_length, batch_size=1, **_k):
+            calls.append((list(texts), batch_size))
+            if "boom" in texts:
+                raise RuntimeError("model failed")
+            return [{"summary_text": f"S({t.split()[0]})"} for t in texts]
+
+        summarizer.set_pipeline(fake_summary)
+        import utubenews.article_extractor as ae
+        orig_qs = ae.quick_summarize
+        ae.quick_summarize = lambda text, *_a, **_k: f"FB({text})"
+        texts = ["c c c c", "a", "", "d d d d d", "b b", "boom"]
+        try:
+            result = llm_summarize_batch(texts, batch_size=2)
+        finally:
+            ae.quick_summarize = orig_qs
+            summarizer.set_pipeline(None)
+
+        self.assertEqual(calls, [
+            (["a", "boom"], 2),
+            (["b b", "c c c c"], 2),
+            (["d d d d d"], 1),
+        ])
+        self.assertEqual(result, ["S(c)", "FB(a)", "", "S(d)", "S(b)", "FB(boom)"])
+
+    def test_warm_up_loads_model_once_for_concurrent_callers(self):
+        import threading
+        import time
+
+        summarizer.set_pipeline(None)
+        loads = []
+        started = threading.Event()
+
+        def fake_summary(text, **_k):
+            return [{"summary_text": "LLM"}]
+
+        def fake_pipe(name):
+            loads.append(name)
+            started.set()
+            time.sleep(0.05)
+            return fake_summary
+
+        fake_mod = types.ModuleType("transformers")
+        fake_mod.pipeline = fake_pipe
+        orig_trans = sys.modules.get("transformers")
+        sys.modules["transformers"] = fake_mod
+        try:
+            thread = summarizer.warm_up()
+            self.assertTrue(started.wait(1))
+            # arrives while the model is still loading and waits for it
+            result = llm_summarize("source text")
+            thread.join(1)
+        finally:
+            if orig_trans is not None:
+                sys.modules["transformers"] = orig_trans
+            else:
+                del sys.modules["transformers"]
+            summarizer.set_pipeline(None)
+
+        self.assertEqual(result, "LLM")
+        self.assertEqual(loads, ["summarization"])
+
+    def test_onnx_backend_falls_back_to_torch(self):
+        from utubenews import onnx_backend
+
+        summarizer.set_pipeline(None)
+        fake_mod = types.ModuleType("transformers")
+        fake_mod.pipeline = lambda name, **k: (lambda text, **_k: [{"summary_text": "TORCH"}])
+        orig = sys.modules.get("transformers"), onnx_backend.load_onnx_pipeline
+        sys.modules["transformers"] = fake_mod
+        summarizer.SUMMARY_BACKEND = "onnx-int8"
+
+        def fail(*a, **k):
+            raise RuntimeError("optimum[onnxruntime] unavailable")
+
+        onnx_backend.load_onnx_pipeline = fail
+        try:
+            onnx_key = summarizer._summary_key("source text", 180)
+            with self.assertLogs(summarizer._LOG, level="WARNING"):
+                result = llm_summarize("source text")
+            # summaries made by torch are cached as torch ones
+            self.assertEqual(summarizer._active_backend(), "torch")
+            torch_key = summarizer._summary_key("source text", 180)
+        finally:
+            if orig[0] is not None:
+                sys.modules["transformers"] = orig[0]
+            else:
+                del sys.modules["transformers"]
+            onnx_backend.load_onnx_pipeline = orig[1]
+            summarizer.SUMMARY_BACKEND = "torch"
+            summarizer.set_pipeline(None)
+
+        self.assertEqual(result, "TORCH")
+        self.assertNotEqual(onnx_key, torch_key)
+
+    def test_token_path_tokenizes_once_and_generates_from_ids(self):
+        import re as _re
+
+        class WordTokenizer:
+            """One id per word; offsets point into the original text."""
+
+            model_max_length = 12
+
+            def __init__(self):
+                self.calls = 0
+
+            def __call__(self, text, add_special_tokens=True, return_offsets_mapping=False):
+                self.calls += 1
+                words = list(_re.finditer(r"\S+", text))
+                ids = [int(m.group()[1:].rstrip(".") or 0) for m in words]
+                enc = {"input_ids": [-1] + ids + [-2] if add_special_tokens else ids}
+                if return_offsets_mapping:
+                    enc["offset_mapping"] = [m.span() for m in words]
+                return enc
+
+            def pad(self, enc, return_tensors=None):
+                width = max(len(ids) for ids in enc["input_ids"])
+                return {"input_ids": [ids + [0] * (width - len(ids)) for ids in enc["input_ids"]]}
+
+            def batch_decode(self, rows, skip_special_tokens=True):
+                return [" ".join(f"w{i}" for i in row if i > 0) for row in rows]
+
+            def encode(self, *a, **k):
+                raise AssertionError("encode must not be used")
+
+            decode = encode
+
+        generated = []
+
+        class FakeModel:
+            def generate(self, input_ids, max_length, min_length, do_sample):
+                generated.append((input_ids, max_length, min_length))
+                return [[row[1]] for row in input_ids]  # first real token
+
+        pipe = types.SimpleNamespace(tokenizer=WordTokenizer(), model=FakeModel())
+        summarizer.set_pipeline(pipe)
+        orig_min = summarizer.MAP_REDUCE_MIN_TOKENS
+        summarizer.MAP_REDUCE_MIN_TOKENS = 12
+        try:
+            short = summarizer.llm_summarize("w5 w6 w7", max_tokens=6)
+            # 20 words: chunks of at most 8 ids, cut at sentence ends
+            long_text = " ".join(f"w{i}." if i % 4 == 0 else f"w{i}" for i in range(1, 21))
+            out = llm_summarize_batch([long_text, "w9 w8"], max_tokens=50)
+        finally:
+            summarizer.MAP_REDUCE_MIN_TOKENS = orig_min
+            summarizer.set_pipeline(None)
+
+        self.assertEqual(short, "w5")
+        self.assertEqual(generated[0], ([[-1, 5, 6, 7, -2]], 6, 5))
+        # map: the three chunks and the short text in one length-sorted batch
+        self.assertEqual(generated[1], ([
+            [-1, 9, 8, -2, 0, 0, 0, 0, 0, 0],
+            [-1, 17, 18, 19, 20, -2, 0, 0, 0, 0],
+            [-1, 1, 2, 3, 4, 5, 6, 7, 8, -2],
+            [-1, 9, 10, 11, 12, 13, 14, 15, 16, -2],
+        ], 15, 4))
+        # reduce: the joined chunk summaries "w1 w9 w17"
+        self.assertEqual(generated[2][0], [[-1, 1, 9, 17, -2]])
+        self.assertEqual(out, ["w1", "w9"])
+        # one tokenizer call per text and per reduce input (plus the two
+        # probing the special tokens once), no re-encoding
+        self.assertEqual(pipe.tokenizer.calls, 6)
+
+    def test_token_path_with_slow_tokenizer_splits_once(self):
+        class SlowTokenizer:
+            """One id per word and no offset mapping."""
+
+            model_max_length = 40
+
+            def __call__(self, text, add_special_tokens=True):
+                ids = [int(w[1:].rstrip(".")) if w.startswith("w") else 0 for w in text.split()]
+                return {"input_ids": [-1] + ids + [-2] if add_special_tokens else ids}
+
+            def encode(self, text, add_special_tokens=True):
+                return self(text, add_special_tokens=add_special_tokens)["input_ids"]
+
+            def decode(self, ids, skip_special_tokens=True):
+                return " ".join(f"w{i}" for i in ids if i > 0)
+
+        config = types.SimpleNamespace(prefix="summarize: ")
+        pipe = types.SimpleNamespace(
+            tokenizer=SlowTokenizer(), model=types.SimpleNamespace(config=config)
+        )
+        text = " ".join(f"w{i}." if i % 5 == 0 else f"w{i}" for i in range(1, 61))
+        orig_min = summarizer.MAP_REDUCE_MIN_TOKENS
+        summarizer.MAP_REDUCE_MIN_TOKENS = 5
+        try:
+            inputs = summarizer._encode_input(pipe, text)
+        finally:
+            summarizer.MAP_REDUCE_MIN_TOKENS = orig_min
+
+        self.assertEqual(len(inputs), 2)
+        words = []
+        for ids, n in inputs:
+            self.assertEqual(n, len(ids))
+            self.assertLessEqual(n, SlowTokenizer.model_max_length)
+            # prefix once per chunk, then the chunk's words
+            self.assertEqual(ids[:2], [-1, 0])
+            self.assertEqual(ids[-1], -2)
+            words += ids[2:-1]
+        self.assertEqual(words, list(range(1, 61)))
 
     def test_build_casual_script(self):
         arts = [{"script": "A. B. C."}, {"script": "D! E. F. G."}]
@@ -448,7 +742,8 @@ class TestSummaries(unittest.TestCase):
 
         expected_segments = [line1 + "\n", line2]
 
-        self.assertEqual(DummyTranslator.calls, expected_segments)
+        # chunks are translated concurrently; only the result keeps their order
+        self.assertCountEqual(DummyTranslator.calls, expected_segments)
         self.assertEqual(result, line1.upper() + "\n" + line2.upper())
 
     def test_translate_text_partial_failure_falls_back(self):
@@ -478,13 +773,13 @@ class TestSummaries(unittest.TestCase):
         sys.modules["googletrans"] = gt_mod
         sys.modules["deep_translator"] = dt_mod
 
-        orig_chunk = summarizer._chunk_text
-        summarizer._chunk_text = lambda x: ["good", "bad", "last"]
+        orig_chunk = summarizer.chunk_text
+        summarizer.chunk_text = lambda text, max_chars: ["good", "bad", "last"]
 
         try:
             result = summarizer.translate_text("irrelevant", "en")
         finally:
-            summarizer._chunk_text = orig_chunk
+            summarizer.chunk_text = orig_chunk
             if orig_gt is not None:
                 sys.modules["googletrans"] = orig_gt
             else:
@@ -494,7 +789,7 @@ class TestSummaries(unittest.TestCase):
             else:
                 del sys.modules["deep_translator"]
 
-        self.assertEqual(DummyGT.calls, ["good", "bad", "last"])
+        self.assertCountEqual(DummyGT.calls, ["good", "bad", "last"])
         self.assertEqual(DummyDT.calls, ["bad"])
         self.assertEqual(result, "GOODDT-badLAST")
 
@@ -524,6 +819,38 @@ class TestSummaries(unittest.TestCase):
         self.assertEqual(len(first_block_sents), 12)
         self.assertEqual(len(second_block_sents), 8)
 
+class TestTierRouter(unittest.TestCase):
+    def test_textrank_picks_central_sentences_in_order(self):
+        text = (
+            "The new chip speeds up AI models. "
+            "Lunch was served at noon. "
+            "The chip runs AI models on phones. "
+            "AI models on the new chip use less power."
+        )
+        self.assertEqual(
+            summarizer.textrank_summary(text, max_sent=2),
+            "The new chip speeds up AI models. AI models on the new chip use less power.",
+        )
+        self.assertEqual(summarizer.textrank_summary("One. Two.", max_sent=3), "One. Two.")
+
+    def test_choose_tier(self):
+        body = "word " * 200
+        choose = summarizer.choose_tier
+        self.assertEqual(choose("A short RSS summary.", is_body=False), "passthrough")
+        self.assertEqual(choose(body, is_body=False), "llm")
+        self.assertEqual(choose(body), "llm")
+        self.assertEqual(choose(body, time_left=60), "llm")
+        # the model queue ahead leaves no time for this article
+        self.assertEqual(choose(body, time_left=10, queue_depth=5), "textrank")
+        self.assertEqual(choose(body, time_left=0.1), "quick")
+        self.assertEqual(choose("한국어 기사 본문입니다. " * 20), "textrank")
+
+    def test_summarize_tier(self):
+        self.assertEqual(summarizer.summarize_tier("as is", "passthrough"), "as is")
+        with self.assertRaises(ValueError):
+            summarizer.summarize_tier("text", "bogus")
+
+
 if __name__ == "__main__":
     unittest.main()
 
@@ -0,0 +1,66 @@
+import multiprocessing
+import os
+import sys
+import threading
+import types
+import unittest
+from unittest import mock
+
+os.environ.setdefault("UTUBENEWS_CACHE_DIR", "off")
+
+for mod in ["requests", "bs4"]:
+    if mod not in sys.modules:
+        sys.modules[mod] = types.ModuleType(mod)
+
+from utubenews import summarizer, summary_pool
+from utubenews.summary_pool import SummaryPool
+
+
+def _fake_pipe(texts, **_k):
+    # the pid shows which process ran the model
+    return [{"summary_text": f"{t}@{os.getpid()}"} for t in texts]
+
+
+@unittest.skipUnless(
+    "fork" in multiprocessing.get_all_start_methods(), "fork start method unavailable"
+)
+class TestSummaryPool(unittest.TestCase):
+    def setUp(self):
+        summarizer.set_pipeline(_fake_pipe)
+
+    def tearDown(self):
+        summarizer.set_pipeline(None)
+
+    def test_workers_share_the_parent_model(self):
+        pool = SummaryPool(2, 1)
+        try:
+            texts = [f"text {i}" for i in range(6)]
+            out = pool.summarize(texts, max_tokens=40)
+        finally:
+            pool.close()
+        self.assertEqual([o.split("@")[0] for o in out], texts)
+        pids = {int(o.split("@")[1]) for o in out}
+        self.assertNotIn(os.getpid(), pids)
+        self.assertEqual(pool.threads_per_worker, 1)
+
+    def test_get_pool_is_off_without_workers(self):
+        with mock.patch.object(summary_pool, "SUMMARY_WORKERS", 0):
+            self.assertIsNone(summary_pool.get_pool())
+
+    def test_get_pool_refuses_to_fork_with_threads_running(self):
+        stop = threading.Event()
+        thread = threading.Thread(target=stop.wait)
+        thread.start()
+        try:
+            with mock.patch.object(summary_pool, "SUMMARY_WORKERS", 2), \
+                    mock.patch.object(summary_pool, "_POOL_FAILED", False):
+                with self.assertLogs(summary_pool._LOG, level="WARNING"):
+                    self.assertIsNone(summary_pool.get_pool())
+                self.assertIsNone(summary_pool._POOL)
+        finally:
+            stop.set()
+            thread.join()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import os
+import sys
+import threading
+import types
+import unittest
+from unittest import mock
+
+os.environ.setdefault("UTUBENEWS_CACHE_DIR", "off")
+
+for mod in ["requests", "bs4"]:
+    if mod not in sys.modules:
+        sys.modules[mod] = types.ModuleType(mod)
+
+from utubenews import summarizer, summary_server
+from utubenews.summary_server import MicroBatcher, SummaryServer
+
+
+class TestMicroBatcher(unittest.TestCase):
+    def test_concurrent_requests_share_one_call(self):
+        calls = []
+
+        def summarize(texts, max_tokens, max_time=None):
+            calls.append(list(texts))
+            return [t.upper() for t in texts]
+
+        batcher = MicroBatcher(summarize, window=0.2)
+        results = {}
+
+        def submit(name, texts):
+            results[name] = batcher.submit(texts, 50)
+
+        threads = [
+            threading.Thread(target=submit, args=("a", ["x", "y"])),
+            threading.Thread(target=submit, args=("b", ["z"])),
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        batcher.close()
+
+        self.assertEqual(len(calls), 1)
+        self.assertCountEqual(calls[0], ["x", "y", "z"])
+        self.assertEqual(results, {"a": ["X", "Y"], "b": ["Z"]})
+
+    def test_errors_reach_every_request(self):
+        def summarize(texts, max_tokens, max_time=None):
+            raise ValueError("boom")
+
+        batcher = MicroBatcher(summarize, window=0.0)
+        with self.assertRaises(ValueError):
+            batcher.submit(["x"], 50)
+        batcher.close()
+
+
+class TestSummaryServer(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+
+        def summarize(texts, max_tokens, max_time=None):
+            self.calls.append((list(texts), max_tokens))
+            return [f"summary of {t}" for t in texts]
+
+        self.batcher = MicroBatcher(summarize, window=0.0)
+        self.server = SummaryServer(("127.0.0.1", 0), self.batcher)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        host, port = self.server.server_address[:2]
+        self.env = mock.patch.dict(os.environ, {"SUMMARY_SERVER": f"http://{host}:{port}"})
+        self.env.start()
+        summary_server._DOWN_UNTIL.clear()
+
+    def tearDown(self):
+        self.env.stop()
+        self.server.shutdown()
+        self.server.server_close()
+        self.batcher.close()
+        summary_server._DOWN_UNTIL.clear()
+
+    def test_llm_summarize_uses_running_server(self):
+        with mock.patch.object(summarizer, "_load_pipeline", side_effect=AssertionError):
+            self.assertEqual(summarizer.llm_summarize("hello", max_tokens=40), "summary of hello")
+            self.assertEqual(
+                summarizer.llm_summarize_batch(["a", "", "b"]),
+                ["summary of a", "", "summary of b"],
+            )
+        self.assertEqual(self.calls, [(["hello"], 40), (["a", "b"], 180)])
+        self.assertTrue(summary_server.server_available())
+
+    def test_falls_back_in_process_when_server_is_gone(self):
+        self.server.shutdown()
+        self.server.server_close()
+        summarizer.set_pipeline(lambda text, **k: [{"summary_text": "local"}])
+        self.addCleanup(summarizer.set_pipeline, None)
+        self.assertEqual(summarizer.llm_summarize("hello"), "local")
+        # the dead address is not retried for every article
+        with mock.patch("urllib.request.urlopen", side_effect=AssertionError):
+            self.assertEqual(summarizer.llm_summarize("again"), "local")
+
+
+if __name__ == "__main__":
+    unittest.main()
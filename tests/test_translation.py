@@ -0,0 +1,134 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+import types
+import unittest
+from pathlib import Path
+
+os.environ.setdefault("UTUBENEWS_CACHE_DIR", "off")
+
+for mod in ["requests", "bs4"]:
+    if mod not in sys.modules:
+        sys.modules[mod] = types.ModuleType(mod)
+
+from utubenews import disk_cache, translation
+from utubenews.disk_cache import SummaryCache
+from utubenews.translation import RateLimiter, TranslationEngine, chunk_text
+
+
+class _StubTranslator:
+    """Local translator recording the chunks it is asked for."""
+
+    def __init__(self, fail=(), delay=0.0):
+        self.calls = []
+        self.fail = set(fail)
+        self.delay = delay
+        self.lock = threading.Lock()
+
+    def __call__(self, text, target):
+        with self.lock:
+            self.calls.append(text)
+        time.sleep(self.delay)
+        if text in self.fail:
+            raise RuntimeError("boom")
+        return f"{target}:{text.upper()}"
+
+
+class TestChunkText(unittest.TestCase):
+    def test_short_text_is_one_chunk(self):
+        self.assertEqual(chunk_text("hello", 10), ["hello"])
+
+    def test_prefers_line_then_sentence_breaks(self):
+        text = "One two. Three four. Five six.\nSeven.\n"
+        chunks = chunk_text(text, 12)
+        self.assertEqual(chunks, ["One two. ", "Three four. ", "Five six.\n", "Seven.\n"])
+        self.assertEqual("".join(chunks), text)
+
+    def test_long_sentence_is_cut(self):
+        text = "x" * 25 + ". Short."
+        chunks = chunk_text(text, 10)
+        self.assertTrue(all(len(c) <= 10 for c in chunks))
+        self.assertEqual("".join(chunks), text)
+
+    def test_many_lines_are_packed(self):
+        text = "line\n" * 10000
+        chunks = chunk_text(text, 5000)
+        self.assertEqual([len(c) for c in chunks], [5000] * 10)
+
+
+class TestTranslationEngine(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache = SummaryCache(Path(tmp.name) / "translations.sqlite3")
+        self.addCleanup(self.cache.close)
+        orig = translation.get_cache
+        translation.get_cache = lambda name: self.cache
+        self.addCleanup(setattr, translation, "get_cache", orig)
+
+    def test_chunks_run_concurrently_and_keep_order(self):
+        stub = _StubTranslator(delay=0.05)
+        engine = TranslationEngine([("stub", stub)], max_workers=4, rate=0)
+        parts = ["a", "b", "c", "d"]
+        start = time.perf_counter()
+        result = engine.translate_chunks(parts, "ko")
+        elapsed = time.perf_counter() - start
+        self.assertEqual(result, ["ko:A", "ko:B", "ko:C", "ko:D"])
+        self.assertLess(elapsed, 0.15)
+
+    def test_cached_chunks_are_not_sent_again(self):
+        stub = _StubTranslator()
+        engine = TranslationEngine([("stub", stub)], rate=0)
+        engine.translate_chunks(["a", "b"], "ko")
+        self.assertEqual(engine.translate_chunks(["b", "c"], "ko"), ["ko:B", "ko:C"])
+        self.assertCountEqual(stub.calls, ["a", "b", "c"])
+        # another target language is another cache entry
+        engine.translate_chunks(["a"], "en")
+        self.assertEqual(stub.calls.count("a"), 2)
+
+    def test_failed_chunk_uses_next_backend_and_is_not_cached(self):
+        first = _StubTranslator(fail={"bad"})
+        engine = TranslationEngine([("first", first), ("second", lambda t, lang: None)], rate=0)
+        self.assertEqual(engine.translate_chunks(["good", "bad"], "ko"), ["ko:GOOD", "bad"])
+        engine.translate_chunks(["bad"], "ko")
+        self.assertEqual(first.calls.count("bad"), 2)
+
+    def test_blank_chunks_are_kept(self):
+        stub = _StubTranslator()
+        engine = TranslationEngine([("stub", stub)], rate=0)
+        self.assertEqual(engine.translate("\n", "ko"), "\n")
+        self.assertEqual(stub.calls, [])
+
+    def test_rate_limiter_spaces_requests(self):
+        limiter = RateLimiter(50)
+        start = time.perf_counter()
+        for _ in range(6):
+            limiter.acquire()
+        self.assertGreaterEqual(time.perf_counter() - start, 0.09)
+
+
+class TestTranslationCache(unittest.TestCase):
+    def test_caches_are_separate_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            orig = os.environ.get("UTUBENEWS_CACHE_DIR")
+            os.environ["UTUBENEWS_CACHE_DIR"] = tmp
+            disk_cache._CACHES.clear()
+            try:
+                disk_cache.get_cache("translations").put("k", "v")
+                self.assertIsNone(disk_cache.get_cache().get("k"))
+                self.assertTrue((Path(tmp) / "translations.sqlite3").exists())
+            finally:
+                for cache in disk_cache._CACHES.values():
+                    if cache is not None:
+                        cache.close()
+                disk_cache._CACHES.clear()
+                if orig is None:
+                    del os.environ["UTUBENEWS_CACHE_DIR"]
+                else:
+                    os.environ["UTUBENEWS_CACHE_DIR"] = orig
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -15,7 +15,14 @@ if "bs4" not in sys.modules:
     sys.modules["bs4"] = types.ModuleType("bs4")
 
 from utubenews.pipeline import sort_articles
-from utubenews.text_utils import clean_text, merge_text_blocks, split_sentences
+from utubenews import text_utils
+from utubenews.text_utils import (
+    clean_text,
+    detect_language,
+    hangul_ratio,
+    merge_text_blocks,
+    split_sentences,
+)
 from utubenews.utils import filter_keywords, deduplicate, deduplicate_fuzzy
 
 
@@ -127,6 +134,14 @@ class TestUtils(unittest.TestCase):
         # "Title" should appear once after cleaning and deduplication
         self.assertEqual(result.count("Title"), 1)
 
+    def test_detect_language_by_hangul_ratio(self):
+        self.assertEqual(hangul_ratio("가나 ab"), 0.5)
+        self.assertEqual(hangul_ratio("123 !"), 0.0)
+        self.assertEqual(detect_language("삼성전자가 새 Galaxy AI 기능을 공개했다."), "ko")
+        self.assertEqual(detect_language("Samsung unveiled new Galaxy AI features."), "en")
+        self.assertEqual(detect_language("Apple 신제품 발표"), "ko")
+        self.assertEqual(detect_language("Apple's keynote (애플)"), "en")
+
     def test_split_sentences_adds_period(self):
         result = split_sentences("Hello world")
         self.assertEqual(result, ["Hello world."])
@@ -135,5 +150,28 @@ class TestUtils(unittest.TestCase):
         result = split_sentences("인공지능 기술")
         self.assertEqual(result, ["인공지능 기술입니다."])
 
+class TestLxmlFastPath(unittest.TestCase):
+    @unittest.skipUnless(text_utils._lxml_html, "lxml not installed")
+    def test_clean_html_text_skips_scripts_and_short_lines(self):
+        html = "<div><p>First line here</p><script>var x = 1;</script><!-- c --><p>ok</p><style>p{}</style></div>"
+        self.assertEqual(text_utils.clean_html_text(html, min_len=5), "First line here")
+
+    @unittest.skipUnless(text_utils._lxml_html, "lxml not installed")
+    def test_extract_from_html_reuses_tree(self):
+        from utubenews import article_extractor as ae
+
+        html = "<html><body><nav><p>Menu</p></nav><div class='post-content'><p>Body <b>one</b>.</p><p>Two.</p></div></body></html>"
+        tree = text_utils.parse_html(html)
+        self.assertEqual(ae._extract_from_html("", 10, tree=tree), "Body one . Two.")
+
+    @unittest.skipUnless(text_utils._lxml_html, "lxml not installed")
+    def test_parse_html_decodes_bytes_in_given_encoding(self):
+        data = "<p>똠방각하</p>".encode("cp949")
+        self.assertEqual(text_utils.parse_html(data, "cp949").text_content(), "똠방각하")
+        # encodings libxml2 does not know are decoded in Python first
+        data = "<p>ｶﾀｶﾅ</p>".encode("euc_jp")
+        self.assertEqual(text_utils.parse_html(data, "euc_jp").text_content(), "ｶﾀｶﾅ")
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -2,87 +2,192 @@
 본문 추출 · 초간단 요약기
 """
 from __future__ import annotations
-import re, requests, bs4, logging, time
-from .text_utils import clean_text
+import re, requests, bs4, logging, time, asyncio, os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from copy import deepcopy
+from .async_fetch import afetch_bytes
+from .deadline import Deadline, DeadlineExceeded
+from .fetch_policy import (
+    BREAKER,
+    CHUNK_SIZE,
+    DEFAULT_POLICY,
+    MAX_PAGE_BYTES,
+    REQUEST_TIMEOUT,
+    CappedBuffer,
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    SkippedPage,
+    charset_of,
+    check_page_headers,
+    host_of,
+    sniff_charset,
+)
+from .text_utils import clean_text, node_text, parse_html, text_lines
 from .utils import REQUEST_HEADERS
 
 _LOG = logging.getLogger(__name__)
 
+# concurrent page downloads used by extract_main_texts
+IO_WORKERS = 16
 
-def _get_with_retries(url: str, headers: dict[str, str], attempts: int = 3, delay: float = 1.0):
-    """Return ``requests.get(url, headers=headers)`` with retry logic."""
-    last_exc: Exception | None = None
-    for i in range(attempts):
+
+def _get_with_retries(
+    url: str,
+    headers: dict[str, str],
+    policy: RetryPolicy | None = None,
+    breaker: CircuitBreaker | None = None,
+    *,
+    stream: bool = False,
+    deadline: Deadline | None = None,
+):
+    """Return ``requests.get(url, headers=headers)`` with retry logic.
+
+    Only retryable failures are retried, with jittered exponential backoff
+    from ``policy``. Hosts whose ``breaker`` is open fail immediately with
+    :class:`CircuitOpenError`. Each attempt's timeout is cut to what is left
+    of ``deadline`` and no retry is started that would outlast it.
+    """
+    policy = policy or DEFAULT_POLICY
+    breaker = breaker or BREAKER
+    deadline = deadline or Deadline()
+    host = host_of(url)
+    for i in range(policy.attempts):
+        timeout = deadline.timeout(REQUEST_TIMEOUT, "fetch")
+        breaker.before_request(host)
         try:
-            resp = requests.get(url, timeout=10, headers=headers)
+            resp = requests.get(url, timeout=timeout, headers=headers, stream=stream)
             resp.raise_for_status()
-            return resp
         except requests.exceptions.RequestException as e:
-            last_exc = e
-            if i < attempts - 1:
-                time.sleep(delay)
-    if last_exc:
-        raise last_exc
+            breaker.record(host, e, policy)
+            wait = policy.next_delay(i, e)
+            if wait is None or wait >= deadline.remaining():
+                raise
+            time.sleep(wait)
+            continue
+        except BaseException:
+            # interrupted or not a request error: no verdict on the host
+            breaker.release(host)
+            raise
+        breaker.record_success(host)
+        return resp
 
 
-def extract_with_newspaper(url: str) -> str:
-    """Return article body text using ``newspaper`` library."""
+def fetch_bytes(
+    url: str,
+    max_bytes: int = MAX_PAGE_BYTES,
+    policy: RetryPolicy | None = None,
+    *,
+    deadline: Deadline | None = None,
+) -> tuple[bytes, str | None]:
+    """Download ``url`` and return its raw body and charset.
+
+    The body is streamed and reading stops after ``max_bytes``. Non-HTML
+    responses raise :class:`SkippedPage` before the body is downloaded. The
+    charset comes from the headers or a ``<meta>`` tag (see
+    :func:`fetch_policy.sniff_charset`) rather than guessing over the body.
+    When ``deadline`` passes mid-download the part read so far is kept.
+    """
+    deadline = deadline or Deadline()
+    resp = _get_with_retries(url, REQUEST_HEADERS, policy, stream=True, deadline=deadline)
+    try:
+        check_page_headers(url, resp.headers)
+        buf = CappedBuffer(url, max_bytes)
+        for chunk in resp.iter_content(CHUNK_SIZE):
+            if chunk and buf.feed(chunk):
+                break
+            if deadline.expired():
+                _LOG.info("Download cut short by deadline: %s", url)
+                break
+    finally:
+        resp.close()
+    data = buf.getvalue()
+    return data, sniff_charset(data, charset_of(resp.headers))
+
+
+def fetch_html(
+    url: str,
+    max_bytes: int = MAX_PAGE_BYTES,
+    policy: RetryPolicy | None = None,
+    *,
+    deadline: Deadline | None = None,
+) -> str:
+    """Download ``url`` and return its HTML (see :func:`fetch_bytes`)."""
+    data, charset = fetch_bytes(url, max_bytes, policy, deadline=deadline)
+    return data.decode(charset, errors="replace")
+
+
+def extract_with_newspaper(url: str, html: str | None = None) -> str:
+    """Return article body text using ``newspaper`` library.
+
+    When ``html`` is given the page is parsed from it instead of being
+    downloaded again by newspaper.
+    """
     try:
         from newspaper import Article
     except Exception as e:  # ImportError or any failure
         raise RuntimeError("newspaper unavailable") from e
 
     art = Article(url)
-    art.download()
+    if html is None:
+        art.download()
+    else:
+        art.download(input_html=html)
     art.parse()
     return art.text or ""
 
 
-def extract_with_readability(html: str) -> str:
-    """Return main text using ``readability-lxml`` Document."""
+def extract_with_readability(html: str, tree=None) -> str:
+    """Return main text using ``readability-lxml`` Document.
+
+    A pre-parsed lxml ``tree`` (see :func:`text_utils.parse_html`) is used
+    instead of parsing ``html`` again; readability receives a copy since it
+    drops nodes from its input.
+    """
     try:
         from readability import Document
     except Exception as e:
         raise RuntimeError("readability unavailable") from e
 
-    doc = Document(html or "")
+    doc = Document(deepcopy(tree) if tree is not None else html or "")
     content = doc.summary() or ""
     text = re.sub(r"<[^>]+>", " ", content)
     return clean_text(text)
 
 
-def extract_with_trafilatura(html: str) -> str:
-    """Return main text using ``trafilatura`` library."""
+def extract_with_trafilatura(html: str, tree=None) -> str:
+    """Return main text using ``trafilatura`` library.
+
+    Like :func:`extract_with_readability`, a copy of a pre-parsed ``tree``
+    is handed over when given.
+    """
     try:
         import trafilatura
     except Exception as e:
         raise RuntimeError("trafilatura unavailable") from e
 
     try:
-        text = trafilatura.extract(html or "", favor_recall=True)
+        source = deepcopy(tree) if tree is not None else html or ""
+        text = trafilatura.extract(source, favor_recall=True)
     except Exception as e:
         raise RuntimeError("trafilatura failed") from e
     return clean_text(text or "")
 
 
-def fetch_html_selenium(url: str, wait: float = 2.0) -> str:
-    """Fetch ``url`` using Selenium for JS-heavy pages."""
-    try:
-        import chromedriver_autoinstaller
-        from selenium import webdriver
-    except Exception as e:
-        raise RuntimeError("selenium unavailable") from e
+def fetch_html_selenium(url: str, wait: float = 10.0, selector: str | None = None) -> str:
+    """Fetch ``url`` using a pooled Selenium session for JS-heavy pages.
 
-    chromedriver_autoinstaller.install()
-    opts = webdriver.ChromeOptions()
-    opts.add_argument("--headless=new")
-    driver = webdriver.Chrome(options=opts)
-    try:
+    Waits at most ``wait`` seconds for the document to finish loading and,
+    when given, for the CSS ``selector`` to match before reading the source.
+    """
+    from .browser_pool import get_pool, wait_for_page
+
+    with get_pool().lease() as driver:
         driver.get(url)
-        time.sleep(wait)
+        if not wait_for_page(driver, wait, selector):
+            _LOG.debug("page not ready after %.1fs: %s", wait, url)
         return driver.page_source
-    finally:
-        driver.quit()
 
 def _regex_extract(html: str, min_len: int) -> str:
     """Fallback text extraction using regex when BeautifulSoup is unavailable."""
@@ -108,8 +213,52 @@ def _regex_extract(html: str, min_len: int) -> str:
         lines = [re.sub(r"<[^>]+>", "", section)]
     return clean_text("\n".join(lines))
 
-def _extract_from_html(html: str, min_len: int) -> str:
-    """Extract main text from ``html`` using BeautifulSoup when available."""
+# container heuristics shared by the lxml and BeautifulSoup paths
+_ID_PAT = r"(content|article|body)"
+_CLASS_PAT = r"(content|article|body|entry)"
+_CONTAINER_XPATHS = (
+    "//article",
+    f"//div[re:test(@id, '{_ID_PAT}', 'i')]",
+    f"//div[re:test(@class, '{_CLASS_PAT}', 'i')]",
+)
+_XPATH_NS = {"re": "http://exslt.org/regular-expressions"}
+
+
+def _page_lines(text: str, min_len: int) -> str:
+    """Return the cleaned lines of ``text`` at least ``min_len`` long.
+
+    Like :func:`_regex_extract`, a page whose lines are all shorter keeps
+    them rather than coming back empty.
+    """
+    return clean_text("\n".join(text_lines(text, min_len) or text_lines(text)))
+
+
+def _extract_from_tree(tree, min_len: int) -> str:
+    """Extract main text from an lxml ``tree`` with the container heuristics."""
+    for xpath in _CONTAINER_XPATHS:
+        found = tree.xpath(xpath, namespaces=_XPATH_NS)
+        if found:
+            parts = [node_text(p, " ") for p in found[0].iter("p")]
+            cleaned = clean_text("\n".join(" ".join(p.split()) for p in parts))
+            if cleaned:
+                return cleaned
+            break
+    return _page_lines(node_text(tree), min_len)
+
+
+def _extract_from_html(html: str, min_len: int, tree=None) -> str:
+    """Extract main text from ``html``.
+
+    An lxml ``tree`` is parsed (or reused when given) on the fast path;
+    BeautifulSoup and finally regexes are used when lxml is unavailable.
+    """
+    if tree is None:
+        tree = parse_html(html)
+    if tree is not None:
+        try:
+            return _extract_from_tree(tree, min_len)
+        except Exception as e:
+            _LOG.debug("lxml extraction failed: %s", e)
     Soup = getattr(bs4, "BeautifulSoup", None)
     if Soup is None:
         return _regex_extract(html, min_len)
@@ -117,61 +266,104 @@ def _extract_from_html(html: str, min_len: int) -> str:
         soup = Soup(html or "", "html.parser")
         container = (
             soup.find("article")
-            or soup.find("div", id=re.compile(r"(content|article|body)", re.I))
-            or soup.find("div", class_=re.compile(r"(content|article|body|entry)", re.I))
+            or soup.find("div", id=re.compile(_ID_PAT, re.I))
+            or soup.find("div", class_=re.compile(_CLASS_PAT, re.I))
         )
         if container:
             parts = [p.get_text(" ", strip=True) for p in container.find_all("p")]
             cleaned = clean_text("\n".join(parts))
             if cleaned:
                 return cleaned
-        text = []
-        for p in soup.get_text("\n").splitlines():
-            p = p.strip()
-            if len(p) >= max(1, min_len):
-                text.append(p)
-        return clean_text("\n".join(text))
+        return _page_lines(soup.get_text("\n"), min_len)
     except Exception as e:
         _LOG.debug("BeautifulSoup failed: %s", e)
         return _regex_extract(html, min_len)
 
-def extract_main_text(url: str, min_len: int = 10) -> str:
-    """Return cleaned main body text from the article page."""
-    try:
-        text = extract_with_newspaper(url)
-        cleaned = clean_text(text)
-        if len(cleaned) >= min_len:
-            _LOG.info("extracted with newspaper")
-            return cleaned
-    except Exception as e:
-        _LOG.debug("newspaper failed: %s", e)
+def extract_main_text(
+    url: str,
+    min_len: int = 10,
+    *,
+    max_bytes: int = MAX_PAGE_BYTES,
+    deadline: Deadline | None = None,
+) -> str:
+    """Return cleaned main body text from the article page.
 
-    html = ""
+    The page is downloaded once (see :func:`fetch_bytes`) and handed to
+    newspaper, readability, trafilatura and the HTML parser in turn. The
+    download and every extractor stay within ``deadline``; ``""`` is
+    returned once it has passed.
+    """
     try:
-        response = _get_with_retries(url, REQUEST_HEADERS)
-        html = response.text
-    except requests.exceptions.RequestException as e:
+        data, charset = fetch_bytes(url, max_bytes, deadline=deadline)
+    except SkippedPage as e:
+        _LOG.info("Skipped %s: %s", url, e.reason)
+        return ""
+    except DeadlineExceeded as e:
+        _LOG.info("Gave up on %s: %s", url, e)
+        return ""
+    except (requests.exceptions.RequestException, CircuitOpenError) as e:
         _LOG.warning("Failed to fetch %s: %s", url, e)
         return ""
 
+    return extract_from_bytes(url, data, charset, min_len, deadline)
+
+
+def _newspaper_available() -> bool:
     try:
-        text = extract_with_readability(html)
+        from newspaper import Article  # noqa: F401
+    except Exception:
+        return False
+    return True
+
+
+def _extract_fetched(
+    url: str,
+    data: bytes,
+    charset: str,
+    min_len: int,
+    deadline: Deadline | None = None,
+    html: str | None = None,
+) -> str:
+    """Run the HTML based extractors over an already fetched page.
+
+    ``data`` is parsed once with lxml, in ``charset``, when available and
+    the tree is shared by readability, trafilatura and the container
+    heuristics. The decoded text ``html`` is only needed without lxml and
+    is decoded here when the caller has not already done so. No extractor
+    is started after ``deadline``.
+    """
+    deadline = deadline or Deadline()
+    tree = parse_html(data, charset)
+    if tree is None and html is None:
+        html = data.decode(charset, errors="replace")
+    deadline.check("readability")
+    try:
+        text = extract_with_readability(html, tree)
         if len(text) >= min_len:
             _LOG.info("extracted with readability")
             return text
     except Exception as e:
         _LOG.debug("readability failed: %s", e)
 
+    deadline.check("trafilatura")
     try:
-        text = extract_with_trafilatura(html)
+        text = extract_with_trafilatura(html, tree)
         if len(text) >= min_len:
             _LOG.info("extracted with trafilatura")
             return text
     except Exception as e:
         _LOG.debug("trafilatura failed: %s", e)
 
+    deadline.check("html parser")
     try:
-        text = _extract_from_html(html, min_len=min_len)
+        if html is None:
+            try:
+                text = _extract_from_tree(tree, min_len)
+            except Exception as e:
+                _LOG.debug("lxml extraction failed: %s", e)
+                text = _extract_from_html(data.decode(charset, errors="replace"), min_len)
+        else:
+            text = _extract_from_html(html, min_len=min_len, tree=tree)
         if text:
             _LOG.info("extracted with html parser")
         return text
@@ -179,6 +371,159 @@ def extract_main_text(url: str, min_len: int = 10) -> str:
         _LOG.warning("Failed to parse %s: %s", url, e)
         return ""
 
+
+def _extract_page(
+    url: str, data: bytes, charset: str, min_len: int, deadline: Deadline | None = None
+) -> str:
+    """Return main text from the page ``data`` trying newspaper before the others.
+
+    Newspaper parses the decoded page itself, so the lxml tree of the other
+    extractors is only built once it has failed.
+    """
+    if deadline is not None:
+        deadline.check("newspaper")
+    html = None
+    if _newspaper_available():
+        html = data.decode(charset, errors="replace")
+        try:
+            cleaned = clean_text(extract_with_newspaper(url, html))
+            if len(cleaned) >= min_len:
+                _LOG.info("extracted with newspaper")
+                return cleaned
+        except Exception as e:
+            _LOG.debug("newspaper failed: %s", e)
+    return _extract_fetched(url, data, charset, min_len, deadline, html)
+
+
+def extract_from_bytes(
+    url: str,
+    data: bytes,
+    charset: str | None,
+    min_len: int = 10,
+    deadline: Deadline | None = None,
+) -> str:
+    """Return main text from a downloaded page body.
+
+    Entry point for extraction worker processes: only the raw bytes go in
+    and only the cleaned text comes back. The page is decoded in the
+    sniffed charset for newspaper and parsed by lxml straight from ``data``
+    only if newspaper fails. Returns ``""`` when ``deadline`` passes before
+    an extractor succeeded.
+    """
+    charset = sniff_charset(data, charset)
+    try:
+        return _extract_page(url, data, charset, min_len, deadline)
+    except DeadlineExceeded as e:
+        _LOG.info("Gave up on %s: %s", url, e)
+        return ""
+
+
+def _fetch_for_extraction(url: str, max_bytes: int, budget: float | None):
+    """Download ``url`` within a fresh ``budget`` and pass the deadline on."""
+    deadline = Deadline(budget)
+    data, charset = fetch_bytes(url, max_bytes, deadline=deadline)
+    return data, charset, deadline
+
+
+def _cpu_context():
+    """Return the start method context of the parsing processes.
+
+    Forking copies the caller's threads' locks (logging, connection pools,
+    the import lock) in whatever state they are, and the download threads
+    and the model warm-up are running when workers start. A forkserver
+    (or spawn, where there is none) starts them from a clean process.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def extract_main_texts(
+    urls: list[str],
+    min_len: int = 10,
+    *,
+    io_workers: int = IO_WORKERS,
+    cpu_workers: int | None = None,
+    max_bytes: int = MAX_PAGE_BYTES,
+    article_budget: float | None = None,
+) -> list[str]:
+    """Return main text for every URL in ``urls`` (``""`` on failure).
+
+    Pages are downloaded by a pool of ``io_workers`` threads and each body is
+    handed to a pool of ``cpu_workers`` processes (one per core by default)
+    as soon as it arrives, so parsing runs on all cores instead of
+    contending for the GIL. With ``article_budget`` each page gets that many
+    seconds from the start of its download until its text is extracted.
+    """
+    results = [""] * len(urls)
+    if not urls:
+        return results
+    cpu_workers = cpu_workers or os.cpu_count() or 1
+    with ThreadPoolExecutor(io_workers) as io_pool, ProcessPoolExecutor(
+        cpu_workers, mp_context=_cpu_context()
+    ) as cpu_pool:
+        fetches = {
+            io_pool.submit(_fetch_for_extraction, url, max_bytes, article_budget): i
+            for i, url in enumerate(urls)
+        }
+        parses = {}
+        for fut in as_completed(fetches):
+            i = fetches[fut]
+            try:
+                data, charset, deadline = fut.result()
+            except SkippedPage as e:
+                _LOG.info("Skipped %s: %s", urls[i], e.reason)
+                continue
+            except DeadlineExceeded as e:
+                _LOG.info("Gave up on %s: %s", urls[i], e)
+                continue
+            except (requests.exceptions.RequestException, CircuitOpenError) as e:
+                _LOG.warning("Failed to fetch %s: %s", urls[i], e)
+                continue
+            parses[cpu_pool.submit(extract_from_bytes, urls[i], data, charset, min_len, deadline)] = i
+        for fut in as_completed(parses):
+            i = parses[fut]
+            try:
+                results[i] = fut.result()
+            except Exception as e:
+                _LOG.warning("Failed to parse %s: %s", urls[i], e)
+    return results
+
+
+async def extract_main_text_async(
+    url: str,
+    client,
+    min_len: int = 10,
+    *,
+    executor=None,
+    deadline: Deadline | None = None,
+) -> str:
+    """Async variant of :func:`extract_main_text`.
+
+    The page is downloaded once through the shared ``client`` (see
+    :func:`async_fetch.create_client`) and the CPU-heavy parsing runs in
+    ``executor`` so the event loop keeps serving other fetches. The
+    download, retries included, is cancelled when ``deadline`` passes.
+    """
+    deadline = deadline or Deadline()
+    try:
+        data, charset = await asyncio.wait_for(
+            afetch_bytes(client, url), deadline.timeout(stage="fetch")
+        )
+    except SkippedPage as e:
+        _LOG.info("Skipped %s: %s", url, e.reason)
+        return ""
+    except (asyncio.TimeoutError, DeadlineExceeded) as e:
+        _LOG.info("Gave up on %s: %s", url, str(e) or "time budget exhausted")
+        return ""
+    except Exception as e:  # httpx.HTTPError or client unavailable
+        _LOG.warning("Failed to fetch %s: %s", url, e)
+        return ""
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor, extract_from_bytes, url, data, charset, min_len, deadline
+    )
+
 def quick_summarize(text: str, max_sent: int = 3) -> str:
     """Return a short summary built from the most frequent sentences.
 
@@ -0,0 +1,120 @@
+"""Stream articles from and to JSON array or JSONL files one at a time."""
+
+from __future__ import annotations
+
+import json
+import os
+import textwrap
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+# file suffixes written as one JSON object per line
+JSONL_SUFFIXES = {".jsonl", ".ndjson"}
+
+_READ_CHUNK = 64 * 1024
+_WS = " \t\r\n"
+
+
+def is_jsonl(path: Path | str) -> bool:
+    """Return ``True`` if ``path`` should be written as JSONL."""
+    return Path(path).suffix.lower() in JSONL_SUFFIXES
+
+
+def _iter_json_array(f) -> Iterator[dict]:
+    """Yield the elements of the JSON array in ``f`` without loading it whole."""
+    decoder = json.JSONDecoder()
+    buf = f.read(_READ_CHUNK).lstrip(_WS)
+    if not buf.startswith("["):
+        raise ValueError("expected a JSON array")
+    buf = buf[1:]
+    eof = False
+    while True:
+        buf = buf.lstrip(_WS + ",")
+        if buf.startswith("]"):
+            return
+        if buf:
+            try:
+                item, end = decoder.raw_decode(buf)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                # a number cut off by the end of the buffer also decodes
+                # ("-15." as -15), so only a separator after it proves the
+                # element complete
+                if buf[end:].lstrip(_WS)[:1] in (",", "]") or eof:
+                    yield item
+                    buf = buf[end:]
+                    continue
+        if eof:
+            raise ValueError("unterminated JSON array")
+        chunk = f.read(_READ_CHUNK)
+        eof = not chunk
+        buf += chunk
+
+
+def iter_articles(path: Path | str) -> Iterator[dict]:
+    """Yield the articles stored in ``path`` one by one.
+
+    Both a JSON array (as written by :func:`pipeline.save_articles`) and
+    JSONL/NDJSON with one article per line are accepted; the format is
+    detected from the first character rather than the file name.
+    """
+    with open(path, encoding="utf-8") as f:
+        head = f.read(_READ_CHUNK)
+        first = head.lstrip(_WS)[:1]
+        f.seek(0)
+        if first == "[":
+            yield from _iter_json_array(f)
+            return
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class ArticleWriter:
+    """Append articles to an open file as JSONL or as one JSON array."""
+
+    def __init__(self, f, jsonl: bool) -> None:
+        self._f = f
+        self._jsonl = jsonl
+        self.count = 0
+
+    def write(self, art: dict) -> None:
+        """Write ``art`` and flush it to disk."""
+        if self._jsonl:
+            self._f.write(json.dumps(art, ensure_ascii=False) + "\n")
+        else:
+            sep = "[\n" if self.count == 0 else ",\n"
+            # same layout as json.dump(list, indent=2)
+            item = json.dumps(art, ensure_ascii=False, indent=2)
+            self._f.write(sep + textwrap.indent(item, "  "))
+        self.count += 1
+        self._f.flush()
+
+    def _close(self) -> None:
+        if not self._jsonl:
+            self._f.write("\n]" if self.count else "[]")
+
+
+@contextmanager
+def open_writer(path: Path | str, *, jsonl: bool | None = None):
+    """Yield an :class:`ArticleWriter` for ``path``.
+
+    The format follows the file suffix unless ``jsonl`` is given. Data goes
+    to a temporary file that replaces ``path`` only on success, so reading
+    and rewriting the same file is safe and a crash leaves the old one.
+    """
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        writer = ArticleWriter(f, is_jsonl(path) if jsonl is None else jsonl)
+        try:
+            yield writer
+            writer._close()
+        except BaseException:
+            f.close()
+            tmp.unlink()
+            raise
+    os.replace(tmp, path)
@@ -0,0 +1,140 @@
+"""Async HTTP helpers for fetching many article pages concurrently."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from .fetch_policy import (
+    BREAKER,
+    CHUNK_SIZE,
+    DEFAULT_POLICY,
+    MAX_PAGE_BYTES,
+    REQUEST_TIMEOUT,
+    CappedBuffer,
+    CircuitBreaker,
+    RetryPolicy,
+    charset_of,
+    check_page_headers,
+    host_of,
+    sniff_charset,
+)
+from .utils import REQUEST_HEADERS
+
+_LOG = logging.getLogger(__name__)
+
+# default number of pooled connections shared by all concurrent fetches
+MAX_CONNECTIONS = 100
+
+
+def create_client(
+    *,
+    http2: bool = True,
+    max_connections: int = MAX_CONNECTIONS,
+    timeout: float = REQUEST_TIMEOUT,
+):
+    """Return a pooled ``httpx.AsyncClient`` for article fetches.
+
+    HTTP/2 is only enabled when the ``h2`` package is installed; otherwise the
+    client silently falls back to HTTP/1.1 keep-alive connections.
+    """
+    try:
+        import httpx
+    except Exception as e:  # ImportError or any failure
+        raise RuntimeError("httpx unavailable") from e
+
+    if http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            _LOG.debug("h2 not installed, using HTTP/1.1")
+            http2 = False
+
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+    )
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=limits,
+        timeout=timeout,
+        headers=REQUEST_HEADERS,
+        follow_redirects=True,
+    )
+
+
+async def aget_with_retries(
+    client,
+    url: str,
+    headers: dict[str, str] | None = None,
+    policy: RetryPolicy | None = None,
+    breaker: CircuitBreaker | None = None,
+    *,
+    stream: bool = False,
+):
+    """Return the response to ``GET url`` sent through ``client`` with retries.
+
+    Async counterpart of :func:`article_extractor._get_with_retries` sharing
+    its retry policy and circuit breaker; backoff waits yield to the event
+    loop instead of blocking it. With ``stream=True`` the body is left
+    unread and the caller must ``aclose()`` the response.
+    """
+    import httpx
+
+    policy = policy or DEFAULT_POLICY
+    breaker = breaker or BREAKER
+    host = host_of(url)
+    for i in range(policy.attempts):
+        breaker.before_request(host)
+        request = client.build_request("GET", url, headers=headers)
+        resp = None
+        try:
+            resp = await client.send(request, stream=stream)
+            resp.raise_for_status()
+        except httpx.HTTPError as e:
+            breaker.record(host, e, policy)
+            if resp is not None:
+                await resp.aclose()
+            wait = policy.next_delay(i, e)
+            if wait is None:
+                raise
+            await asyncio.sleep(wait)
+            continue
+        except BaseException:
+            # cancelled (e.g. by a deadline) or not an HTTP error: no
+            # verdict on the host
+            breaker.release(host)
+            raise
+        breaker.record_success(host)
+        return resp
+
+
+async def afetch_bytes(
+    client,
+    url: str,
+    max_bytes: int = MAX_PAGE_BYTES,
+    policy: RetryPolicy | None = None,
+) -> tuple[bytes, str]:
+    """Async counterpart of :func:`article_extractor.fetch_bytes`."""
+    resp = await aget_with_retries(client, url, policy=policy, stream=True)
+    try:
+        check_page_headers(url, resp.headers)
+        buf = CappedBuffer(url, max_bytes)
+        async for chunk in resp.aiter_bytes(CHUNK_SIZE):
+            if chunk and buf.feed(chunk):
+                break
+    finally:
+        await resp.aclose()
+    data = buf.getvalue()
+    return data, sniff_charset(data, charset_of(resp.headers))
+
+
+async def afetch_html(
+    client,
+    url: str,
+    max_bytes: int = MAX_PAGE_BYTES,
+    policy: RetryPolicy | None = None,
+) -> str:
+    """Async counterpart of :func:`article_extractor.fetch_html`."""
+    data, charset = await afetch_bytes(client, url, max_bytes, policy)
+    return data.decode(charset, errors="replace")
@@ -1,54 +1,190 @@
 import argparse
+import asyncio
 import json
 import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from pathlib import Path
 
-import requests
 import bs4
 
+from .article_extractor import fetch_html
+from .article_io import ArticleWriter, is_jsonl, iter_articles, open_writer
+from .async_fetch import afetch_html
+from .fetch_policy import RetryPolicy
 from .text_utils import clean_text
-from .utils import setup_logging, REQUEST_HEADERS
+from .utils import setup_logging
 _LOG = logging.getLogger(__name__)
+# extract_body makes a single request; the async variant mirrors that
+_SINGLE_ATTEMPT = RetryPolicy(attempts=1)
+
+
+def _body_from_html(html: str) -> str:
+    """Return the joined ``<p>`` text of the article container in ``html``."""
+    Soup = getattr(bs4, "BeautifulSoup", None)
+    if Soup is None:
+        return ""
+    soup = Soup(html, "html.parser")
+    content = soup.find("article") or soup.find("div", class_="content")
+    if not content:
+        return ""
+    paragraphs = [p.get_text(" ", strip=True) for p in content.find_all("p")]
+    return " ".join(paragraphs)
 
 
 def extract_body(url: str) -> str:
     """Return cleaned body text from the article page."""
     body = ""
     try:
-        resp = requests.get(url, headers=REQUEST_HEADERS, timeout=10)
-        resp.raise_for_status()
-        Soup = getattr(bs4, "BeautifulSoup", None)
-        if Soup is not None:
-            soup = Soup(resp.text, "html.parser")
-            content = soup.find("article") or soup.find("div", class_="content")
-            if content:
-                paragraphs = [p.get_text(" ", strip=True) for p in content.find_all("p")]
-                body = " ".join(paragraphs)
+        body = _body_from_html(fetch_html(url, policy=_SINGLE_ATTEMPT))
     except Exception as exc:
         _LOG.warning("Failed to fetch %s: %s", url, exc)
     return clean_text(body)
 
 
+async def extract_body_async(url: str, client, *, executor=None) -> str:
+    """Async variant of :func:`extract_body` using a shared ``httpx`` client."""
+    body = ""
+    try:
+        html = await afetch_html(client, url, policy=_SINGLE_ATTEMPT)
+        loop = asyncio.get_running_loop()
+        body = await loop.run_in_executor(executor, _body_from_html, html)
+    except Exception as exc:
+        _LOG.warning("Failed to fetch %s: %s", url, exc)
+    return clean_text(body)
+
+
+def _keyed(articles):
+    """Yield ``(key, article)`` with the key being the link and how often it came before.
+
+    Articles without a link (or sharing one) thus stay distinct instead of
+    collapsing into a single checkpoint entry.
+    """
+    seen: dict[str, int] = {}
+    for art in articles:
+        link = art.get("link", "")
+        n = seen.get(link, 0)
+        seen[link] = n + 1
+        yield (link, n), art
+
+
+def _drop_unterminated_line(path: Path) -> None:
+    """Cut a last line a crash left without its newline off ``path``."""
+    if not path.exists():
+        return
+    with path.open("rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+
+
+def _iter_checkpoint(path: Path):
+    """Yield the articles already written to the JSONL ``path``."""
+    if not path.exists():
+        return
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                _LOG.warning("Ignoring broken checkpoint line in %s", path)
+
+
+def _extract_bodies(articles, workers: int):
+    """Yield each article with its ``body`` as soon as it is extracted.
+
+    ``articles`` is consumed as downloads finish, so at most a few articles
+    per worker are held at a time.
+    """
+    workers = max(1, workers)
+    pool = ThreadPoolExecutor(max_workers=workers)
+    try:
+        futures: dict = {}
+        for art in articles:
+            futures[pool.submit(extract_body, art.get("link", ""))] = art
+            if len(futures) < 2 * workers:
+                continue
+            finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                art = futures.pop(fut)
+                art["body"] = fut.result()
+                yield art
+        for fut in as_completed(futures):
+            art = futures[fut]
+            art["body"] = fut.result()
+            yield art
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
 def main(argv=None):
     parser = argparse.ArgumentParser(description="Extract article bodies and update JSON")
-    parser.add_argument("articles", help="Input JSON file with articles")
-    parser.add_argument("output", help="Path to output JSON file")
+    parser.add_argument("articles", help="Input JSON or JSONL file with articles")
+    parser.add_argument(
+        "output", help="Path to output JSON file (.jsonl/.ndjson streams one article per line)"
+    )
+    parser.add_argument("--workers", type=int, default=1, help="Number of concurrent downloads")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip articles already saved by an interrupted run",
+    )
     parser.add_argument("--log-level", default="INFO", help="Logging level")
     args = parser.parse_args(argv)
 
     setup_logging(level=args.log_level.upper())
 
-    with open(args.articles, encoding="utf-8") as f:
-        articles = json.load(f)
+    output = Path(args.output)
+    # finished articles are appended here as they complete; for JSONL
+    # output this is the output itself, otherwise a checkpoint next to it
+    jsonl = is_jsonl(output)
+    stream_path = output if jsonl else output.with_name(output.name + ".partial")
+    # bodies by article key, kept only to fill in the JSON array at the end
+    bodies: dict[tuple[str, int], str] = {}
+    done: set[tuple[str, int]] = set()
+    if args.resume:
+        # a crash may have cut the last line short; appending after it
+        # would corrupt the first new line
+        _drop_unterminated_line(stream_path)
+        for key, art in _keyed(_iter_checkpoint(stream_path)):
+            done.add(key)
+            if not jsonl:
+                bodies[key] = art.get("body", "")
+        if done:
+            _LOG.info("Resuming: %d done", len(done))
 
-    for art in articles:
-        link = art.get("link", "")
-        art["body"] = extract_body(link)
+    # the input is streamed, and read once more to write a JSON array, so
+    # only the bodies are held in memory
+    total = 0
+    pending_keys: dict[int, tuple[str, int]] = {}
+
+    def pending():
+        nonlocal total
+        for key, art in _keyed(iter_articles(args.articles)):
+            total += 1
+            if key not in done:
+                pending_keys[id(art)] = key
+                yield art
+
+    # finished articles are only ever appended when resuming, so an
+    # interruption never loses what an earlier run saved
+    with stream_path.open("a" if args.resume else "w", encoding="utf-8") as f:
+        stream = ArticleWriter(f, jsonl=True)
+        for art in _extract_bodies(pending(), args.workers):
+            stream.write(art)
+            key = pending_keys.pop(id(art))
+            if not jsonl:
+                bodies[key] = art["body"]
 
-    with open(args.output, "w", encoding="utf-8") as f:
-        json.dump(articles, f, ensure_ascii=False, indent=2)
-    print(f"Saved {len(articles)} articles to {args.output}")
-    return Path(args.output)
+    if not jsonl:
+        with open_writer(output, jsonl=False) as out:
+            for key, art in _keyed(iter_articles(args.articles)):
+                art["body"] = bodies[key]
+                out.write(art)
+        stream_path.unlink()
+    print(f"Saved {total} articles to {args.output}")
+    return output
 
 
 if __name__ == "__main__":
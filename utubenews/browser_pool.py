@@ -0,0 +1,185 @@
+"""Pool of long-lived headless Chrome sessions for JS-heavy pages."""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+_LOG = logging.getLogger(__name__)
+
+# number of Chrome sessions kept alive by the default pool
+POOL_SIZE = 2
+
+# pages a session may load before it is replaced by a fresh one
+MAX_PAGES_PER_SESSION = 50
+
+_INSTALL_LOCK = threading.Lock()
+_INSTALLED = False
+
+
+def _install_driver() -> None:
+    """Install a matching chromedriver once per process."""
+    global _INSTALLED
+    with _INSTALL_LOCK:
+        if _INSTALLED:
+            return
+        import chromedriver_autoinstaller
+
+        chromedriver_autoinstaller.install()
+        _INSTALLED = True
+
+
+def _start_chrome():
+    """Return a new headless Chrome ``WebDriver``."""
+    try:
+        from selenium import webdriver
+    except Exception as e:
+        raise RuntimeError("selenium unavailable") from e
+
+    _install_driver()
+    opts = webdriver.ChromeOptions()
+    opts.add_argument("--headless=new")
+    opts.add_argument("--no-sandbox")
+    return webdriver.Chrome(options=opts)
+
+
+def wait_for_page(driver, timeout: float = 10.0, selector: str | None = None, poll: float = 0.1) -> bool:
+    """Wait until the document is loaded (and ``selector`` matches).
+
+    Returns ``False`` when ``timeout`` seconds pass first; the caller can
+    still use whatever the page rendered so far.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            ready = driver.execute_script("return document.readyState") == "complete"
+            if ready and selector:
+                ready = bool(driver.find_elements("css selector", selector))
+        except Exception as exc:  # page navigating or script blocked
+            _LOG.debug("readiness check failed: %s", exc)
+            ready = False
+        if ready:
+            return True
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(poll)
+
+
+class _Session:
+    """A pooled driver and the number of pages it has served."""
+
+    def __init__(self, driver) -> None:
+        self.driver = driver
+        self.pages = 0
+
+
+class BrowserPool:
+    """Lease long-lived headless Chrome sessions instead of starting one per URL.
+
+    Up to ``size`` sessions are started lazily. A session is health-checked
+    before every lease and replaced when the check fails, when it has served
+    ``max_pages`` pages, or when the caller's block raised an exception.
+    """
+
+    def __init__(
+        self,
+        size: int = POOL_SIZE,
+        max_pages: int = MAX_PAGES_PER_SESSION,
+        *,
+        factory=_start_chrome,
+    ) -> None:
+        self.size = size
+        self.max_pages = max_pages
+        self._factory = factory
+        self._idle: queue.LifoQueue[_Session] = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._closed = False
+        self.started = 0
+        self.recycled = 0
+
+    def _healthy(self, session: _Session) -> bool:
+        try:
+            return session.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def _discard(self, session: _Session) -> None:
+        with self._lock:
+            self.recycled += 1
+        try:
+            session.driver.quit()
+        except Exception as exc:  # pragma: no cover - best effort
+            _LOG.debug("Failed to quit Chrome: %s", exc)
+
+    def _acquire(self) -> _Session:
+        while True:
+            try:
+                session = self._idle.get_nowait()
+            except queue.Empty:
+                driver = self._factory()
+                with self._lock:
+                    self.started += 1
+                return _Session(driver)
+            if self._healthy(session):
+                return session
+            _LOG.info("Replacing unresponsive Chrome session")
+            self._discard(session)
+
+    @contextmanager
+    def lease(self, timeout: float | None = None):
+        """Yield a ``WebDriver`` for exclusive use inside the ``with`` block.
+
+        Blocks until one of the ``size`` sessions is free; raises
+        :class:`TimeoutError` after ``timeout`` seconds.
+        """
+        if self._closed:
+            raise RuntimeError("browser pool is closed")
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError("no browser session available")
+        session = None
+        ok = False
+        try:
+            session = self._acquire()
+            yield session.driver
+            ok = True
+        finally:
+            if session is not None:
+                session.pages += 1
+                if ok and not self._closed and session.pages < self.max_pages:
+                    self._idle.put(session)
+                else:
+                    self._discard(session)
+            self._slots.release()
+
+    def stats(self) -> dict[str, int]:
+        """Return counts of started, recycled and idle sessions."""
+        return {"started": self.started, "recycled": self.recycled, "idle": self._idle.qsize()}
+
+    def close(self) -> None:
+        """Quit every idle session; leased ones are quit when returned."""
+        self._closed = True
+        while True:
+            try:
+                session = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(session)
+
+
+_POOL: BrowserPool | None = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_pool() -> BrowserPool:
+    """Return the process-wide pool, creating it on first use."""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None or _POOL._closed:
+            _POOL = BrowserPool()
+            atexit.register(_POOL.close)
+        return _POOL
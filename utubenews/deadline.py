@@ -0,0 +1,69 @@
+"""Per-article time budget checked by every enrichment stage."""
+
+from __future__ import annotations
+
+import math
+import os
+import time
+
+# seconds one article may spend on download, extraction, summary and screenshot
+ARTICLE_BUDGET = float(os.getenv("ARTICLE_BUDGET", "60"))
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a stage starts after the article's budget ran out."""
+
+
+class Deadline:
+    """A point in time by which an article has to be finished.
+
+    ``seconds=None`` never expires, so code can always take a deadline
+    instead of checking for ``None``. Stages call :meth:`timeout` to bound
+    their own waits by what is left, or :meth:`expired` to skip work.
+    """
+
+    def __init__(self, seconds: float | None = None) -> None:
+        self._expires = math.inf if seconds is None else time.monotonic() + seconds
+        self._paused: float | None = None
+
+    def remaining(self) -> float:
+        """Return the seconds left (``inf`` for an unbounded deadline)."""
+        if self._paused is not None:
+            return self._paused
+        return max(0.0, self._expires - time.monotonic())
+
+    def pause(self) -> None:
+        """Stop the clock, e.g. while the article waits for others of its batch."""
+        if self._paused is None:
+            self._paused = self.remaining()
+
+    def resume(self) -> None:
+        """Restart the clock with the time that was left at :meth:`pause`."""
+        if self._paused is not None:
+            self._expires = time.monotonic() + self._paused
+            self._paused = None
+
+    def expired(self) -> bool:
+        """Return ``True`` once no time is left."""
+        return self.remaining() <= 0
+
+    def check(self, stage: str) -> None:
+        """Raise :class:`DeadlineExceeded` if ``stage`` may no longer start."""
+        if self.expired():
+            raise DeadlineExceeded(f"time budget exhausted before {stage}")
+
+    def timeout(self, cap: float | None = None, stage: str = "wait") -> float | None:
+        """Return a timeout for the next blocking call.
+
+        The result is ``cap`` or the remaining time, whichever is smaller, and
+        ``None`` when both are unbounded. Raises :class:`DeadlineExceeded`
+        when the budget is already spent.
+        """
+        self.check(stage)
+        left = min(self.remaining(), math.inf if cap is None else cap)
+        return None if math.isinf(left) else left
+
+    def __reduce__(self):
+        # monotonic clocks are per process; ship the time left instead
+        left = self.remaining()
+        return (Deadline, (None if math.isinf(left) else left,))
@@ -0,0 +1,180 @@
+"""Persistent LRU cache of summaries in a SQLite file.
+
+Summarizing an article on CPU takes seconds, while re-runs, syndicated
+stories and RSS summaries used as fallback text keep sending the same input.
+:func:`get_cache` returns a process-wide :class:`SummaryCache` (another one,
+``get_cache("translations")``, holds translations) stored under
+``UTUBENEWS_CACHE_DIR`` (default ``.cache/`` in the project root); set the
+variable to ``""`` or ``off`` to disable caching.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+
+_LOG = logging.getLogger(__name__)
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+
+# entries kept before the least recently used ones are dropped
+CACHE_MAX_ENTRIES = int(os.getenv("SUMMARY_CACHE_MAX_ENTRIES", "20000"))
+
+_DISABLED = {"", "0", "off", "false", "no"}
+
+
+def normalize_text(text: str) -> str:
+    """Return ``text`` in the form used for cache keys.
+
+    Unicode compatibility forms and runs of whitespace are folded so inputs
+    differing only in spacing or full-width characters share an entry.
+    """
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+
+def make_key(text: str, *config) -> str:
+    """Return the cache key of ``text`` summarized with ``config``."""
+    data = json.dumps([normalize_text(text), *config], ensure_ascii=False)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+class SummaryCache:
+    """Key/value store of summaries with least-recently-used eviction.
+
+    One SQLite connection is shared by all threads of the process; several
+    processes may open the same file. Database errors are logged and treated
+    as cache misses so a broken cache never stops summarization.
+    """
+
+    def __init__(self, path: Path | str, max_entries: int = CACHE_MAX_ENTRIES) -> None:
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path), timeout=5.0, check_same_thread=False)
+        with self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS summaries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, used REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS summaries_used ON summaries(used)")
+
+    def get(self, key: str) -> str | None:
+        """Return the value stored for ``key`` and mark it as recently used."""
+        with self._lock:
+            try:
+                row = self._db.execute(
+                    "SELECT value FROM summaries WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    with self._db:
+                        self._db.execute(
+                            "UPDATE summaries SET used = ? WHERE key = ?", (time.time(), key)
+                        )
+            except sqlite3.Error as exc:
+                _LOG.debug("요약 캐시 읽기 실패: %s", exc)
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, value: str) -> None:
+        """Store ``value`` under ``key`` and evict entries over the limit."""
+        with self._lock:
+            try:
+                with self._db:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO summaries (key, value, used) VALUES (?, ?, ?)",
+                        (key, value, time.time()),
+                    )
+                    self._db.execute(
+                        "DELETE FROM summaries WHERE key IN ("
+                        "SELECT key FROM summaries ORDER BY used DESC LIMIT -1 OFFSET ?)",
+                        (self.max_entries,),
+                    )
+            except sqlite3.Error as exc:
+                _LOG.debug("요약 캐시 쓰기 실패: %s", exc)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+
+    def stats(self) -> dict:
+        """Return hits, misses, hit rate and stored entries since start-up."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self),
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+def cache_dir() -> Path | None:
+    """Return ``UTUBENEWS_CACHE_DIR`` as a path, or ``None`` when caching is off."""
+    directory = os.getenv("UTUBENEWS_CACHE_DIR", str(ROOT_DIR / ".cache"))
+    if directory.strip().lower() in _DISABLED:
+        return None
+    return Path(directory)
+
+
+# open caches by name; None marks a cache that is off or failed to open
+_CACHES: dict[str, SummaryCache | None] = {}
+_CACHE_LOCK = threading.Lock()
+
+
+def get_cache(name: str = "summaries") -> SummaryCache | None:
+    """Return the shared cache ``name``, or ``None`` when caching is off.
+
+    Each name is its own SQLite file (``summaries``, ``translations``).
+    ``UTUBENEWS_CACHE_DIR`` is read on first use, so it can be set after
+    import (as the tests do).
+    """
+    if name in _CACHES:
+        return _CACHES[name]
+    with _CACHE_LOCK:
+        if name not in _CACHES:
+            directory = cache_dir()
+            cache = None
+            if directory is not None:
+                try:
+                    cache = SummaryCache(directory / f"{name}.sqlite3")
+                except (OSError, sqlite3.Error) as exc:
+                    _LOG.warning("캐시를 열 수 없습니다 (%s): %s", name, exc)
+            _CACHES[name] = cache
+    return _CACHES[name]
+
+
+_INHERITED: list[SummaryCache] = []
+
+
+def _reset_after_fork() -> None:
+    """Drop the parent's caches in a forked child; they reopen on next use.
+
+    A SQLite connection must not be used across ``fork``. The inherited
+    objects are kept alive so they are never closed from the child either.
+    """
+    global _CACHE_LOCK
+    _INHERITED.extend(cache for cache in _CACHES.values() if cache is not None)
+    _CACHES.clear()
+    _CACHE_LOCK = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -1,9 +1,9 @@
 import argparse
-import json
 from pathlib import Path
 from datetime import datetime
 
 from . import pipeline
+from .article_io import is_jsonl, iter_articles, open_writer
 from .utils import setup_logging
 
 
@@ -11,12 +11,24 @@ def main(argv=None):
     parser = argparse.ArgumentParser(
         description="Enrich articles stored in a JSON file"
     )
-    parser.add_argument("input_json", help="Path to JSON file with articles")
+    parser.add_argument(
+        "input_json", help="Path to JSON array or JSONL file with articles"
+    )
     parser.add_argument(
         "--with-screenshot",
         action="store_true",
         help="Capture article pages as screenshots",
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Recompute body, script and screenshot even if already present",
+    )
+    parser.add_argument(
+        "--jsonl",
+        action="store_true",
+        help="Write JSONL output (default for .jsonl/.ndjson input)",
+    )
     parser.add_argument(
         "--log-level", default="INFO", help="Logging level (default: INFO)"
     )
@@ -25,20 +37,22 @@ def main(argv=None):
     level = args.log_level.upper()
     setup_logging(level=level)
 
-    with open(args.input_json, encoding="utf-8") as f:
-        articles = json.load(f)
-
-    enriched = pipeline.enrich_articles(
-        articles, with_screenshot=args.with_screenshot
+    # articles are read, enriched and written one at a time
+    enriched = pipeline.iter_enrich_articles(
+        iter_articles(args.input_json),
+        with_screenshot=args.with_screenshot,
+        incremental=not args.force,
     )
 
     date_str = datetime.now().strftime("%Y%m%d")
+    suffix = ".jsonl" if args.jsonl or is_jsonl(args.input_json) else ".json"
     out_path = Path(args.input_json).with_name(
-        f"articles_enriched_{date_str}.json"
+        f"articles_enriched_{date_str}{suffix}"
     )
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(enriched, f, ensure_ascii=False, indent=2)
-    print(f"Saved {len(enriched)} articles to {out_path}")
+    with open_writer(out_path) as out:
+        for art in enriched:
+            out.write(art)
+    print(f"Saved {out.count} articles to {out_path}")
     return out_path
 
 
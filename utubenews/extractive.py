@@ -0,0 +1,124 @@
+"""TextRank vectorized with NumPy.
+
+:func:`summarizer.textrank_summary` compares every pair of sentences with
+Python sets and runs the word regex once more for every sentence. The
+version here finds the words and sentence separators of a text in a single
+regex pass, numbers the sentences by counting separators and keeps the
+result as a sparse sentence×term matrix in coordinate form (one sentence
+index and one term index per word). Shared terms are counted from the
+coordinates and the power iteration runs on the sentence×sentence matrix
+only.
+
+It returns exactly what the pure-Python function returns and is used by it
+whenever NumPy is installed.
+"""
+
+from __future__ import annotations
+
+import re
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; the pure-Python summarizer is used
+    np = None
+
+_WORD_PAT = re.compile(r"[A-Za-z가-힣]+")
+_SENTENCE_PAT = re.compile(r"(?<=[.!?。])\s+|\n+")  # summarizer._SENTENCE_PAT
+# words and separators in one pass; separators are the whitespace tokens
+_TOKEN_PAT = re.compile(_WORD_PAT.pattern + "|" + _SENTENCE_PAT.pattern)
+# digits TextRank scores are rounded to, so float summation order cannot
+# decide between sentences of equal rank
+_SCORE_DIGITS = 9
+# terms per dense sentence×term block multiplied for the common terms
+_TERM_BLOCK = 256
+
+
+def _terms(text: str):
+    """Return the part×term matrix of ``text`` in coordinate form.
+
+    Parts are the pieces of ``text`` split at ``_SENTENCE_PAT``. Gives
+    ``(rows, cols)``: word ``k`` of the lowercased text lies in part
+    ``rows[k]`` and is term ``cols[k]``. Lowercasing never creates or
+    removes a separator, so one pass over the whole text finds the same
+    words as lowercasing each part.
+    """
+    tokens = _TOKEN_PAT.findall(text.lower())
+    terms = list(dict.fromkeys(tokens))
+    index = {term: i for i, term in enumerate(terms)}
+    ids = np.fromiter(map(index.__getitem__, tokens), dtype=np.intp, count=len(tokens))
+    # separators are the whitespace terms
+    is_sep = np.fromiter((t[0].isspace() for t in terms), dtype=bool, count=len(terms))
+    sep = is_sep[ids]
+    return np.cumsum(sep)[~sep], ids[~sep]
+
+
+def _overlaps(rows, cols, n: int):
+    """Return the n×n counts of distinct terms each pair of sentences shares.
+
+    ``rows``/``cols`` is the coordinate form of :func:`_terms`; also gives
+    the number of distinct terms per sentence. A term found in ``k``
+    sentences adds one to ``k²`` pairs. Rare terms (``k² <= n``) expand to
+    those pairs directly; common ones, few by definition, are multiplied
+    as dense sentence×term blocks of ``_TERM_BLOCK`` columns. The full
+    sentence×term matrix is never built.
+    """
+    # distinct (term, sentence) pairs, grouped by term
+    width = n + 1
+    pairs = np.unique(cols * width + rows)
+    terms, sents = pairs // width, pairs % width
+    counts = np.bincount(terms)
+    common = counts[terms] ** 2 > n
+
+    overlap = np.zeros((n, n), dtype=np.float64)
+    if common.any():
+        common_terms = np.unique(terms[common])
+        column = np.zeros(len(counts), dtype=np.intp)
+        column[common_terms] = np.arange(len(common_terms))
+        block_cols, block_rows = column[terms[common]], sents[common]
+        for start in range(0, len(common_terms), _TERM_BLOCK):
+            inside = (block_cols >= start) & (block_cols < start + _TERM_BLOCK)
+            block = np.zeros((n, _TERM_BLOCK), dtype=np.float64)
+            block[block_rows[inside], block_cols[inside] - start] = 1.0
+            overlap += block @ block.T
+
+    # rare terms: each occurrence meets every occurrence of its term
+    rare_terms, rare_sents = terms[~common], sents[~common]
+    sizes = counts[rare_terms]
+    index = np.arange(len(rare_terms))
+    new_term = np.ones(len(rare_terms), dtype=bool)
+    new_term[1:] = rare_terms[1:] != rare_terms[:-1]
+    group_start = np.maximum.accumulate(np.where(new_term, index, 0))
+    left = np.repeat(rare_sents, sizes)
+    offset = np.arange(len(left)) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    right = rare_sents[np.repeat(group_start, sizes) + offset]
+    overlap += np.bincount(left * n + right, minlength=n * n).reshape(n, n)
+    return overlap, np.bincount(sents, minlength=n)
+
+
+def textrank_summary(
+    text: str, max_sent: int = 3, *, damping: float = 0.85, iterations: int = 30
+) -> str:
+    """Vectorized :func:`summarizer.textrank_summary`."""
+    parts = _SENTENCE_PAT.split(text)
+    stripped = [part.strip() for part in parts]
+    sents = [sent for sent in stripped if sent]
+    n = len(sents)
+    if n <= max_sent:
+        return " ".join(sents)
+    rows, cols = _terms(text)
+    # words of blank parts cannot exist, so map part numbers to sentences
+    nonblank = np.fromiter(map(bool, stripped), dtype=bool, count=len(stripped))
+    rows = (np.cumsum(nonblank) - 1)[rows]
+    overlap, distinct = _overlaps(rows, cols, n)
+    np.fill_diagonal(overlap, 0.0)
+    logs = np.log(distinct + 1)
+    norm = logs[:, None] + logs[None, :]
+    weights = np.divide(overlap, norm, out=np.zeros_like(overlap), where=(overlap > 0) & (norm > 0))
+    totals = weights.sum(axis=1)
+    moves = np.divide(weights, totals[:, None], out=np.zeros_like(weights), where=totals[:, None] > 0)
+    scores = np.ones(n)
+    for _ in range(iterations):
+        scores = (1 - damping) + damping * (moves.T @ scores)
+    scores = np.round(scores, _SCORE_DIGITS)
+    top = np.lexsort((np.arange(n), -scores))[:max_sent]
+    return " ".join(sents[i] for i in sorted(top.tolist()))
@@ -0,0 +1,362 @@
+"""Retry policy, per-host circuit breaker, size/type gating and charset
+detection for page fetches."""
+
+from __future__ import annotations
+
+import codecs
+import email.utils
+import logging
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+_LOG = logging.getLogger(__name__)
+
+# per-request timeout in seconds, shortened by an article's deadline
+REQUEST_TIMEOUT = 10.0
+
+# HTTP status codes worth another attempt; everything else in 4xx is final
+RETRYABLE_STATUS = {408, 425, 429, 500, 502, 503, 504}
+
+# largest page body read for extraction; longer pages are truncated
+MAX_PAGE_BYTES = int(os.getenv("MAX_PAGE_BYTES", str(2 * 1024 * 1024)))
+
+# content types that may hold an article; a missing header is let through
+HTML_CONTENT_TYPES = {"text/html", "application/xhtml+xml"}
+
+# streaming read size for page bodies
+CHUNK_SIZE = 64 * 1024
+
+# leading bytes searched for a ``<meta charset>`` declaration
+SNIFF_BYTES = 4096
+
+# used when a page declares nothing and is not valid UTF-8 (Korean sites)
+FALLBACK_CHARSET = "cp949"
+
+_META_CHARSET_PAT = re.compile(rb"""<meta[^>]+?charset\s*=\s*["']?\s*([A-Za-z0-9_.:\-]+)""", re.I)
+
+# browsers decode legacy labels with their superset encoding
+_CHARSET_SUPERSETS = {"euc_kr": "cp949", "iso8859-1": "cp1252", "ascii": "cp1252"}
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of a request when the target host's breaker is open."""
+
+
+class SkippedPage(Exception):
+    """Raised when a fetched page is not worth downloading or parsing."""
+
+    def __init__(self, url: str, reason: str) -> None:
+        super().__init__(f"{reason}: {url}")
+        self.url = url
+        self.reason = reason
+
+
+def host_of(url: str) -> str:
+    """Return the lowercase host part of ``url`` used as the breaker key."""
+    return (urlsplit(url).hostname or "").lower()
+
+
+def _status_of(exc: Exception) -> int | None:
+    """Return the HTTP status attached to ``exc`` (requests or httpx)."""
+    resp = getattr(exc, "response", None)
+    status = getattr(resp, "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def _retry_after(exc: Exception) -> float | None:
+    """Return the ``Retry-After`` delay in seconds carried by ``exc``."""
+    resp = getattr(exc, "response", None)
+    headers = getattr(resp, "headers", None) or {}
+    value = headers.get("Retry-After") if hasattr(headers, "get") else None
+    if not value:
+        return None
+    value = str(value).strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryPolicy:
+    """Decide whether and how long to wait before retrying a failed fetch.
+
+    Only transport errors and the statuses in :data:`RETRYABLE_STATUS` are
+    retried. Waits follow exponential backoff with full jitter, and a
+    ``Retry-After`` header from the server takes precedence. When the server
+    asks for longer than ``max_delay`` the request is not retried at all.
+    """
+
+    def __init__(
+        self,
+        attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 10.0,
+        *,
+        rng: random.Random | None = None,
+    ) -> None:
+        self.attempts = max(1, attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._rng = rng or random.Random()
+
+    def is_retryable(self, exc: Exception) -> bool:
+        """Return ``True`` when ``exc`` is worth another attempt."""
+        status = _status_of(exc)
+        if status is not None:
+            return status in RETRYABLE_STATUS
+        # malformed URLs (requests.MissingSchema, InvalidURL, ...) never heal
+        return not isinstance(exc, ValueError)
+
+    def next_delay(self, attempt: int, exc: Exception) -> float | None:
+        """Return seconds to wait before retry number ``attempt`` (0-based).
+
+        ``None`` means the request should not be retried.
+        """
+        if attempt + 1 >= self.attempts or not self.is_retryable(exc):
+            return None
+        retry_after = _retry_after(exc)
+        if retry_after is not None:
+            return retry_after if retry_after <= self.max_delay else None
+        cap = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return self._rng.uniform(0, cap)
+
+
+class CircuitBreaker:
+    """Per-host breaker that fails fast once a host is clearly down.
+
+    After ``failure_threshold`` consecutive retryable failures the host's
+    breaker opens and requests raise :class:`CircuitOpenError` without
+    touching the network. After ``reset_timeout`` seconds a single probe
+    request is let through (half-open); its outcome closes or re-opens the
+    breaker. 4xx responses other than 408/429 count as the host being up.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._hosts: dict[str, dict] = {}
+
+    def _entry(self, host: str) -> dict:
+        entry = self._hosts.get(host)
+        if entry is None:
+            entry = {
+                "state": "closed",
+                "consecutive_failures": 0,
+                "opened_at": 0.0,
+                "probing": False,
+                "requests": 0,
+                "successes": 0,
+                "failures": 0,
+                "short_circuited": 0,
+                "times_opened": 0,
+            }
+            self._hosts[host] = entry
+        return entry
+
+    def before_request(self, host: str) -> None:
+        """Raise :class:`CircuitOpenError` if ``host`` may not be contacted."""
+        with self._lock:
+            entry = self._entry(host)
+            if entry["state"] == "open":
+                if time.monotonic() - entry["opened_at"] < self.reset_timeout:
+                    entry["short_circuited"] += 1
+                    raise CircuitOpenError(f"circuit open for {host}")
+                entry["state"] = "half_open"
+            if entry["state"] == "half_open":
+                if entry["probing"]:
+                    entry["short_circuited"] += 1
+                    raise CircuitOpenError(f"circuit half-open for {host}")
+                entry["probing"] = True
+            entry["requests"] += 1
+
+    def record_success(self, host: str) -> None:
+        """Mark a completed request to ``host`` and close its breaker."""
+        with self._lock:
+            entry = self._entry(host)
+            entry["successes"] += 1
+            entry["consecutive_failures"] = 0
+            entry["probing"] = False
+            entry["state"] = "closed"
+
+    def record_failure(self, host: str) -> None:
+        """Count a failed request to ``host``, opening the breaker if needed."""
+        with self._lock:
+            entry = self._entry(host)
+            entry["failures"] += 1
+            entry["consecutive_failures"] += 1
+            reopen = entry["state"] == "half_open"
+            entry["probing"] = False
+            if reopen or entry["consecutive_failures"] >= self.failure_threshold:
+                if entry["state"] != "open":
+                    entry["times_opened"] += 1
+                    _LOG.warning("circuit opened for %s", host)
+                entry["state"] = "open"
+                entry["opened_at"] = time.monotonic()
+
+    def release(self, host: str) -> None:
+        """Free ``host``'s probe slot after a request that ended without an outcome.
+
+        Called when a request is cancelled or fails with an error that says
+        nothing about the host, so the next request may probe again.
+        """
+        with self._lock:
+            self._entry(host)["probing"] = False
+
+    def record(self, host: str, exc: Exception | None, policy: RetryPolicy) -> None:
+        """Record the outcome of one request according to ``policy``."""
+        if exc is None or not policy.is_retryable(exc):
+            self.record_success(host)
+        else:
+            self.record_failure(host)
+
+    def stats(self) -> dict[str, dict]:
+        """Return a snapshot of breaker state and counters per host."""
+        with self._lock:
+            return {
+                host: {k: v for k, v in entry.items() if k not in ("opened_at", "probing")}
+                for host, entry in self._hosts.items()
+            }
+
+    def reset(self) -> None:
+        """Forget all host state."""
+        with self._lock:
+            self._hosts.clear()
+
+
+# shared defaults used by the sync and async fetchers
+DEFAULT_POLICY = RetryPolicy()
+BREAKER = CircuitBreaker()
+
+
+def breaker_stats() -> dict[str, dict]:
+    """Return breaker state and counters of :data:`BREAKER` for monitoring."""
+    return BREAKER.stats()
+
+
+_SKIPS: Counter[str] = Counter()
+_SKIPS_LOCK = threading.Lock()
+
+
+def record_skip(url: str, reason: str) -> None:
+    """Count a page skipped for ``reason``."""
+    with _SKIPS_LOCK:
+        _SKIPS[reason] += 1
+    _LOG.info("skipped %s (%s)", url, reason)
+
+
+def skip_stats() -> dict[str, int]:
+    """Return how many pages were skipped or truncated, per reason."""
+    with _SKIPS_LOCK:
+        return dict(_SKIPS)
+
+
+def reset_skip_stats() -> None:
+    """Forget the skip counters, e.g. at the start of a pipeline run."""
+    with _SKIPS_LOCK:
+        _SKIPS.clear()
+
+
+def check_page_headers(url: str, headers) -> None:
+    """Raise :class:`SkippedPage` when ``headers`` rule out an HTML article.
+
+    Non-HTML content types (PDF, images, ...) are rejected before any of
+    the body is downloaded.
+    """
+    ctype = (headers.get("Content-Type") or "").split(";")[0].strip().lower()
+    if ctype and ctype not in HTML_CONTENT_TYPES:
+        record_skip(url, "content_type")
+        raise SkippedPage(url, f"content type {ctype}")
+
+
+class CappedBuffer:
+    """Accumulate streamed body chunks up to ``max_bytes``.
+
+    Data beyond the cap is counted as a ``"truncated"`` page (a body of
+    exactly ``max_bytes`` is not); the prefix read so far is still used for
+    extraction since article text comes early.
+    """
+
+    def __init__(self, url: str, max_bytes: int = MAX_PAGE_BYTES) -> None:
+        self.url = url
+        self.max_bytes = max_bytes
+        self._chunks: list[bytes] = []
+        self._size = 0
+
+    def feed(self, chunk: bytes) -> bool:
+        """Add ``chunk`` and return ``True`` once data past the cap arrives."""
+        room = self.max_bytes - self._size
+        if len(chunk) > room:
+            self._chunks.append(chunk[:room])
+            self._size = self.max_bytes
+            record_skip(self.url, "truncated")
+            return True
+        self._chunks.append(chunk)
+        self._size += len(chunk)
+        return False
+
+    def getvalue(self) -> bytes:
+        """Return the collected bytes."""
+        return b"".join(self._chunks)
+
+
+def charset_of(headers) -> str | None:
+    """Return the ``charset`` parameter of the ``Content-Type`` header."""
+    ctype = headers.get("Content-Type") or ""
+    for param in ctype.split(";")[1:]:
+        key, _, value = param.partition("=")
+        if key.strip().lower() == "charset" and value.strip():
+            return value.strip().strip("'\"")
+    return None
+
+
+def normalize_charset(label: str | None) -> str | None:
+    """Return the Python codec name for ``label`` or ``None`` if unknown.
+
+    ``euc-kr`` maps to ``cp949`` (and ``latin-1`` to ``cp1252``) like in
+    browsers, since pages labelled with the former routinely use the latter.
+    """
+    if not label:
+        return None
+    try:
+        name = codecs.lookup(label.strip().strip("'\"")).name
+    except LookupError:
+        return None
+    return _CHARSET_SUPERSETS.get(name, name)
+
+
+def sniff_charset(data: bytes, declared: str | None = None) -> str:
+    """Return the charset to decode the page body ``data`` with.
+
+    The ``Content-Type`` charset (``declared``) wins, then a ``<meta>``
+    declaration in the first :data:`SNIFF_BYTES` bytes. Undeclared pages are
+    ``utf-8`` when they decode as such, else :data:`FALLBACK_CHARSET`. The
+    body is only scanned in full in that last case.
+    """
+    charset = normalize_charset(declared)
+    if charset:
+        return charset
+    if data.startswith(codecs.BOM_UTF8):
+        return "utf-8"
+    m = _META_CHARSET_PAT.search(data[:SNIFF_BYTES])
+    charset = normalize_charset(m.group(1).decode("ascii")) if m else None
+    if charset:
+        return charset
+    try:
+        # final=False tolerates a multi-byte sequence cut off by the size cap
+        codecs.getincrementaldecoder("utf-8")().decode(data, final=False)
+    except UnicodeDecodeError:
+        return FALLBACK_CHARSET
+    return "utf-8"
+
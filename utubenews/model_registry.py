@@ -0,0 +1,190 @@
+"""Load models once and lend out replicas for concurrent inference.
+
+A transformers pipeline is not safe to run from several threads at once.
+:class:`ModelRegistry` loads a model exactly once under a lock and, when
+allowed more than one replica, loads further copies on demand so that up to
+``max_replicas`` threads can generate at the same time. Callers borrow a
+replica with :meth:`ModelRegistry.lease`; :meth:`ModelRegistry.stats`
+reports load time, memory footprint and utilization per replica.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+
+def _rss_bytes() -> int | None:
+    """Return the resident set size of this process, where it can be read."""
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def model_bytes(obj) -> int | None:
+    """Return the memory held by the weights of ``obj``, if it can be told.
+
+    PyTorch models (or pipelines wrapping one) are measured by their
+    parameters; other objects give ``None``.
+    """
+    model = getattr(obj, "model", obj)
+    parameters = getattr(model, "parameters", None)
+    if not callable(parameters):
+        return None
+    try:
+        return sum(p.numel() * p.element_size() for p in parameters())
+    except Exception:
+        return None
+
+
+class _Replica:
+    def __init__(self, obj, load_s: float, memory_bytes: int | None) -> None:
+        self.obj = obj
+        self.load_s = load_s
+        self.memory_bytes = memory_bytes
+        self.loaded_at = time.monotonic()
+        self.leases = 0
+        self.busy_s = 0.0
+        self.busy = False
+
+
+class ModelRegistry:
+    """Lazily loaded replicas of one model, lent out one thread at a time.
+
+    ``loader`` is called without arguments and returns a model; it runs at
+    most once per replica and never concurrently for the first replica.
+    """
+
+    def __init__(self, loader: Callable[[], object], max_replicas: int = 1) -> None:
+        self._loader = loader
+        self.max_replicas = max(1, max_replicas)
+        self._replicas: list[_Replica] = []
+        self._loading = 0
+        # set by adopt(): the loader would not reproduce an adopted model
+        self._fixed = False
+        self._cond = threading.Condition()
+        self._load_lock = threading.Lock()
+
+    @property
+    def primary(self):
+        """Return the first replica, or ``None`` before anything is loaded."""
+        replicas = self._replicas
+        return replicas[0].obj if replicas else None
+
+    def _load(self) -> _Replica:
+        rss = _rss_bytes()
+        start = time.monotonic()
+        obj = self._loader()
+        load_s = time.monotonic() - start
+        size = model_bytes(obj)
+        if size is None and rss is not None:
+            after = _rss_bytes()
+            size = after - rss if after is not None else None
+        return _Replica(obj, load_s, size)
+
+    def get(self):
+        """Return the first replica, loading it if needed.
+
+        Threads arriving during the load wait for it instead of loading a
+        copy of their own. Loader errors propagate and the next call tries
+        again.
+        """
+        if self._replicas:
+            return self._replicas[0].obj
+        with self._load_lock:
+            if not self._replicas:
+                replica = self._load()
+                with self._cond:
+                    self._replicas.append(replica)
+                    self._cond.notify_all()
+        return self._replicas[0].obj
+
+    def adopt(self, obj) -> None:
+        """Use the already loaded ``obj`` as the only replica.
+
+        No further replicas are loaded until :meth:`reset`.
+        """
+        with self._cond:
+            self._fixed = True
+            self._replicas = [_Replica(obj, 0.0, model_bytes(obj))]
+            self._cond.notify_all()
+
+    def reset(self) -> None:
+        """Forget all replicas; the next :meth:`get` loads the model again."""
+        with self._cond:
+            self._fixed = False
+            self._replicas = []
+
+    def _acquire(self, timeout: float | None) -> _Replica:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                for replica in self._replicas:
+                    if not replica.busy:
+                        replica.busy = True
+                        return replica
+                if not self._fixed and len(self._replicas) + self._loading < self.max_replicas:
+                    self._loading += 1
+                    break
+                left = None if deadline is None else deadline - time.monotonic()
+                if left is not None and left <= 0:
+                    raise TimeoutError("no model replica became free")
+                self._cond.wait(left)
+        # load a further replica outside the lock so leases keep flowing
+        replica = None
+        try:
+            replica = self._load()
+            replica.busy = True
+        finally:
+            with self._cond:
+                self._loading -= 1
+                if replica is not None:
+                    self._replicas.append(replica)
+                self._cond.notify_all()
+        return replica
+
+    @contextmanager
+    def lease(self, timeout: float | None = None) -> Iterator[object]:
+        """Borrow a replica for the duration of the ``with`` block.
+
+        Uses an idle replica, loads a new one while fewer than
+        ``max_replicas`` exist, or waits up to ``timeout`` seconds (forever
+        by default) for one to be returned; raises :class:`TimeoutError`
+        when none becomes free in time.
+        """
+        self.get()
+        replica = self._acquire(timeout)
+        start = time.monotonic()
+        try:
+            yield replica.obj
+        finally:
+            with self._cond:
+                replica.leases += 1
+                replica.busy_s += time.monotonic() - start
+                replica.busy = False
+                self._cond.notify()
+
+    def stats(self) -> dict:
+        """Return load time, memory and utilization of every replica.
+
+        ``utilization`` is the share of time since the replica was loaded
+        that it spent leased out.
+        """
+        now = time.monotonic()
+        with self._cond:
+            replicas = [
+                {
+                    "load_s": r.load_s,
+                    "memory_bytes": r.memory_bytes,
+                    "leases": r.leases,
+                    "busy_s": r.busy_s,
+                    "utilization": r.busy_s / (now - r.loaded_at) if now > r.loaded_at else 0.0,
+                }
+                for r in self._replicas
+            ]
+        return {"max_replicas": self.max_replicas, "replicas": replicas}
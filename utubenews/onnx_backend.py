@@ -0,0 +1,107 @@
+"""Run the summarization model with ONNX Runtime instead of PyTorch.
+
+The model is exported to ONNX once with :mod:`optimum` and kept on disk;
+with ``quantize=True`` its weights are additionally quantized to int8
+(dynamic quantization), which is usually the fastest option on CPUs.
+"""
+
+from __future__ import annotations
+
+import logging
+import platform
+import shutil
+import tempfile
+from pathlib import Path
+
+_LOG = logging.getLogger(__name__)
+
+# graphs written by ORTModelForSeq2SeqLM.save_pretrained
+ONNX_FILES = ("encoder_model.onnx", "decoder_model.onnx", "decoder_with_past_model.onnx")
+_FILE_ARGS = ("encoder_file_name", "decoder_file_name", "decoder_with_past_file_name")
+
+
+def _quantized_name(file_name: str) -> str:
+    return file_name.replace(".onnx", "_quantized.onnx")
+
+
+def export_dir(model_name: str, revision: str, cache_dir: Path | None) -> Path:
+    """Return the directory holding the ONNX export of ``model_name``.
+
+    Without ``cache_dir`` a temporary directory is used, so the model is
+    exported again by every process.
+    """
+    base = Path(cache_dir) if cache_dir is not None else Path(tempfile.mkdtemp())
+    return base / "onnx" / f"{model_name.replace('/', '--')}-{revision}"
+
+
+def _export(model_name: str, revision: str, target: Path) -> None:
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM  # type: ignore
+    from transformers import AutoTokenizer  # type: ignore
+
+    _LOG.info("ONNX 모델 변환 중: %s → %s", model_name, target)
+    tmp = target.with_name(target.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    model = ORTModelForSeq2SeqLM.from_pretrained(model_name, revision=revision, export=True)
+    model.save_pretrained(tmp)
+    AutoTokenizer.from_pretrained(model_name, revision=revision).save_pretrained(tmp)
+    # a crash mid-export must not leave a directory that looks complete
+    tmp.rename(target)
+
+
+def _quantize(source: Path, target: Path) -> None:
+    from optimum.onnxruntime import ORTQuantizer  # type: ignore
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig  # type: ignore
+
+    _LOG.info("ONNX 모델 int8 양자화 중: %s", target)
+    if platform.machine().lower() in {"arm64", "aarch64"}:
+        config = AutoQuantizationConfig.arm64(is_static=False, per_channel=False)
+    else:
+        config = AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+    tmp = target.with_name(target.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    for graph in sorted(source.glob("*.onnx")):
+        quantizer = ORTQuantizer.from_pretrained(source, file_name=graph.name)
+        quantizer.quantize(save_dir=tmp, quantization_config=config)
+    # config and tokenizer files are needed next to the quantized graphs
+    for path in source.iterdir():
+        if path.is_file() and path.suffix != ".onnx":
+            shutil.copy2(path, tmp / path.name)
+    tmp.rename(target)
+
+
+def load_onnx_pipeline(
+    model_name: str,
+    revision: str,
+    *,
+    quantize: bool = False,
+    cache_dir: Path | None = None,
+):
+    """Return a summarization pipeline running ``model_name`` on ONNX Runtime.
+
+    The export (and int8 copy when ``quantize`` is set) is created under
+    ``cache_dir`` on first use and reused afterwards. Raises
+    :class:`RuntimeError` when ``optimum[onnxruntime]`` is not installed.
+    """
+    try:
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM  # type: ignore
+        from transformers import AutoTokenizer, pipeline  # type: ignore
+    except ImportError as exc:  # pragma: no cover - optional dependency
+        raise RuntimeError("optimum[onnxruntime] unavailable") from exc
+
+    model_dir = export_dir(model_name, revision, cache_dir)
+    model_dir.parent.mkdir(parents=True, exist_ok=True)
+    if not model_dir.exists():
+        _export(model_name, revision, model_dir)
+    kwargs = {}
+    if quantize:
+        int8_dir = model_dir.with_name(model_dir.name + "-int8")
+        if not int8_dir.exists():
+            _quantize(model_dir, int8_dir)
+        model_dir = int8_dir
+        for arg, file_name in zip(_FILE_ARGS, ONNX_FILES):
+            if (model_dir / _quantized_name(file_name)).exists():
+                kwargs[arg] = _quantized_name(file_name)
+    model = ORTModelForSeq2SeqLM.from_pretrained(model_dir, **kwargs)
+    tokenizer = AutoTokenizer.from_pretrained(model_dir)
+    return pipeline("summarization", model=model, tokenizer=tokenizer)
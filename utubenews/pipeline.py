@@ -9,17 +9,34 @@
 
 ``enrich_articles()`` 함수는 본문 추출과 요약을 수행하며,
 ``run()``에서는 스크린샷 옵션이 활성화되어 있을 때(기본값) 호출됩니다.
+비동기 서비스에 포함할 때는 ``enrich_articles_async()`` 와 ``run_async()`` 를
+사용합니다.
 """
 from __future__ import annotations
-import json, logging, datetime as dt, re
+import asyncio, functools, hashlib, json, logging, math, datetime as dt, re
 from pathlib import Path
 from datetime import datetime
+from typing import Iterable, Iterator
 from slugify import slugify
 from .screenshot import capture
 from . import collector
 from .collector import collect_all
-from .article_extractor import extract_main_text
-from .summarizer import llm_summarize, normalize_script
+from .article_extractor import extract_main_text, extract_main_text_async, extract_main_texts
+from .article_io import open_writer
+from .async_fetch import create_client, MAX_CONNECTIONS
+from .deadline import ARTICLE_BUDGET, Deadline, DeadlineExceeded
+from .disk_cache import get_cache
+from .fetch_policy import breaker_stats, reset_skip_stats, skip_stats
+from .summarizer import (
+    LLM_BATCH_SIZE,
+    choose_tier,
+    llm_summarize_batch,
+    model_stats,
+    normalize_script,
+    summarize_tier,
+    warm_up,
+)
+from .summary_pool import get_pool
 from .text_utils import clean_text
 from .utils import deduplicate_fuzzy, run_as_sudo
 
@@ -39,38 +56,364 @@ def collect_articles(
     return collect_all(days=days, max_naver=max_naver, max_total=max_total)
 
 
-def enrich_articles(articles: list[dict], *, with_screenshot: bool = False) -> list[dict]:
-    """Attach body text, summary script, and optionally a screenshot."""
-    date_str = datetime.now().strftime("%Y%m%d") if with_screenshot else ""
+def _set_script(art: dict, script: str) -> None:
+    """Store ``script`` as ``art["script"]`` after normalizing it.
+
+    Scripts with almost no letters are replaced by the article title.
+    """
+    normalized = normalize_script(script)
+    if len(re.findall(r"[A-Za-z\uAC00-\uD7A3]", normalized)) < 5:
+        _LOG.warning("Suspicious script for %s: %r", art.get("link"), normalized)
+        normalized = normalize_script(art.get("title", ""))
+    elif normalized != script:
+        _LOG.warning("Suspicious script for %s: %r", art.get("link"), script)
+    art["script"] = normalized
+
+
+def _attach_scripts(arts: list[dict], deadlines: list[Deadline]) -> None:
+    """Summarize the bodies (or fallback texts) of ``arts`` into their scripts.
+
+    Each article first gets a summary tier from :func:`choose_tier`, stored
+    as ``art["summary_tier"]``: short RSS summaries are used as they are,
+    and articles the model has no time for or cannot read are summarized
+    extractively. The rest go through :func:`llm_summarize_batch` together,
+    their generation time capped by the smallest time left among them.
+    Articles whose deadline has passed use the RSS summary or title. With
+    ``SUMMARY_WORKERS`` set the batch is spread over the forked worker pool
+    (:mod:`summary_pool`).
+    """
+    todo, sources, left = [], [], []
+    for art, deadline in zip(arts, deadlines):
+        if deadline.expired():
+            _LOG.warning("시간 초과로 요약 생략: %s", art.get("link"))
+            art["summary_tier"] = "passthrough"
+            _set_script(art, clean_text(art.get("summary") or art["title"]))
+            continue
+        body = art.get("body")
+        source = clean_text(body or art.get("summary") or art["title"])
+        remaining = deadline.remaining()
+        tier = choose_tier(
+            source,
+            is_body=bool(body),
+            time_left=None if math.isinf(remaining) else remaining,
+            queue_depth=len(sources),
+        )
+        art["summary_tier"] = tier
+        if tier != "llm":
+            _set_script(art, summarize_tier(source, tier))
+            continue
+        todo.append(art)
+        sources.append(source)
+        left.append(remaining)
+    if not todo:
+        return
+    max_time = None if math.isinf(min(left)) else min(left)
+    pool = get_pool()
+    summarize = pool.summarize if pool is not None else llm_summarize_batch
+    for art, script in zip(todo, summarize(sources, max_time=max_time)):
+        _set_script(art, script)
+
+
+def _attach_screenshot(
+    art: dict, idx: int, date_str: str, deadline: Deadline | None = None
+) -> None:
+    """Capture the article page into ``SCREENS_DIR`` and record its path.
+
+    Skipped once ``deadline`` has passed; otherwise the page load is limited
+    to the time left.
+    """
+    deadline = deadline or Deadline()
+    try:
+        timeout = deadline.timeout(stage="screenshot")
+    except DeadlineExceeded:
+        _LOG.warning("시간 초과로 스크린샷 생략: %s", art.get("title"))
+        return
+    fname = f"{date_str}_{idx:03d}_{slugify(art.get('title', '') or '')}.png"
+    path = SCREENS_DIR / fname
+    try:
+        SCREENS_DIR.mkdir(parents=True, exist_ok=True)
+    except PermissionError:
+        run_as_sudo(["mkdir", "-p", str(SCREENS_DIR)])
+
+    try:
+        capture(art["link"], path, timeout=timeout)
+        art["screenshot"] = f"screens/{fname}"
+    except Exception as e:
+        _LOG.warning("스크린샷 실패: %s (%s)", art.get("title"), e)
+
+
+def input_fingerprint(art: dict) -> str:
+    """Return a digest of the fields that body, script and screenshot derive from."""
+    key = json.dumps(
+        [art.get("link", ""), art.get("title", ""), art.get("summary", "")],
+        ensure_ascii=False,
+    )
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+def _is_stale(art: dict) -> bool:
+    """Return ``True`` if ``art`` changed since it was last enriched.
+
+    Articles enriched before fingerprints were recorded are trusted as-is.
+    """
+    fp = art.get("enrich_fp")
+    return fp is not None and fp != input_fingerprint(art)
+
 
+def _has_screenshot(art: dict) -> bool:
+    """Return ``True`` if the screenshot recorded for ``art`` still exists."""
+    path = art.get("screenshot")
+    return bool(path) and (ROOT_DIR / path).exists()
+
+
+def _report_fetch_stats() -> None:
+    """Log skipped pages and hosts whose circuit breaker is not closed."""
+    skipped = skip_stats()
+    if skipped:
+        _LOG.info(
+            "건너뛴 페이지: %s",
+            ", ".join(f"{reason} {count}건" for reason, count in sorted(skipped.items())),
+        )
+    unhealthy = {h: st for h, st in breaker_stats().items() if st["state"] != "closed"}
+    for host, st in unhealthy.items():
+        _LOG.warning(
+            "호스트 차단 상태 %s: %s (실패 %d, 즉시 실패 %d)",
+            host, st["state"], st["failures"], st["short_circuited"],
+        )
+
+
+def _report_cache_stats() -> None:
+    """Log how many summaries came from the summary cache."""
+    cache = get_cache()
+    if cache is None:
+        return
+    st = cache.stats()
+    if st["hits"] or st["misses"]:
+        _LOG.info(
+            "요약 캐시 적중률 %.0f%% (적중 %d, 실패 %d, 저장 %d건)",
+            st["hit_rate"] * 100, st["hits"], st["misses"], st["entries"],
+        )
+
+
+def _report_model_stats() -> None:
+    """Log load time, memory and utilization of the summarization model."""
+    for i, st in enumerate(model_stats()["replicas"]):
+        mem = "?" if st["memory_bytes"] is None else f"{st['memory_bytes'] / 2**20:.0f}MB"
+        _LOG.info(
+            "요약 모델 #%d: 로딩 %.1f초, 메모리 %s, 사용률 %.0f%% (%d회)",
+            i, st["load_s"], mem, st["utilization"] * 100, st["leases"],
+        )
+
+
+def _needs_body(art: dict, incremental: bool) -> bool:
+    """Return ``True`` if the body of ``art`` has to be extracted."""
+    return not incremental or _is_stale(art) or not art.get("body")
+
+
+def _prepare_article(
+    art: dict,
+    *,
+    article_budget: float | None,
+    incremental: bool,
+    bodies: Iterator[str] | None = None,
+) -> tuple[Deadline, bool]:
+    """Extract the body of ``art`` if needed.
+
+    The body is taken from ``bodies`` instead of a download when given.
+    Returns the article's paused deadline and whether it needs a new script.
+    """
+    deadline = Deadline(article_budget)
+    need_body = _needs_body(art, incremental)
+    if incremental and _is_stale(art):
+        art.pop("screenshot", None)
+    if need_body:
+        if bodies is not None:
+            body = next(bodies)
+        else:
+            body = extract_main_text(art["link"], deadline=deadline)
+        art["body"] = clean_text(body)
+    # time spent waiting for the rest of the batch is not charged
+    deadline.pause()
+    return deadline, need_body or not art.get("script")
+
+
+def _finish_articles(
+    batch: list[tuple[int, dict, Deadline, bool]],
+    date_str: str,
+    *,
+    with_screenshot: bool,
+    incremental: bool,
+) -> None:
+    """Summarize a batch of prepared articles together, then take screenshots.
+
+    ``batch`` holds ``(idx, art, deadline, need_script)`` tuples as built
+    from :func:`_prepare_article`.
+    """
+    due = [(art, deadline) for _, art, deadline, need_script in batch if need_script]
+    for _, deadline in due:
+        deadline.resume()
+    if due:
+        _attach_scripts([art for art, _ in due], [deadline for _, deadline in due])
+    for _, deadline in due:
+        deadline.pause()
+    for idx, art, deadline, _ in batch:
+        deadline.resume()
+        if with_screenshot and not (incremental and _has_screenshot(art)):
+            _attach_screenshot(art, idx, date_str, deadline)
+        art["enrich_fp"] = input_fingerprint(art)
+
+
+def _iter_enrich(
+    articles: Iterable[dict],
+    *,
+    with_screenshot: bool,
+    article_budget: float | None,
+    incremental: bool,
+    bodies: Iterator[str] | None = None,
+) -> Iterator[dict]:
+    """Enrich ``articles`` in batches of ``LLM_BATCH_SIZE`` and yield them."""
+    date_str = datetime.now().strftime("%Y%m%d") if with_screenshot else ""
+    batch: list[tuple[int, dict, Deadline, bool]] = []
     for idx, art in enumerate(articles, 1):
-        body = extract_main_text(art["link"])
-        body = clean_text(body)
-        art["body"] = body
-        summary_src = body or art.get("summary") or art["title"]
-        summary_src = clean_text(summary_src)
-        script = llm_summarize(summary_src)
-        normalized = normalize_script(script)
-        if len(re.findall(r"[A-Za-z\uAC00-\uD7A3]", normalized)) < 5:
-            _LOG.warning("Suspicious script for %s: %r", art.get("link"), normalized)
-            normalized = normalize_script(art.get("title", ""))
-        elif normalized != script:
-            _LOG.warning("Suspicious script for %s: %r", art.get("link"), script)
-        art["script"] = normalized
-
-        if with_screenshot:
-            fname = f"{date_str}_{idx:03d}_{slugify(art.get('title', '') or '')}.png"
-            path = SCREENS_DIR / fname
-            try:
-                SCREENS_DIR.mkdir(parents=True, exist_ok=True)
-            except PermissionError:
-                run_as_sudo(["mkdir", "-p", str(SCREENS_DIR)])
-
-            try:
-                capture(art["link"], path)
-                art["screenshot"] = f"screens/{fname}"
-            except Exception as e:
-                _LOG.warning("스크린샷 실패: %s (%s)", art.get("title"), e)
+        deadline, need_script = _prepare_article(
+            art, article_budget=article_budget, incremental=incremental, bodies=bodies
+        )
+        batch.append((idx, art, deadline, need_script))
+        if len(batch) >= LLM_BATCH_SIZE:
+            _finish_articles(batch, date_str, with_screenshot=with_screenshot, incremental=incremental)
+            yield from (art for _, art, _, _ in batch)
+            batch = []
+    if batch:
+        _finish_articles(batch, date_str, with_screenshot=with_screenshot, incremental=incremental)
+        yield from (art for _, art, _, _ in batch)
+    _report_fetch_stats()
+    _report_cache_stats()
+    _report_model_stats()
+
+
+def iter_enrich_articles(
+    articles: Iterable[dict],
+    *,
+    with_screenshot: bool = False,
+    article_budget: float | None = ARTICLE_BUDGET,
+    incremental: bool = False,
+) -> Iterator[dict]:
+    """Yield each article of ``articles`` as soon as it is enriched.
+
+    Works like :func:`enrich_articles` but reads ``articles`` lazily, so a
+    stream such as :func:`article_io.iter_articles` is processed with only
+    one summarization batch (``LLM_BATCH_SIZE`` articles) in memory at a time.
+    """
+    return _iter_enrich(
+        articles,
+        with_screenshot=with_screenshot,
+        article_budget=article_budget,
+        incremental=incremental,
+    )
+
+
+def enrich_articles(
+    articles: list[dict],
+    *,
+    with_screenshot: bool = False,
+    parallel: bool = False,
+    article_budget: float | None = ARTICLE_BUDGET,
+    incremental: bool = False,
+) -> list[dict]:
+    """Attach body text, summary script, and optionally a screenshot.
+
+    Every article records an ``enrich_fp`` fingerprint of its link, title and
+    summary. With ``incremental=True`` only missing results, and results of
+    articles whose fingerprint no longer matches, are computed again; a new
+    body always brings a new script.
+
+    Each article may spend at most ``article_budget`` seconds (``None`` for
+    no limit) on download, extraction, summary and screenshot. Stages that
+    would start after that are skipped, leaving an empty body and the RSS
+    summary or title as the script, so one slow site cannot stall the run.
+
+    Once their bodies are extracted, ``LLM_BATCH_SIZE`` articles at a time
+    are summarized in one batched model call (:func:`llm_summarize_batch`).
+    Time an article spends waiting for the rest of its batch does not count
+    against its budget.
+
+    With ``parallel=True`` all bodies are extracted up front by
+    :func:`extract_main_texts`, which downloads on a thread pool and parses
+    on a process pool sized to the CPU cores. The budget then applies to
+    extraction and to summary plus screenshot separately.
+    """
+    options = dict(
+        with_screenshot=with_screenshot,
+        article_budget=article_budget,
+        incremental=incremental,
+    )
+    if not parallel:
+        return list(iter_enrich_articles(articles, **options))
+
+    need_body = [_needs_body(a, incremental) for a in articles]
+    if incremental:
+        _LOG.info("본문 추출 대상 %d/%d건", sum(need_body), len(articles))
+    bodies = iter(extract_main_texts(
+        [a["link"] for a, nb in zip(articles, need_body) if nb],
+        article_budget=article_budget,
+    ))
+    return list(_iter_enrich(articles, bodies=bodies, **options))
+
+
+async def enrich_articles_async(
+    articles: list[dict],
+    *,
+    with_screenshot: bool = False,
+    concurrency: int = MAX_CONNECTIONS,
+    http2: bool = True,
+    executor=None,
+    article_budget: float | None = ARTICLE_BUDGET,
+) -> list[dict]:
+    """Async variant of :func:`enrich_articles`.
+
+    Up to ``concurrency`` article pages are fetched at once over one pooled
+    HTTP client on the running event loop. Parsing, batched summarization
+    and screenshots are handed to ``executor`` (the loop's default thread pool
+    when ``None``) so they never block other fetches. As with
+    ``enrich_articles(parallel=True)``, ``article_budget`` applies to the
+    fetch and to the summary/screenshot stage separately.
+    """
+    date_str = datetime.now().strftime("%Y%m%d") if with_screenshot else ""
+    loop = asyncio.get_running_loop()
+    sem = asyncio.Semaphore(concurrency)
+
+    async with create_client(http2=http2, max_connections=concurrency) as client:
+
+        async def fetch(art: dict) -> str:
+            async with sem:
+                return await extract_main_text_async(
+                    art["link"], client, executor=executor,
+                    deadline=Deadline(article_budget),
+                )
+
+        bodies = await asyncio.gather(*(fetch(art) for art in articles))
+
+    batch = []
+    for idx, (art, body) in enumerate(zip(articles, bodies), 1):
+        art["body"] = clean_text(body)
+        deadline = Deadline(article_budget)
+        deadline.pause()
+        batch.append((idx, art, deadline, True))
+    # the summarization model is shared, so batches are built one by one
+    for start in range(0, len(batch), LLM_BATCH_SIZE):
+        await loop.run_in_executor(
+            executor,
+            functools.partial(
+                _finish_articles,
+                batch[start : start + LLM_BATCH_SIZE],
+                date_str,
+                with_screenshot=with_screenshot,
+                incremental=False,
+            ),
+        )
+    _report_fetch_stats()
+    _report_cache_stats()
+    _report_model_stats()
     return articles
 
 
@@ -79,26 +422,28 @@ def sort_articles(articles: list[dict]) -> list[dict]:
     return sorted(articles, key=lambda x: x.get("pubDateISO", ""), reverse=True)
 
 
-def save_articles(articles: list[dict], directory: Path = RAW_DIR) -> Path:
-    """Save ``articles`` as JSON and aggregate bodies into one ``.txt`` file."""
+def save_articles(articles: Iterable[dict], directory: Path = RAW_DIR) -> Path:
+    """Save ``articles`` as JSON and aggregate bodies into one ``.txt`` file.
+
+    ``articles`` may be a generator such as :func:`iter_enrich_articles`;
+    each article is written to both files as soon as it arrives.
+    """
 
     ts = dt.datetime.now().strftime("%Y%m%d_%H%M%S")
     directory.mkdir(exist_ok=True)
 
     json_path = directory / f"articles_{ts}.json"
     txt_path = directory / f"articles_{ts}.txt"
-    simple: list[dict] = []
 
-    with txt_path.open("w", encoding="utf-8") as tf:
+    with txt_path.open("w", encoding="utf-8") as tf, open_writer(json_path, jsonl=False) as out:
         for idx, art in enumerate(articles, 1):
             title = art.get("title", "")
             link = art.get("link", "")
             body = art.get("body", "")
             tf.write(f"[{idx}] {title}\n\n{body}\n\n")
-            simple.append({"title": title, "link": link})
+            out.write({"title": title, "link": link})
 
-    json_path.write_text(json.dumps(simple, ensure_ascii=False, indent=2))
-    _LOG.info("총 %d건 저장 → %s", len(articles), json_path)
+    _LOG.info("총 %d건 저장 → %s", out.count, json_path)
     try:
         with json_path.open() as f:
             json.load(f)
@@ -112,6 +457,7 @@ def run(
     max_total: int | None = None,
     *,
     with_screenshot: bool = True,
+    parallel: bool = False,
 ) -> Path:
     """Execute the full pipeline and return the output file path.
     Article bodies and summaries are always generated. Screenshots are
@@ -126,13 +472,54 @@ def run(
         If set, limit the total number of articles after filtering.
     with_screenshot : bool, optional
         Capture and embed screenshots in the result. Enabled by default.
+    parallel : bool, optional
+        Extract article bodies on all CPU cores (see :func:`enrich_articles`).
+
+    The summarization model starts loading in the background right away, so
+    its load time overlaps with collection instead of following it. With
+    ``SUMMARY_WORKERS`` > 1 the summary worker pool is forked first instead,
+    while no other thread is running.
     """
     _LOG.info("파이프라인 시작")
+    reset_skip_stats()
+    if get_pool() is None:
+        warm_up()
     arts = collect_articles(days=days, max_naver=max_naver, max_total=max_total)
     arts = deduplicate_fuzzy(arts, similarity_threshold=0.9)
     arts = sort_articles(arts)
-    arts = enrich_articles(arts, with_screenshot=bool(with_screenshot))
+    arts = enrich_articles(arts, with_screenshot=bool(with_screenshot), parallel=parallel)
     return save_articles(arts)
 
+
+async def run_async(
+    days: int = 1,
+    max_naver: int = collector._MAX_NAVER_ARTICLES,
+    max_total: int | None = None,
+    *,
+    with_screenshot: bool = True,
+    concurrency: int = MAX_CONNECTIONS,
+) -> Path:
+    """Async variant of :func:`run` for embedding in an event loop.
+
+    Collection and saving run in the default executor; enrichment uses
+    :func:`enrich_articles_async` with up to ``concurrency`` parallel fetches.
+    As in :func:`run`, the summary worker pool is forked or the
+    summarization model loads in the background before any executor starts.
+    """
+    _LOG.info("파이프라인 시작 (async)")
+    reset_skip_stats()
+    if get_pool() is None:
+        warm_up()
+    loop = asyncio.get_running_loop()
+    arts = await loop.run_in_executor(
+        None, lambda: collect_articles(days=days, max_naver=max_naver, max_total=max_total)
+    )
+    arts = deduplicate_fuzzy(arts, similarity_threshold=0.9)
+    arts = sort_articles(arts)
+    arts = await enrich_articles_async(
+        arts, with_screenshot=bool(with_screenshot), concurrency=concurrency
+    )
+    return await loop.run_in_executor(None, save_articles, arts)
+
 if __name__ == "__main__":
     run()
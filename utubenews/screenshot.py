@@ -12,8 +12,12 @@ def capture(
     *,
     width: int = 1280,
     height: int = 720,
+    timeout: float | None = None,
 ) -> None:
-    """Capture the given URL using Chrome/Chromium and save it as a PNG."""
+    """Capture the given URL using Chrome/Chromium and save it as a PNG.
+
+    ``timeout`` limits how many seconds the page may take to load.
+    """
     _LOG = logging.getLogger(__name__)
     # install the appropriate chromedriver for the current platform
     chromedriver_autoinstaller.install()
@@ -35,6 +39,8 @@ def capture(
 
     try:
         driver.set_window_size(width, height)
+        if timeout is not None:
+            driver.set_page_load_timeout(timeout)
         driver.get(url)
 
         try:
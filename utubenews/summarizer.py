@@ -2,120 +2,357 @@
 
 from __future__ import annotations
 
+import math
+import os
 import re
 import textwrap
-from typing import Optional, List
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional, List
 import logging
 
-from .text_utils import clean_text
+from . import extractive, summary_server
+from .disk_cache import cache_dir, get_cache, make_key
+from .model_registry import ModelRegistry
+from .text_utils import clean_text, detect_language
+from .translation import MAX_TRANSLATE_CHARS, chunk_text, get_engine
 
 _LOG = logging.getLogger(__name__)
 
-# cache for the transformers summarization pipeline
-_PIPELINE = None
+# model replicas kept for threads summarizing at the same time
+SUMMARY_REPLICAS = int(os.getenv("SUMMARY_REPLICAS", "1"))
+
+# summarization model; both are part of the summary cache key
+MODEL_NAME = "sshleifer/distilbart-cnn-12-6"
+MODEL_REVISION = "a4f8f3e"
+
+# how the model runs: PyTorch ("torch") or ONNX Runtime ("onnx", or
+# "onnx-int8" with int8-quantized weights)
+SUMMARY_BACKENDS = ("torch", "onnx", "onnx-int8")
+SUMMARY_BACKEND = os.getenv("SUMMARY_BACKEND", "torch").strip().lower()
 
 # safety limit for model input tokens (DistilBART is 1024)
 MAX_LLM_INPUT_TOKENS = 1024
 
-# maximum characters allowed in a single translation request
-MAX_TRANSLATE_CHARS = 5000
-
+# texts handed to the summarization model per call by llm_summarize_batch
+LLM_BATCH_SIZE = int(os.getenv("LLM_BATCH_SIZE", "8"))
 
-def _chunk_text(text: str) -> List[str]:
-    """Split ``text`` into <= ``MAX_TRANSLATE_CHARS`` sized chunks."""
-    if len(text) <= MAX_TRANSLATE_CHARS:
-        return [text]
+# language the summarization model was trained on; texts detected as
+# another language are summarized extractively instead
+MODEL_LANGUAGE = "en"
+# share of Hangul letters from which a text counts as Korean
+HANGUL_RATIO_THRESHOLD = float(os.getenv("HANGUL_RATIO_THRESHOLD", "0.3"))
 
-    parts: List[str] = []
-    current = ""
-    for line in text.splitlines(keepends=True):
-        if len(current) + len(line) > MAX_TRANSLATE_CHARS and current:
-            parts.append(current)
-            current = line
-        else:
-            current += line
-    if current:
-        parts.append(current)
+# texts longer than this many tokens are summarized chunk by chunk and the
+# chunk summaries summarized again; 0 always truncates to the model input
+MAP_REDUCE_MIN_TOKENS = int(os.getenv("MAP_REDUCE_MIN_TOKENS", str(MAX_LLM_INPUT_TOKENS)))
 
-    # Fallback in case a single line is extremely long
-    result: List[str] = []
-    for part in parts:
-        if len(part) <= MAX_TRANSLATE_CHARS:
-            result.append(part)
-        else:
-            for i in range(0, len(part), MAX_TRANSLATE_CHARS):
-                result.append(part[i : i + MAX_TRANSLATE_CHARS])
-    return result
+_SENTENCE_PAT = re.compile(r"(?<=[.!?。])\s+|\n+")
 
 
 def translate_text(text: str, target_lang: str) -> str:
     """Translate ``text`` into ``target_lang`` if possible.
 
-    This uses :mod:`googletrans` or :mod:`deep_translator` if available.
-    If translation fails for any reason, the original ``text`` is returned.
+    This uses :mod:`googletrans` or :mod:`deep_translator` if available,
+    through the shared :class:`~utubenews.translation.TranslationEngine`.
+    Chunks that cannot be translated are kept in the original language.
     """
+    parts = chunk_text(text, MAX_TRANSLATE_CHARS)
+    return "".join(get_engine().translate_chunks(parts, target_lang))
 
-    parts = _chunk_text(text)
 
-    gt = None
-    dt = None
-    try:  # pragma: no cover - optional dependency
-        from googletrans import Translator  # type: ignore
+BULLET = "\u2022"
 
-        gt = Translator()
-    except Exception as exc:
-        _LOG.warning("googletrans unavailable: %s", exc)
 
-    if gt is None:
-        try:  # pragma: no cover - optional dependency
-            from deep_translator import GoogleTranslator  # type: ignore
+def simple_summary(text: str, max_sent: int = 3) -> str:
+    """Return the ``max_sent`` longest sentences from ``text``."""
 
-            dt = GoogleTranslator(source="auto", target=target_lang)
-        except Exception as exc:
-            _LOG.warning(
-                "deep_translator failed to translate to %s: %s", target_lang, exc
+    sentences = re.split(r"(?<=[.!?])\s+", text)
+    sentences = sorted(sentences, key=len, reverse=True)[:max_sent]
+    return " ".join(sentences)
+
+
+_WORD_PAT = re.compile(r"[A-Za-z가-힣]+")
+
+
+def textrank_summary(
+    text: str, max_sent: int = 3, *, damping: float = 0.85, iterations: int = 30
+) -> str:
+    """Return the ``max_sent`` most central sentences of ``text`` in order.
+
+    Sentences are ranked with TextRank: each is a node linked to the others
+    by word overlap normalized by the log of both sentence lengths, and the
+    scores are found by power iteration. Ties keep the earlier sentence.
+    With NumPy installed the vectorized :func:`extractive.textrank_summary`
+    does the work.
+    """
+    if extractive.np is not None:
+        return extractive.textrank_summary(
+            text, max_sent, damping=damping, iterations=iterations
+        )
+    return _textrank_summary_py(text, max_sent, damping=damping, iterations=iterations)
+
+
+def _textrank_summary_py(
+    text: str, max_sent: int = 3, *, damping: float = 0.85, iterations: int = 30
+) -> str:
+    sents = [s.strip() for s in _SENTENCE_PAT.split(text) if s.strip()]
+    if len(sents) <= max_sent:
+        return " ".join(sents)
+    words = [set(_WORD_PAT.findall(s.lower())) for s in sents]
+    n = len(sents)
+    weights = [[0.0] * n for _ in range(n)]
+    for i in range(n):
+        for j in range(i + 1, n):
+            norm = math.log(len(words[i]) + 1) + math.log(len(words[j]) + 1)
+            overlap = len(words[i] & words[j])
+            if overlap and norm:
+                weights[i][j] = weights[j][i] = overlap / norm
+    totals = [sum(row) for row in weights]
+    scores = [1.0] * n
+    for _ in range(iterations):
+        scores = [
+            (1 - damping)
+            + damping * sum(weights[j][i] / totals[j] * scores[j] for j in range(n) if weights[j][i])
+            for i in range(n)
+        ]
+    # rounded so summation order cannot decide between equal ranks
+    scores = [round(score, extractive._SCORE_DIGITS) for score in scores]
+    top = sorted(range(n), key=lambda i: (-scores[i], i))[:max_sent]
+    return " ".join(sents[i] for i in sorted(top))
+
+
+# summary tiers, cheapest first
+TIERS = ("passthrough", "quick", "textrank", "llm")
+# RSS summaries up to this many words are used as the script unchanged
+PASSTHROUGH_MAX_WORDS = int(os.getenv("PASSTHROUGH_MAX_WORDS", "60"))
+# expected model seconds per input chunk on this machine, for the router
+LLM_SECONDS_PER_CHUNK = float(os.getenv("LLM_SECONDS_PER_CHUNK", "3.0"))
+# below this many seconds even TextRank is skipped for quick_summarize
+TEXTRANK_MIN_SECONDS = 0.5
+# words per model input chunk, roughly MAX_LLM_INPUT_TOKENS tokens
+_WORDS_PER_CHUNK = 700
+
+
+def choose_tier(
+    text: str,
+    *,
+    is_body: bool = True,
+    time_left: float | None = None,
+    queue_depth: int = 0,
+) -> str:
+    """Return the cheapest summary tier of :data:`TIERS` good enough for ``text``.
+
+    * ``passthrough`` – a short RSS summary (``is_body`` false), already concise
+    * ``llm`` – the model, when it reads the language and the ``queue_depth``
+      texts queued for it before this one still leave it ``time_left`` seconds
+    * ``textrank`` – extractive summary when the model is out of time or
+      does not read the language
+    * ``quick`` – :func:`quick_summarize` when under ``TEXTRANK_MIN_SECONDS``
+      remain
+
+    ``time_left`` of ``None`` means no time limit.
+    """
+    words = len(text.split())
+    if not is_body and words <= PASSTHROUGH_MAX_WORDS:
+        return "passthrough"
+    if time_left is not None and time_left < TEXTRANK_MIN_SECONDS:
+        return "quick"
+    if _model_language(text):
+        chunks = max(1, math.ceil(words / _WORDS_PER_CHUNK))
+        cost = LLM_SECONDS_PER_CHUNK * (queue_depth + chunks)
+        if time_left is None or cost <= time_left:
+            return "llm"
+    return "textrank"
+
+
+def summarize_tier(text: str, tier: str, max_tokens: int = 180) -> str:
+    """Summarize ``text`` with the given tier of :data:`TIERS`."""
+    if tier == "passthrough":
+        return text
+    if tier == "quick":
+        return _fallback_summary(text)
+    if tier == "textrank":
+        return textrank_summary(text)
+    if tier == "llm":
+        return llm_summarize(text, max_tokens)
+    raise ValueError(f"unknown summary tier: {tier!r}")
+
+
+def _with_backend(pipe, backend: str):
+    """Record on ``pipe`` which of ``SUMMARY_BACKENDS`` it runs on."""
+    try:
+        pipe.summary_backend = backend
+    except AttributeError:
+        pass
+    return pipe
+
+
+def _create_pipeline():
+    """Load the summarization pipeline of ``SUMMARY_BACKEND``.
+
+    Without :mod:`optimum` the ONNX backends fall back to PyTorch. The
+    backend actually loaded is kept as ``summary_backend`` on the pipeline.
+    """
+    if SUMMARY_BACKEND not in SUMMARY_BACKENDS:
+        _LOG.warning("unknown SUMMARY_BACKEND %r, using torch", SUMMARY_BACKEND)
+    elif SUMMARY_BACKEND != "torch":
+        from .onnx_backend import load_onnx_pipeline
+
+        try:
+            pipe = load_onnx_pipeline(
+                MODEL_NAME,
+                MODEL_REVISION,
+                quantize=SUMMARY_BACKEND == "onnx-int8",
+                cache_dir=cache_dir(),
             )
-            return text
+            return _with_backend(pipe, SUMMARY_BACKEND)
+        except RuntimeError as exc:
+            _LOG.warning("%s backend failed, using torch: %s", SUMMARY_BACKEND, exc)
 
-    translated_parts = []
-    for idx, part in enumerate(parts):
-        translated = None
-        if gt is not None:
-            try:
-                translated = gt.translate(part, dest=target_lang).text
-            except Exception as exc:  # pragma: no cover - log only
-                _LOG.warning("googletrans failed for chunk %d: %s", idx, exc)
-        if translated is None and dt is None:
-            try:  # pragma: no cover - optional dependency
-                from deep_translator import GoogleTranslator  # type: ignore
-
-                dt = GoogleTranslator(source="auto", target=target_lang)
-            except Exception as exc:
-                _LOG.warning(
-                    "deep_translator failed to translate to %s: %s", target_lang, exc
-                )
-        if translated is None and dt is not None:
-            try:
-                translated = dt.translate(part)
-            except Exception as exc:  # pragma: no cover - log only
-                _LOG.warning("deep_translator failed for chunk %d: %s", idx, exc)
+    from transformers import pipeline  # type: ignore
 
-        translated_parts.append(translated if translated is not None else part)
+    try:
+        pipe = pipeline("summarization", model=MODEL_NAME, revision=MODEL_REVISION)
+    except TypeError:
+        # older or stub pipelines may not accept these kwargs
+        pipe = pipeline("summarization")
+    return _with_backend(pipe, "torch")
 
-    return "".join(translated_parts)
 
-BULLET = "\u2022"
+def _active_backend() -> str:
+    """Return the backend of the loaded pipeline, or the configured one before loading."""
+    backend = getattr(_REGISTRY.primary, "summary_backend", None)
+    if backend is not None:
+        return backend
+    return SUMMARY_BACKEND if SUMMARY_BACKEND in SUMMARY_BACKENDS else "torch"
 
 
-def simple_summary(text: str, max_sent: int = 3) -> str:
-    """Return the ``max_sent`` longest sentences from ``text``."""
+# loaded pipelines; up to SUMMARY_REPLICAS generate concurrently
+_REGISTRY = ModelRegistry(_create_pipeline, SUMMARY_REPLICAS)
 
-    sentences = re.split(r"(?<=[.!?])\s+", text)
-    sentences = sorted(sentences, key=len, reverse=True)[:max_sent]
-    return " ".join(sentences)
 
+def _load_pipeline():
+    """Return the summarization pipeline, loading it on first use.
+
+    Callers arriving while another thread loads the model wait for that
+    load instead of starting their own.
+    """
+    return _REGISTRY.get()
+
+
+def set_pipeline(pipe) -> None:
+    """Summarize with ``pipe`` from now on, or with the configured model if ``None``.
+
+    ``pipe`` replaces every loaded replica and no further replicas are made
+    from it; ``None`` drops them so the next use loads ``MODEL_NAME`` again.
+    Meant for tests and benchmarks, not while summaries are running.
+    """
+    if pipe is None:
+        _REGISTRY.reset()
+    else:
+        _REGISTRY.adopt(pipe)
+
+
+@contextmanager
+def _leased_pipeline() -> Iterator[object]:
+    """Borrow a summarization pipeline for one generation."""
+    with _REGISTRY.lease() as replica:
+        yield replica
+
+
+def model_stats() -> dict:
+    """Return load time, memory and utilization of the loaded model replicas."""
+    return _REGISTRY.stats()
+
+
+def warm_up() -> threading.Thread:
+    """Start loading the summarization model in a background thread.
+
+    The first :func:`llm_summarize` call then only waits for the part of
+    the load that is still running. Failures are logged and left to that
+    call, which falls back to :func:`quick_summarize` as usual. Nothing is
+    loaded while a summarization server (:mod:`summary_server`) answers.
+    """
+
+    def load() -> None:
+        try:
+            if summary_server.server_available():
+                return
+            _load_pipeline()
+        except Exception as exc:
+            _LOG.info("model warm-up failed: %s", exc)
+
+    thread = threading.Thread(target=load, name="summarizer-warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+def _prepare_input(pipe, text: str) -> tuple[str, int]:
+    """Return ``text`` cut to the model's input limit and its token count.
+
+    Pipelines without a tokenizer are limited and measured in words.
+    """
+    if hasattr(pipe, "tokenizer"):
+        tokenizer = pipe.tokenizer
+        max_in = getattr(tokenizer, "model_max_length", MAX_LLM_INPUT_TOKENS)
+        input_ids = tokenizer.encode(text, max_length=max_in, truncation=True)
+        return tokenizer.decode(input_ids, skip_special_tokens=True), len(input_ids)
+    words = text.split()
+    if len(words) > MAX_LLM_INPUT_TOKENS:
+        words = words[:MAX_LLM_INPUT_TOKENS]
+        text = " ".join(words)
+    return text, len(words)
+
+
+def _output_text(result) -> str | None:
+    """Return the generated text of one pipeline result."""
+    data = result[0] if isinstance(result, list) else result
+    if isinstance(data, dict):
+        out = data.get("summary_text") or data.get("generated_text")
+    else:
+        out = str(data)
+    return out.strip() if out else None
+
+
+def _summary_key(text: str, max_tokens: int) -> str:
+    # summaries differ slightly between backends; an ONNX backend that
+    # failed to load must not file torch output under its name
+    return make_key(text, MODEL_NAME, MODEL_REVISION, _active_backend(), max_tokens)
+
+
+def _store_summary(cache, key: str, out: str, started: float, max_time: float | None) -> None:
+    """Cache ``out`` unless ``max_time`` may have cut the generation short."""
+    if cache is not None and (max_time is None or time.monotonic() - started < max_time):
+        cache.put(key, out)
+
+
+def _model_language(text: str) -> bool:
+    """Return ``True`` if ``text`` is in the language the model summarizes.
+
+    DistilBART only knows English: Korean input costs the same model time
+    and comes back as garbage that the pipeline then discards.
+    """
+    return detect_language(text, HANGUL_RATIO_THRESHOLD) == MODEL_LANGUAGE
 
-def llm_summarize(text: str, max_tokens: int = 180) -> str:
+
+def _fallback_summary(text: str) -> str:
+    """Return :func:`quick_summarize` of ``text``, cached like model output."""
+    from .article_extractor import quick_summarize
+
+    cache = get_cache()
+    if cache is None:
+        return quick_summarize(text)
+    key = make_key(text, "quick_summarize")
+    out = cache.get(key)
+    if out is None:
+        out = quick_summarize(text)
+        cache.put(key, out)
+    return out
+
+
+def llm_summarize(text: str, max_tokens: int = 180, *, max_time: float | None = None) -> str:
     """Summarize ``text`` using a local language model if available.
 
     The function attempts to load :func:`transformers.pipeline` with the
@@ -123,63 +360,469 @@ def llm_summarize(text: str, max_tokens: int = 180) -> str:
     falls back to :func:`quick_summarize` for a simple heuristic summary. The
     default ``max_tokens`` value is large enough to keep most of the original
     content so the result reads more like a cleaned version than a short
-    abstract.
+    abstract. ``max_time`` caps the generation time in seconds; the model
+    then returns what it has generated so far. Texts too long for the model
+    are summarized by map-reduce (see :func:`llm_summarize_batch`).
+
+    Texts not in ``MODEL_LANGUAGE`` (Korean articles) never reach the model
+    and get the :func:`quick_summarize` summary right away.
+
+    Results are kept in the summary cache (:mod:`disk_cache`), which is
+    consulted before the model is loaded. When a summarization server is
+    running (:mod:`summary_server`) the text is summarized there instead.
     """
 
     if not text or not text.strip():
         return ""
+    if not _model_language(text):
+        return _fallback_summary(text)
+
+    cache = get_cache()
+    key = _summary_key(text, max_tokens)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    remote = summary_server.request_summaries([text], max_tokens, max_time)
+    if remote is not None and remote[0]:
+        return remote[0]
 
-    global _PIPELINE
     try:  # pragma: no cover - optional heavy dependency
-        from transformers import pipeline  # type: ignore
+        with _leased_pipeline() as pipe:
+            # the pipeline may have just been loaded on another backend
+            key = _summary_key(text, max_tokens)
+            token_path = _uses_token_ids(pipe) or _needs_map_reduce(pipe, text)
+            if not token_path:
+                text, _ = _prepare_input(pipe, text)
+                words = text.split()
+                max_length = min(max_tokens, len(words) + 5)
+                min_length = min(len(words), max_length)
+                gen_kwargs = {"max_time": max_time} if max_time is not None else {}
+                started = time.monotonic()
+                result = pipe(
+                    text,
+                    max_length=max_length,
+                    min_length=min_length,
+                    do_sample=False,
+                    truncation=True,
+                    **gen_kwargs,
+                )
+        if token_path:
+            results = [""]
+            _summarize_uncached([text], {0: key}, results, max_tokens, LLM_BATCH_SIZE, max_time)
+            return results[0]
+        out = _output_text(result)
+        if out:
+            _store_summary(cache, key, out, started, max_time)
+            return out
+    except Exception as exc:
+        _LOG.warning("llm_summarize failed: %s", exc)
+
+    return _fallback_summary(text)
+
+
+def llm_summarize_batch(
+    texts: List[str],
+    max_tokens: int = 180,
+    *,
+    batch_size: int = LLM_BATCH_SIZE,
+    max_time: float | None = None,
+) -> List[str]:
+    """Summarize every text in ``texts`` and return the results in order.
+
+    Works like :func:`llm_summarize` but hands the model ``batch_size``
+    texts per call. Inputs are sorted by token count first so each batch
+    holds texts of similar length and little padding is computed; the
+    length limits of a batch follow its shortest and longest member.
+    ``max_time`` caps the generation time of each batch. Blank texts give
+    ``""``; texts the model fails on or cannot read (see
+    :func:`llm_summarize`) fall back to :func:`quick_summarize`.
+    Only texts missing from the summary cache reach the model.
+
+    Texts over ``MAP_REDUCE_MIN_TOKENS`` tokens are not truncated but split
+    into sentence-aligned chunks that fit the model input (map-reduce). The
+    chunks of all texts are summarized in the same batches as the short
+    texts, then the joined chunk summaries of each long text are summarized
+    once more. Like :func:`llm_summarize` it uses a running summarization
+    server when there is one.
+    """
+
+    results = [""] * len(texts)
+    cache = get_cache()
+    keys = {}
+    for i, text in enumerate(texts):
+        if not text or not text.strip():
+            continue
+        if not _model_language(text):
+            results[i] = _fallback_summary(text)
+            continue
+        keys[i] = _summary_key(text, max_tokens)
+        cached = cache.get(keys[i]) if cache is not None else None
+        if cached is not None:
+            results[i] = cached
+            del keys[i]
+    if not keys:
+        return results
+
+    remote = summary_server.request_summaries([texts[i] for i in keys], max_tokens, max_time)
+    if remote is not None:
+        for i, out in zip(list(keys), remote):
+            if out:
+                results[i] = out
+                del keys[i]
+        if not keys:
+            return results
 
-        if _PIPELINE is None:
+    try:  # pragma: no cover - optional heavy dependency
+        _load_pipeline()
+    except Exception as exc:
+        _LOG.warning("llm_summarize failed: %s", exc)
+        for i in keys:
+            results[i] = _fallback_summary(texts[i])
+        return results
+
+    # the pipeline may have just been loaded on another backend
+    keys = {i: _summary_key(texts[i], max_tokens) for i in keys}
+    _summarize_uncached(texts, keys, results, max_tokens, batch_size, max_time)
+    return results
+
+
+def _summarize_uncached(
+    texts: List[str],
+    keys: dict[int, str],
+    results: List[str],
+    max_tokens: int,
+    batch_size: int,
+    max_time: float | None,
+) -> None:
+    """Summarize ``texts[i]`` for every ``i`` in ``keys`` into ``results[i]``.
+
+    Results are written to the summary cache under ``keys[i]``. A model
+    replica is leased for tokenizing and generating; the reduce step of
+    map-reduce runs after it is returned, as it leases one itself. Map and
+    reduce share ``max_time``; with none left the joined chunk summaries
+    are returned as they are.
+    """
+    cache = get_cache()
+    # (owner, model input, length); owner is i or (i, chunk number)
+    inputs = []
+    chunked: dict[int, list[str]] = {}
+    with _leased_pipeline() as pipe:
+        for i in keys:
             try:
-                _PIPELINE = pipeline(
-                    "summarization",
-                    model="sshleifer/distilbart-cnn-12-6",
-                    revision="a4f8f3e",
-                )
-            except TypeError:
-                # older or stub pipelines may not accept these kwargs
-                _PIPELINE = pipeline("summarization")
-
-        if hasattr(_PIPELINE, "tokenizer"):
-            tokenizer = _PIPELINE.tokenizer
-            max_in = getattr(tokenizer, "model_max_length", MAX_LLM_INPUT_TOKENS)
-            input_ids = tokenizer.encode(text, max_length=max_in, truncation=True)
-            text = tokenizer.decode(input_ids, skip_special_tokens=True)
-        else:
-            words = text.split()
-            if len(words) > MAX_LLM_INPUT_TOKENS:
-                text = " ".join(words[:MAX_LLM_INPUT_TOKENS])
-                words = words[:MAX_LLM_INPUT_TOKENS]
-        words = text.split()
-        max_length = min(max_tokens, len(words) + 5)
-        min_length = min(len(words), max_length)
-        result = _PIPELINE(
-            text,
-            max_length=max_length,
-            min_length=min_length,
-            do_sample=False,
-            truncation=True,
+                parts = _model_inputs(pipe, texts[i])
+            except Exception as exc:
+                _LOG.warning("llm_summarize failed: %s", exc)
+                results[i] = _fallback_summary(texts[i])
+                continue
+            if len(parts) > 1:
+                chunked[i] = []
+                inputs += [((i, j), *part) for j, part in enumerate(parts)]
+            else:
+                inputs.append((i, *parts[0]))
+
+        started = time.monotonic()
+        outputs = _generate(
+            pipe, [(payload, n) for _, payload, n in inputs], max_tokens, batch_size, max_time
         )
-        if isinstance(result, list):
-            data = result[0]
+        for (owner, payload, _), (out, complete) in zip(inputs, outputs):
+            if isinstance(owner, tuple):
+                chunked[owner[0]].append(out or _fallback_summary(_input_text(pipe, payload)))
+            elif out:
+                if complete and cache is not None:
+                    cache.put(keys[owner], out)
+                results[owner] = out
+            else:
+                results[owner] = _fallback_summary(_input_text(pipe, payload))
+
+    if chunked:
+        # reduce: summarize the joined chunk summaries of each long text
+        # within what the map step left of max_time
+        long_ids = list(chunked)
+        joined = [" ".join(chunked[i]) for i in long_ids]
+        remaining = None if max_time is None else max_time - (time.monotonic() - started)
+        if remaining is not None and remaining <= 0:
+            reduced = joined
         else:
-            data = result
-        if isinstance(data, dict):
-            out = data.get("summary_text") or data.get("generated_text")
+            reduced = llm_summarize_batch(
+                joined, max_tokens, batch_size=batch_size, max_time=remaining
+            )
+        for i, out in zip(long_ids, reduced):
+            results[i] = out
+            _store_summary(cache, keys[i], out, started, max_time)
+
+
+def _uses_token_ids(pipe) -> bool:
+    """Return ``True`` if ``pipe`` exposes the model and tokenizer it wraps.
+
+    Such pipelines are fed token ids directly, so every input is tokenized
+    once instead of being encoded, decoded and encoded again by the pipeline.
+    """
+    model = getattr(pipe, "model", None)
+    return hasattr(pipe, "tokenizer") and hasattr(model, "generate")
+
+
+def _input_limit(pipe) -> int:
+    tokenizer = getattr(pipe, "tokenizer", None)
+    max_in = MAX_LLM_INPUT_TOKENS
+    if tokenizer is not None:
+        max_in = min(max_in, getattr(tokenizer, "model_max_length", max_in))
+    return max_in
+
+
+def _chunk_limit(pipe) -> int:
+    # leave room for special tokens and for tokens that merge differently
+    # once sentences are joined
+    return max(1, int(_input_limit(pipe) * 0.9) - 2)
+
+
+def _model_inputs(pipe, text: str) -> List[tuple[object, int]]:
+    """Return the model inputs for ``text`` with their lengths.
+
+    One input for texts that fit the model (cut to its limit otherwise),
+    several for texts summarized by map-reduce. Inputs are token id lists
+    for pipelines exposing their model (:func:`_uses_token_ids`) and strings
+    for the rest.
+    """
+    if _uses_token_ids(pipe):
+        return _encode_input(pipe, text)
+    if _needs_map_reduce(pipe, text):
+        parts = _split_chunks(pipe, text)
+        if len(parts) > 1:
+            return [_prepare_input(pipe, part) for part in parts]
+    return [_prepare_input(pipe, text)]
+
+
+# tokenizer id -> special token ids placed before and after one sequence
+_SPECIAL_IDS: dict[int, tuple[List[int], List[int]]] = {}
+
+
+def _special_ids(tokenizer) -> tuple[List[int], List[int]]:
+    """Return the special token ids ``tokenizer`` wraps a sequence in.
+
+    Found once per tokenizer by comparing a probe encoded with and without
+    special tokens, which works for slow and fast tokenizers alike.
+    """
+    key = id(tokenizer)
+    if key not in _SPECIAL_IDS:
+        full = list(tokenizer("a", add_special_tokens=True)["input_ids"])
+        plain = list(tokenizer("a", add_special_tokens=False)["input_ids"])
+        _SPECIAL_IDS[key] = ([], [])
+        for k in range(len(full) - len(plain) + 1):
+            if full[k : k + len(plain)] == plain:
+                _SPECIAL_IDS[key] = (full[:k], full[k + len(plain) :])
+                break
+    return _SPECIAL_IDS[key]
+
+
+def _model_prefix(pipe) -> str:
+    """Return the text the model expects before every input (e.g. for T5)."""
+    return getattr(getattr(pipe.model, "config", None), "prefix", None) or ""
+
+
+def _encode_chunk(pipe, text: str) -> tuple[List[int], int]:
+    """Return the model input ids of one chunk and their count.
+
+    The chunk gets the model prefix, is cut to the input limit and wrapped
+    in the tokenizer's special tokens; it is never split further.
+    """
+    tokenizer = pipe.tokenizer
+    ids = list(tokenizer(_model_prefix(pipe) + text, add_special_tokens=False)["input_ids"])
+    head, tail = _special_ids(tokenizer)
+    ids = head + ids[: _input_limit(pipe) - len(head) - len(tail)] + tail
+    return ids, len(ids)
+
+
+def _encode_input(pipe, text: str) -> List[tuple[List[int], int]]:
+    """Tokenize ``text`` once and return model-ready id lists.
+
+    Long texts are split into sentence-aligned chunks using the character
+    offsets of the same tokenization. Tokenizers without offset support
+    fall back to :func:`_split_chunks`.
+    """
+    tokenizer = pipe.tokenizer
+    raw = text
+    text = _model_prefix(pipe) + raw
+    try:
+        enc = tokenizer(text, add_special_tokens=False, return_offsets_mapping=True)
+        offsets = enc["offset_mapping"]
+    except (NotImplementedError, KeyError, TypeError, ValueError):  # slow tokenizers
+        enc = tokenizer(text, add_special_tokens=False)
+        offsets = None
+    ids = list(enc["input_ids"])
+    head, tail = _special_ids(tokenizer)
+
+    if not (0 < MAP_REDUCE_MIN_TOKENS < len(ids)):
+        ids = head + ids[: _input_limit(pipe) - len(head) - len(tail)] + tail
+        return [(ids, len(ids))]
+    if offsets is None:
+        return [_encode_chunk(pipe, part) for part in _split_chunks(pipe, raw)]
+
+    # token ranges of the sentences, found from where each token starts
+    starts = [m.start() for m in _SENTENCE_PAT.finditer(text)]
+    bounds = [0]
+    sentence = 0
+    for k, (begin, _) in enumerate(offsets):
+        while sentence < len(starts) and begin >= starts[sentence]:
+            sentence += 1
+            if bounds[-1] != k:
+                bounds.append(k)
+    bounds.append(len(ids))
+
+    chunk_limit = _chunk_limit(pipe)
+    result = []
+    first = 0
+    for a, b in zip(bounds, bounds[1:]):
+        if b - first <= chunk_limit:
+            continue
+        if a > first:
+            result.append(ids[first:a])
+            first = a
+        # a single sentence longer than a chunk is cut on token boundaries
+        while b - first > chunk_limit:
+            result.append(ids[first : first + chunk_limit])
+            first += chunk_limit
+    if first < len(ids):
+        result.append(ids[first:])
+    chunks = [head + part + tail for part in result]
+    return [(part, len(part)) for part in chunks]
+
+
+def _input_text(pipe, payload) -> str:
+    """Return the text of a model input, for fallbacks."""
+    if isinstance(payload, str):
+        return payload
+    return pipe.tokenizer.decode(payload, skip_special_tokens=True)
+
+
+def _needs_map_reduce(pipe, text: str) -> bool:
+    """Return ``True`` if ``text`` is long enough for map-reduce summarization."""
+    if MAP_REDUCE_MIN_TOKENS <= 0:
+        return False
+    tokenizer = getattr(pipe, "tokenizer", None)
+    if tokenizer is None:
+        return len(text.split()) > MAP_REDUCE_MIN_TOKENS
+    return len(tokenizer.encode(text, add_special_tokens=False)) > MAP_REDUCE_MIN_TOKENS
+
+
+def _split_chunks(pipe, text: str) -> List[str]:
+    """Split ``text`` into sentence-aligned chunks that fit the model input.
+
+    Sentences are packed greedily; a single sentence longer than a chunk is
+    cut on token boundaries. Pipelines without a tokenizer count words.
+    """
+    tokenizer = getattr(pipe, "tokenizer", None)
+    limit = _chunk_limit(pipe)
+
+    def encode(sent: str) -> list:
+        if tokenizer is None:
+            return sent.split()
+        return tokenizer.encode(sent, add_special_tokens=False)
+
+    def decode(ids: list) -> str:
+        if tokenizer is None:
+            return " ".join(ids)
+        return tokenizer.decode(ids, skip_special_tokens=True)
+
+    result: List[str] = []
+    current: List[str] = []
+    size = 0
+    for sent in _SENTENCE_PAT.split(text):
+        sent = sent.strip()
+        if not sent:
+            continue
+        ids = encode(sent)
+        if len(ids) <= limit:
+            pieces = [(sent, len(ids))]
         else:
-            out = str(data)
-        if out:
-            return out.strip()
-    except Exception as exc:
-        _LOG.warning("llm_summarize failed: %s", exc)
+            pieces = [
+                (decode(ids[j : j + limit]), len(ids[j : j + limit]))
+                for j in range(0, len(ids), limit)
+            ]
+        for piece, n in pieces:
+            if current and size + n > limit:
+                result.append(" ".join(current))
+                current, size = [], 0
+            current.append(piece)
+            size += n
+    if current:
+        result.append(" ".join(current))
+    return result
 
-    from .article_extractor import quick_summarize
 
-    return quick_summarize(text)
+def _generate(
+    pipe,
+    inputs: List[tuple[object, int]],
+    max_tokens: int,
+    batch_size: int,
+    max_time: float | None,
+) -> List[tuple[str | None, bool]]:
+    """Run ``(model input, length)`` pairs through ``pipe`` in sorted batches.
+
+    Returns ``(summary, complete)`` per input in input order. ``summary`` is
+    ``None`` where the model failed; ``complete`` is ``False`` when
+    ``max_time`` may have cut the generation short.
+    """
+    outputs: List[tuple[str | None, bool]] = [(None, False)] * len(inputs)
+    order = sorted(range(len(inputs)), key=lambda k: inputs[k][1])
+    gen_kwargs = {"max_time": max_time} if max_time is not None else {}
+    size = max(1, batch_size)
+
+    for start in range(0, len(order), size):
+        batch = order[start : start + size]
+        payloads = [inputs[k][0] for k in batch]
+        # token counts for id inputs; strings are measured in words
+        lengths = [
+            inputs[k][1] if isinstance(p, list) else len(p.split())
+            for k, p in zip(batch, payloads)
+        ]
+        max_length = min(max_tokens, max(lengths) + 5)
+        min_length = min(min(lengths), max_length)
+        started = time.monotonic()
+        try:
+            if isinstance(payloads[0], list):
+                texts = _generate_from_ids(pipe, payloads, max_length, min_length, gen_kwargs)
+            else:
+                results = pipe(
+                    payloads,
+                    max_length=max_length,
+                    min_length=min_length,
+                    do_sample=False,
+                    truncation=True,
+                    batch_size=len(payloads),
+                    **gen_kwargs,
+                )
+                texts = [_output_text(result) for result in results]
+            if len(texts) != len(payloads):
+                raise ValueError(f"expected {len(payloads)} results, got {len(texts)}")
+        except Exception as exc:
+            _LOG.warning("llm_summarize failed: %s", exc)
+            continue
+        complete = max_time is None or time.monotonic() - started < max_time
+        for k, text in zip(batch, texts):
+            outputs[k] = (text, complete)
+    return outputs
+
+
+def _generate_from_ids(
+    pipe, id_lists: List[List[int]], max_length: int, min_length: int, gen_kwargs: dict
+) -> List[str | None]:
+    """Generate summaries for tokenized inputs with ``pipe.model`` directly."""
+    tokenizer, model = pipe.tokenizer, pipe.model
+    batch = tokenizer.pad({"input_ids": id_lists}, return_tensors="pt")
+    device = getattr(model, "device", None)
+    if device is not None:
+        batch = {name: tensor.to(device) for name, tensor in batch.items()}
+    output_ids = model.generate(
+        **batch,
+        max_length=max_length,
+        min_length=min_length,
+        do_sample=False,
+        **gen_kwargs,
+    )
+    texts = tokenizer.batch_decode(output_ids, skip_special_tokens=True)
+    return [text.strip() or None for text in texts]
 
 
 def normalize_script(text: str) -> str:
@@ -0,0 +1,132 @@
+"""Pre-fork process pool that spreads summarization over all CPU cores.
+
+A single PyTorch process leaves cores idle during the sequential parts of
+generation. :class:`SummaryPool` loads the model once in the parent and then
+forks ``workers`` processes, each limited to ``threads_per_worker`` torch
+threads. The children inherit the loaded weights and share them copy-on-write
+with the parent, so N workers cost little more memory than one.
+
+``SUMMARY_WORKERS`` (default ``0``, off) enables the pool for
+:func:`pipeline.enrich_articles`; ``SUMMARY_THREADS_PER_WORKER`` defaults to
+the CPU count divided by the worker count. Forking needs the ``fork`` start
+method, so the pool is only available on Linux and other Unix systems that
+provide it. A forked child keeps only the forking thread, with every lock
+other threads held at that moment stuck, so :func:`get_pool` creates the
+pool only while the process has a single thread; :func:`pipeline.run` and
+:func:`pipeline.run_async` call it before starting any.
+"""
+
+from __future__ import annotations
+
+import atexit
+import gc
+import logging
+import math
+import multiprocessing
+import os
+import threading
+from typing import List
+
+from . import summarizer, summary_server
+
+_LOG = logging.getLogger(__name__)
+
+SUMMARY_WORKERS = int(os.getenv("SUMMARY_WORKERS", "0"))
+SUMMARY_THREADS_PER_WORKER = int(os.getenv("SUMMARY_THREADS_PER_WORKER", "0"))
+
+
+def _init_worker(threads: int) -> None:
+    # summaries are produced here; never hand them to a summary server
+    summary_server._SERVING = True
+    try:
+        import torch  # type: ignore
+    except ImportError:
+        return
+    torch.set_num_threads(threads)
+
+
+def _summarize_slice(args: tuple) -> List[str]:
+    texts, max_tokens, max_time = args
+    return summarizer.llm_summarize_batch(texts, max_tokens, max_time=max_time)
+
+
+class SummaryPool:
+    """Forked worker processes sharing one loaded summarization model.
+
+    The model is loaded (not run) in the parent before forking: running it
+    first would start torch's OpenMP threads, which do not survive a fork.
+    Raises :class:`RuntimeError` where the ``fork`` start method is missing.
+    """
+
+    def __init__(self, workers: int, threads_per_worker: int = 0) -> None:
+        if "fork" not in multiprocessing.get_all_start_methods():
+            raise RuntimeError("fork start method unavailable")
+        self.workers = max(1, workers)
+        self.threads_per_worker = threads_per_worker or max(
+            1, (os.cpu_count() or 1) // self.workers
+        )
+        summarizer._load_pipeline()
+        # keep the children's refcount updates off the shared model pages
+        gc.freeze()
+        ctx = multiprocessing.get_context("fork")
+        self._pool = ctx.Pool(
+            self.workers, initializer=_init_worker, initargs=(self.threads_per_worker,)
+        )
+
+    def summarize(
+        self, texts: List[str], max_tokens: int = 180, *, max_time: float | None = None
+    ) -> List[str]:
+        """Summarize ``texts`` across the workers and return them in order.
+
+        Each worker gets a contiguous slice and summarizes it with
+        :func:`summarizer.llm_summarize_batch`.
+        """
+        if not texts:
+            return []
+        size = math.ceil(len(texts) / self.workers)
+        slices = [
+            (texts[i : i + size], max_tokens, max_time) for i in range(0, len(texts), size)
+        ]
+        results: List[str] = []
+        for part in self._pool.map(_summarize_slice, slices):
+            results.extend(part)
+        return results
+
+    def close(self) -> None:
+        self._pool.close()
+        self._pool.join()
+        gc.unfreeze()
+
+
+_POOL: SummaryPool | None = None
+_POOL_LOCK = threading.Lock()
+_POOL_FAILED = False
+
+
+def get_pool() -> SummaryPool | None:
+    """Return the shared pool, or ``None`` unless ``SUMMARY_WORKERS`` > 1.
+
+    The pool is created on the first call and closed at exit; that call
+    must come before the process starts other threads. When the pool cannot
+    be created a warning is logged once and summaries stay in-process.
+    """
+    global _POOL, _POOL_FAILED
+    if SUMMARY_WORKERS <= 1 or _POOL_FAILED:
+        return None
+    with _POOL_LOCK:
+        if _POOL is None and not _POOL_FAILED:
+            try:
+                if threading.active_count() > 1:
+                    raise RuntimeError("other threads are already running; fork is unsafe")
+                _POOL = SummaryPool(SUMMARY_WORKERS, SUMMARY_THREADS_PER_WORKER)
+            except Exception as exc:
+                _LOG.warning("summary worker pool unavailable: %s", exc)
+                _POOL_FAILED = True
+                return None
+            atexit.register(_POOL.close)
+            _LOG.info(
+                "summary worker pool: %d workers x %d threads",
+                _POOL.workers,
+                _POOL.threads_per_worker,
+            )
+    return _POOL
@@ -0,0 +1,342 @@
+"""Local summarization server shared by separate pipeline processes.
+
+``main.py``, ``enrich_json`` and the examples each run in their own process
+and would each load the summarization model. Started once with::
+
+    python -m utubenews.summary_server
+
+the server keeps the model resident, listens on localhost only and merges
+requests arriving within a few milliseconds into one model batch. It writes
+its address to ``summary_server.json`` in the cache directory, where
+:func:`summarizer.llm_summarize` finds it; when no server answers, the
+summarizer runs the model in-process as before.
+
+``SUMMARY_SERVER`` controls the client side: ``auto`` (default) uses the
+discovery file, ``off`` never contacts a server and a URL such as
+``http://127.0.0.1:8765`` names the server explicitly.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable
+
+from .disk_cache import cache_dir
+
+_LOG = logging.getLogger(__name__)
+
+# seconds to wait for more requests before running a batch
+BATCH_WINDOW = 0.02
+# seconds a client waits for the server before summarizing in-process
+CLIENT_TIMEOUT = 300.0
+# seconds an unreachable server is left alone before the next attempt
+RETRY_AFTER = 30.0
+
+_OFF = {"", "0", "off", "false", "no"}
+
+# set in the server process so its own summarizer never calls itself
+_SERVING = False
+_DOWN_UNTIL: dict[str, float] = {}
+
+
+def discovery_path() -> Path | None:
+    """Return the file the server advertises its address in."""
+    directory = cache_dir()
+    return None if directory is None else directory / "summary_server.json"
+
+
+def server_url() -> str | None:
+    """Return the base URL of the summarization server, if one is configured."""
+    setting = os.getenv("SUMMARY_SERVER", "auto").strip()
+    if setting.lower() in _OFF:
+        return None
+    if setting.lower() != "auto":
+        return setting.rstrip("/")
+    path = discovery_path()
+    if path is None:
+        return None
+    try:
+        info = json.loads(path.read_text(encoding="utf-8"))
+        return f"http://{info['host']}:{info['port']}"
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _reachable_url() -> str | None:
+    if _SERVING:
+        return None
+    url = server_url()
+    if url is None or _DOWN_UNTIL.get(url, 0.0) > time.monotonic():
+        return None
+    return url
+
+
+def _mark_down(url: str, exc: Exception) -> None:
+    _LOG.info("summary server %s unavailable, summarizing in-process: %s", url, exc)
+    _DOWN_UNTIL[url] = time.monotonic() + RETRY_AFTER
+
+
+def server_available(timeout: float = 1.0) -> bool:
+    """Return ``True`` if a summarization server answers its health check."""
+    url = _reachable_url()
+    if url is None:
+        return False
+    try:
+        with urllib.request.urlopen(url + "/health", timeout=timeout) as resp:
+            return json.load(resp).get("status") == "ok"
+    except (OSError, ValueError) as exc:
+        _mark_down(url, exc)
+        return False
+
+
+def request_summaries(
+    texts: list[str], max_tokens: int, max_time: float | None = None
+) -> list[str] | None:
+    """Summarize ``texts`` on the server, or return ``None`` if none is usable.
+
+    Failures mark the server as down for ``RETRY_AFTER`` seconds so callers
+    do not wait on a dead address for every article.
+    """
+    url = _reachable_url()
+    if url is None:
+        return None
+    body = json.dumps(
+        {"texts": texts, "max_tokens": max_tokens, "max_time": max_time}
+    ).encode("utf-8")
+    req = urllib.request.Request(
+        url + "/summarize", data=body, headers={"Content-Type": "application/json"}
+    )
+    timeout = CLIENT_TIMEOUT if max_time is None else max_time + 30.0
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            summaries = json.load(resp)["summaries"]
+        if not isinstance(summaries, list) or len(summaries) != len(texts):
+            raise ValueError("malformed response")
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        _mark_down(url, exc)
+        return None
+    return summaries
+
+
+class _Job:
+    def __init__(self, texts: list[str], max_tokens: int, max_time: float | None) -> None:
+        self.texts = texts
+        self.max_tokens = max_tokens
+        self.max_time = max_time
+        self.result: list[str] | None = None
+        self.error: BaseException | None = None
+        self.done = threading.Event()
+
+
+class MicroBatcher:
+    """Merge summarization requests that arrive together into one call.
+
+    A worker thread takes the first waiting request, collects whatever else
+    arrives within ``window`` seconds (up to ``max_texts`` texts) and runs
+    each group sharing a ``max_tokens`` value through ``summarize`` as a
+    single batch.
+    """
+
+    def __init__(
+        self,
+        summarize: Callable[..., list[str]],
+        window: float = BATCH_WINDOW,
+        max_texts: int = 64,
+    ) -> None:
+        self._summarize = summarize
+        self.window = window
+        self.max_texts = max_texts
+        self.batches = 0
+        self._queue: queue.Queue[_Job | None] = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="summary-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, texts: list[str], max_tokens: int, max_time: float | None = None) -> list[str]:
+        """Summarize ``texts`` as part of the next batch and wait for the result."""
+        job = _Job(texts, max_tokens, max_time)
+        self._queue.put(job)
+        job.done.wait()
+        if job.error is not None:
+            raise job.error
+        return job.result
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+
+    def _collect(self, first: _Job) -> tuple[list[_Job], bool]:
+        jobs = [first]
+        count = len(first.texts)
+        until = time.monotonic() + self.window
+        while count < self.max_texts:
+            left = until - time.monotonic()
+            if left <= 0:
+                break
+            try:
+                job = self._queue.get(timeout=left)
+            except queue.Empty:
+                break
+            if job is None:
+                return jobs, True
+            jobs.append(job)
+            count += len(job.texts)
+        return jobs, False
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            first = self._queue.get()
+            if first is None:
+                return
+            jobs, stop = self._collect(first)
+            groups: dict[int, list[_Job]] = {}
+            for job in jobs:
+                groups.setdefault(job.max_tokens, []).append(job)
+            for max_tokens, group in groups.items():
+                self._run_group(max_tokens, group)
+
+    def _run_group(self, max_tokens: int, group: list[_Job]) -> None:
+        texts = [text for job in group for text in job.texts]
+        limits = [job.max_time for job in group if job.max_time is not None]
+        try:
+            out = self._summarize(texts, max_tokens, max_time=min(limits) if limits else None)
+            self.batches += 1
+        except BaseException as exc:  # hand the error to every waiting request
+            for job in group:
+                job.error = exc
+                job.done.set()
+            return
+        start = 0
+        for job in group:
+            job.result = out[start : start + len(job.texts)]
+            start += len(job.texts)
+            job.done.set()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "SummaryServer"
+
+    def _send(self, status: int, data: dict) -> None:
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        if self.path != "/health":
+            self._send(404, {"error": "not found"})
+            return
+        self._send(200, {"status": "ok", "pid": os.getpid(), "batches": self.server.batcher.batches})
+
+    def do_POST(self) -> None:
+        if self.path != "/summarize":
+            self._send(404, {"error": "not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", "0"))
+            req = json.loads(self.rfile.read(length))
+            texts = [str(t) for t in req["texts"]]
+            max_tokens = int(req.get("max_tokens", 180))
+            max_time = req.get("max_time")
+            max_time = None if max_time is None else float(max_time)
+        except (ValueError, KeyError, TypeError) as exc:
+            self._send(400, {"error": str(exc)})
+            return
+        try:
+            summaries = self.server.batcher.submit(texts, max_tokens, max_time)
+        except Exception as exc:
+            _LOG.warning("summarization failed: %s", exc)
+            self._send(500, {"error": str(exc)})
+            return
+        self._send(200, {"summaries": summaries})
+
+    def log_message(self, fmt: str, *args) -> None:
+        _LOG.debug("%s - " + fmt, self.address_string(), *args)
+
+
+class SummaryServer(ThreadingHTTPServer):
+    """HTTP server answering ``POST /summarize`` and ``GET /health``."""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], batcher: MicroBatcher) -> None:
+        super().__init__(address, _Handler)
+        self.batcher = batcher
+
+
+def _write_discovery(path: Path, host: str, port: int) -> None:
+    from . import summarizer
+
+    info = {
+        "host": host,
+        "port": port,
+        "pid": os.getpid(),
+        "model": summarizer.MODEL_NAME,
+        "revision": summarizer.MODEL_REVISION,
+        "backend": summarizer.SUMMARY_BACKEND,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(info), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def serve(host: str = "127.0.0.1", port: int = 0, window: float = BATCH_WINDOW) -> None:
+    """Load the model and serve summaries until interrupted."""
+    global _SERVING
+    from . import summarizer
+
+    _SERVING = True
+    start = time.monotonic()
+    summarizer._load_pipeline()
+    _LOG.info("summarization model loaded in %.1fs", time.monotonic() - start)
+
+    batcher = MicroBatcher(summarizer.llm_summarize_batch, window=window)
+    server = SummaryServer((host, port), batcher)
+    host, port = server.server_address[:2]
+    path = discovery_path()
+    if path is not None:
+        _write_discovery(path, host, port)
+    _LOG.info("summary server listening on http://%s:%d", host, port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        batcher.close()
+        if path is not None:
+            path.unlink(missing_ok=True)
+
+
+def main(argv=None) -> None:
+    from .utils import setup_logging
+
+    parser = argparse.ArgumentParser(description="Serve summaries from a resident model")
+    parser.add_argument("--host", default="127.0.0.1", help="address to bind (default: localhost)")
+    parser.add_argument("--port", type=int, default=0, help="port (default: any free port)")
+    parser.add_argument(
+        "--batch-window",
+        type=float,
+        default=BATCH_WINDOW,
+        help="seconds to wait for more requests before running a batch",
+    )
+    parser.add_argument("--log-level", default="INFO", help="Logging level (default: INFO)")
+    args = parser.parse_args(argv)
+    setup_logging(level=args.log_level.upper())
+    serve(args.host, args.port, args.batch_window)
+
+
+if __name__ == "__main__":
+    main()
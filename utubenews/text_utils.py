@@ -1,6 +1,12 @@
 import re
+import threading
 import bs4
 
+try:
+    import lxml.html as _lxml_html
+except ImportError:  # lxml is optional; BeautifulSoup is used without it
+    _lxml_html = None
+
 _RE_WS = re.compile(r"\s+")
 _AD_PAT = re.compile(
     r"advert|sponsor|subscribe|table of contents|\[hide\]|광고|후원|목차",
@@ -25,16 +31,75 @@ def clean_text(text: str) -> str:
     return _RE_WS.sub(" ", " ".join(parts)).strip()
 
 
+# text nodes that BeautifulSoup's ``get_text`` leaves out as well
+_VISIBLE_TEXT_XPATH = "descendant-or-self::text()[not(ancestor::script or ancestor::style or ancestor::template)]"
+
+
+_PARSERS = threading.local()
+
+
+def _bytes_parser(encoding: str | None):
+    """Return this thread's lxml parser for bytes in ``encoding``."""
+    cache = getattr(_PARSERS, "by_encoding", None)
+    if cache is None:
+        cache = _PARSERS.by_encoding = {}
+    parser = cache.get(encoding)
+    if parser is None:
+        parser = cache[encoding] = _lxml_html.HTMLParser(encoding=encoding)
+    return parser
+
+
+def parse_html(html, encoding: str | None = None):
+    """Return an ``lxml.html`` tree for ``html`` or ``None``.
+
+    ``None`` means lxml is not installed or could not parse the input, in
+    which case callers fall back to BeautifulSoup. The returned tree may be
+    shared by several extractors so the page is only parsed once.
+
+    ``html`` may be the raw page bytes; libxml2 then decodes them itself as
+    ``encoding`` instead of parsing a decoded Python copy. Encodings libxml2
+    does not know are decoded in Python first.
+    """
+    if _lxml_html is None or not html:
+        return None
+    try:
+        if isinstance(html, bytes):
+            try:
+                return _lxml_html.document_fromstring(html, parser=_bytes_parser(encoding))
+            except LookupError:
+                html = html.decode(encoding, errors="replace")
+        return _lxml_html.document_fromstring(html)
+    except Exception:  # ParserError, ValueError for encoding declarations
+        return None
+
+
+def node_text(node, sep: str = "\n") -> str:
+    """Return the visible text below ``node`` joined with ``sep``.
+
+    Mirrors ``Tag.get_text(sep)`` of BeautifulSoup: script, style and
+    template contents as well as comments are skipped.
+    """
+    return sep.join(node.xpath(_VISIBLE_TEXT_XPATH))
+
+
+def text_lines(text: str, min_len: int = 0) -> list[str]:
+    """Return stripped lines of ``text`` that are at least ``min_len`` long."""
+    lines = []
+    for p in text.splitlines():
+        p = p.strip()
+        if len(p) >= max(1, min_len):
+            lines.append(p)
+    return lines
+
+
 def clean_html_text(html: str, min_len: int = 0) -> str:
     """Extract text from HTML and clean it."""
-    soup = bs4.BeautifulSoup(html or "", "html.parser")
-    text = []
-    for p in soup.get_text("\n").splitlines():
-        p = p.strip()
-        if len(p) < max(1, min_len):
-            continue
-        text.append(p)
-    return clean_text("\n".join(text))
+    tree = parse_html(html)
+    if tree is not None:
+        text = node_text(tree)
+    else:
+        text = bs4.BeautifulSoup(html or "", "html.parser").get_text("\n")
+    return clean_text("\n".join(text_lines(text, min_len)))
 
 
 def merge_text_blocks(texts: list[str], titles: list[str] | None = None) -> str:
@@ -88,3 +153,27 @@ def split_sentences(text: str, filler: str = "입니다.") -> list[str]:
         else:
             sentences.append(frag + '.')
     return sentences
+
+
+_HANGUL_PAT = re.compile(r"[가-힣ᄀ-ᇿ㄰-㆏]")
+_LATIN_PAT = re.compile(r"[A-Za-z]")
+
+# characters inspected by detect_language; enough to tell the language
+_LANG_SAMPLE_CHARS = 2000
+
+
+def hangul_ratio(text: str) -> float:
+    """Return the share of Hangul among the Hangul and Latin letters of ``text``."""
+    hangul = len(_HANGUL_PAT.findall(text))
+    latin = len(_LATIN_PAT.findall(text))
+    return hangul / (hangul + latin) if hangul + latin else 0.0
+
+
+def detect_language(text: str, threshold: float = 0.3) -> str:
+    """Return ``"ko"`` for mostly Korean ``text`` and ``"en"`` otherwise.
+
+    Only the first ``_LANG_SAMPLE_CHARS`` characters are counted. Korean news
+    mixes in Latin brand and product names, so a Hangul share of
+    ``threshold`` already marks a text as Korean.
+    """
+    return "ko" if hangul_ratio(text[:_LANG_SAMPLE_CHARS]) >= threshold else "en"
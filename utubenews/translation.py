@@ -0,0 +1,261 @@
+"""Translation of long texts through googletrans or deep_translator.
+
+:class:`TranslationEngine` splits a text into request-sized chunks at line
+and sentence boundaries, translates the chunks concurrently while a
+:class:`RateLimiter` spaces out the requests, and keeps every translated
+chunk in the persistent ``translations`` cache (:mod:`disk_cache`), keyed by
+the chunk's hash and the target language. Translator clients are created
+once and reused. Each chunk is tried with every backend in turn; a chunk no
+backend translates is kept in the original language.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Sequence
+
+from .disk_cache import get_cache
+
+_LOG = logging.getLogger(__name__)
+
+# maximum characters allowed in a single translation request
+MAX_TRANSLATE_CHARS = 5000
+# chunks translated at the same time
+TRANSLATE_WORKERS = int(os.getenv("TRANSLATE_WORKERS", "4"))
+# translation requests per second across all threads; 0 means no limit
+TRANSLATE_RATE = float(os.getenv("TRANSLATE_RATE", "5"))
+
+_SENTENCE_END_PAT = re.compile(r"(?<=[.!?。])\s+")
+
+# backend(text, target_lang) -> translated text
+Backend = Callable[[str, str], str]
+
+
+def _sentences(line: str) -> List[str]:
+    """Split ``line`` after each sentence end, keeping every character."""
+    pieces, start = [], 0
+    for m in _SENTENCE_END_PAT.finditer(line):
+        pieces.append(line[start : m.end()])
+        start = m.end()
+    if start < len(line):
+        pieces.append(line[start:])
+    return pieces
+
+
+def chunk_text(text: str, max_chars: int = MAX_TRANSLATE_CHARS) -> List[str]:
+    """Split ``text`` into chunks of at most ``max_chars`` characters.
+
+    Chunks end at line breaks where possible, then at sentence ends, and
+    only a single sentence longer than ``max_chars`` is cut mid-text.
+    Joining the chunks gives ``text`` back. Runs in linear time.
+    """
+    if len(text) <= max_chars:
+        return [text]
+
+    pieces: List[str] = []
+    for line in text.splitlines(keepends=True):
+        if len(line) <= max_chars:
+            pieces.append(line)
+            continue
+        for sent in _sentences(line):
+            pieces.extend(sent[i : i + max_chars] for i in range(0, len(sent), max_chars))
+
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    for piece in pieces:
+        if size + len(piece) > max_chars and current:
+            chunks.append("".join(current))
+            current, size = [], 0
+        current.append(piece)
+        size += len(piece)
+    if current:
+        chunks.append("".join(current))
+    return chunks
+
+
+class RateLimiter:
+    """Space out calls so at most ``rate`` start per second.
+
+    :meth:`acquire` blocks the calling thread until its slot; the slots
+    are handed out in call order across threads.
+    """
+
+    def __init__(self, rate: float) -> None:
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+# translator clients by (factory, target language); googletrans clients
+# take the target per request and are stored with target None
+_CLIENTS: dict[tuple, object] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def _client(factory, lang: str | None, **kwargs):
+    """Return the shared client made by ``factory(**kwargs)`` for ``lang``."""
+    key = (factory, lang)
+    client = _CLIENTS.get(key)
+    if client is None:
+        with _CLIENTS_LOCK:
+            client = _CLIENTS.get(key)
+            if client is None:
+                client = _CLIENTS[key] = factory(**kwargs)
+    return client
+
+
+def googletrans_backend() -> Backend | None:
+    """Return a backend using :mod:`googletrans`, or ``None`` if unavailable."""
+    try:  # pragma: no cover - optional dependency
+        from googletrans import Translator  # type: ignore
+
+        client = _client(Translator, None)
+    except Exception as exc:
+        _LOG.warning("googletrans unavailable: %s", exc)
+        return None
+    return lambda text, target: client.translate(text, dest=target).text
+
+
+def deep_translator_backend(target_lang: str) -> Backend | None:
+    """Return a backend using :mod:`deep_translator`, or ``None`` if unavailable."""
+    try:  # pragma: no cover - optional dependency
+        from deep_translator import GoogleTranslator  # type: ignore
+
+        client = _client(GoogleTranslator, target_lang, source="auto", target=target_lang)
+    except Exception as exc:
+        _LOG.warning("deep_translator failed to translate to %s: %s", target_lang, exc)
+        return None
+    return lambda text, target: client.translate(text)
+
+
+def _default_backends(target_lang: str) -> List[tuple[str, Callable[[], Backend | None]]]:
+    # deep_translator is only set up once googletrans fails on a chunk
+    return [
+        ("googletrans", googletrans_backend),
+        ("deep_translator", lambda: deep_translator_backend(target_lang)),
+    ]
+
+
+class _LazyBackends:
+    """Backends of one translation, each resolved on first use."""
+
+    def __init__(self, getters: List[tuple[str, Callable[[], Backend | None]]]) -> None:
+        self._getters = getters
+        self._resolved: dict[str, Backend | None] = {}
+        self._lock = threading.Lock()
+
+    def __iter__(self):
+        for name, getter in self._getters:
+            if name not in self._resolved:
+                with self._lock:
+                    if name not in self._resolved:
+                        self._resolved[name] = getter()
+            backend = self._resolved[name]
+            if backend is not None:
+                yield name, backend
+
+
+def _cache_key(text: str, target_lang: str) -> str:
+    # exact text: line breaks and spacing are part of what is translated
+    return hashlib.sha256(f"{target_lang}\0{text}".encode("utf-8")).hexdigest()
+
+
+class TranslationEngine:
+    """Translate texts chunk by chunk with shared clients, threads and cache.
+
+    ``backends`` lists ``(name, backend)`` pairs tried in order for every
+    chunk; by default googletrans and then deep_translator. Up to
+    ``max_workers`` chunks are in flight at once and at most ``rate``
+    requests start per second.
+    """
+
+    def __init__(
+        self,
+        backends: Sequence[tuple[str, Backend]] | None = None,
+        *,
+        max_chars: int = MAX_TRANSLATE_CHARS,
+        max_workers: int = TRANSLATE_WORKERS,
+        rate: float = TRANSLATE_RATE,
+    ) -> None:
+        self._backends = list(backends) if backends is not None else None
+        self.max_chars = max_chars
+        self.limiter = RateLimiter(rate)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_workers), thread_name_prefix="translate"
+        )
+
+    def _backends_for(self, target_lang: str) -> _LazyBackends:
+        if self._backends is not None:
+            return _LazyBackends([(name, lambda b=b: b) for name, b in self._backends])
+        return _LazyBackends(_default_backends(target_lang))
+
+    def _translate_chunk(self, idx: int, part: str, target_lang: str, backends, cache) -> str:
+        if not part.strip():
+            return part
+        key = _cache_key(part, target_lang)
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+        for name, backend in backends:
+            self.limiter.acquire()
+            try:
+                translated = backend(part, target_lang)
+            except Exception as exc:  # pragma: no cover - log only
+                _LOG.warning("%s failed for chunk %d: %s", name, idx, exc)
+                continue
+            if translated is not None:
+                if cache is not None:
+                    cache.put(key, translated)
+                return translated
+        return part
+
+    def translate_chunks(self, parts: Sequence[str], target_lang: str) -> List[str]:
+        """Translate every chunk of ``parts`` and return them in order.
+
+        Chunks no backend translates are returned unchanged.
+        """
+        backends = self._backends_for(target_lang)
+        cache = get_cache("translations")
+        if len(parts) == 1:
+            return [self._translate_chunk(0, parts[0], target_lang, backends, cache)]
+        futures = [
+            self._executor.submit(self._translate_chunk, idx, part, target_lang, backends, cache)
+            for idx, part in enumerate(parts)
+        ]
+        return [future.result() for future in futures]
+
+    def translate(self, text: str, target_lang: str) -> str:
+        """Translate ``text`` into ``target_lang``, keeping untranslatable parts."""
+        return "".join(self.translate_chunks(chunk_text(text, self.max_chars), target_lang))
+
+
+_ENGINE: TranslationEngine | None = None
+_ENGINE_LOCK = threading.Lock()
+
+
+def get_engine() -> TranslationEngine:
+    """Return the process-wide engine with the default backends."""
+    global _ENGINE
+    if _ENGINE is None:
+        with _ENGINE_LOCK:
+            if _ENGINE is None:
+                _ENGINE = TranslationEngine()
+    return _ENGINE